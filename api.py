@@ -13,32 +13,40 @@ Includes:
 
 from __future__ import annotations
 
+import asyncio
+import re
+import threading
 import time
 import uuid
 from contextlib import asynccontextmanager
 from typing import Any, Optional
+from urllib.parse import parse_qsl
 
-from fastapi import FastAPI, HTTPException, Request, Response
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from langchain_core.messages import HumanMessage
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from langchain_core.messages import AIMessageChunk, HumanMessage
 
 # Platform imports
 from config.settings import get_settings, Environment
 from utils.logger import get_logger
-from infrastructure.tracing.langsmith_tracer import get_tracer
+from infrastructure.tracing.langsmith_tracer import configure_tracing, get_tracer
 from infrastructure.audit.logger import get_audit_logger
 from infrastructure.audit.transparency import get_decision_logger
 from infrastructure.metrics.collector import get_metrics_collector
 from infrastructure.metrics.cost_analytics import get_cost_analytics
 from infrastructure.resilience.circuit_breaker import get_circuit_breaker
+from infrastructure.resilience.concurrency import AdaptiveConcurrencyLimiter
 from infrastructure.prompts.registry import get_prompt_registry
 from infrastructure.evaluation.harness import get_evaluation_harness
 from infrastructure.evaluation.regression import get_regression_checker
 from infrastructure.secrets.manager import get_secrets_manager
 from infrastructure.memory import get_memory_manager, build_memory_context
+from infrastructure.cache import get_route_cache
 
-from appointment_agent import DoctorAppointmentAgent
+from appointment_agent import DoctorAppointmentAgent, get_agent
 
 import os
 os.environ.pop("SSL_CERT_FILE", None)
@@ -46,11 +54,83 @@ os.environ.pop("SSL_CERT_FILE", None)
 logger = get_logger(__name__)
 
 
+# ── Background audit writer ──────────────────────────────────────
+
+AUDIT_QUEUE_MAXSIZE = 8192
+AUDIT_BATCH_SIZE = 256
+
+_audit_queue: asyncio.Queue | None = None
+_audit_dropped = 0
+
+
+async def _audit_writer(queue: asyncio.Queue) -> None:
+    """Single consumer — drains the queue and writes records in batches."""
+    audit = AUDIT_LOGGER
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < AUDIT_BATCH_SIZE:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        try:
+            await asyncio.to_thread(audit.log_api_request_batch, batch)
+        except Exception as exc:
+            logger.error("Audit batch write failed: %s", exc)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def _enqueue_api_audit(record: dict[str, Any]) -> None:
+    """Hand an API audit record to the writer; drop it if the queue is full."""
+    global _audit_dropped
+    if AUDIT_LOGGER is not None and not AUDIT_LOGGER.enabled:
+        return
+    if _audit_queue is None:
+        get_audit_logger().log_api_request(**record)
+        return
+    try:
+        _audit_queue.put_nowait(record)
+    except asyncio.QueueFull:
+        _audit_dropped += 1
+
+
+# ── Platform services (bound once in lifespan) ───────────────────
+#
+# Request handlers use these module-level references instead of calling
+# the get_*() factories on every request. They are (re)bound each time
+# the lifespan starts, so anything that resets a factory's singleton must
+# restart the app (or call _bind_platform_services()) to take effect.
+
+TRACER: Any = None
+AUDIT_LOGGER: Any = None
+METRICS: Any = None
+COSTS: Any = None
+PROMPTS: Any = None
+MEM: Any = None
+ROUTE_CACHE: Any = None
+CIRCUIT_BREAKERS: dict[str, Any] = {}
+
+
+def _bind_platform_services() -> None:
+    global TRACER, AUDIT_LOGGER, METRICS, COSTS, PROMPTS, MEM, ROUTE_CACHE, CIRCUIT_BREAKERS
+    TRACER = get_tracer()
+    AUDIT_LOGGER = get_audit_logger()
+    METRICS = get_metrics_collector()
+    COSTS = get_cost_analytics()
+    PROMPTS = get_prompt_registry()
+    MEM = get_memory_manager()
+    ROUTE_CACHE = get_route_cache()
+    CIRCUIT_BREAKERS = {name: get_circuit_breaker(name) for name in ("llm_api", "memory_store")}
+
+
 # ── Lifespan ─────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan — initialize platform services on startup."""
+    global _audit_queue
     settings = get_settings()
     logger.info(
         "Starting platform | env=%s | debug=%s | tracing=%s",
@@ -58,21 +138,27 @@ async def lifespan(app: FastAPI):
         settings.debug,
         settings.langsmith.tracing_v2,
     )
-    # Initialize singletons eagerly
-    get_tracer()
-    get_audit_logger()
-    get_metrics_collector()
-    get_cost_analytics()
-    get_prompt_registry()
-
-    # Initialize memory manager
-    mem = get_memory_manager()
-    logger.info("Memory subsystem: enabled=%s", mem.enabled)
+    configure_tracing(settings)
+    # Initialize singletons eagerly and bind them for the request path
+    _bind_platform_services()
+    logger.info("Memory subsystem: enabled=%s", MEM.enabled)
+    MEM.start_write_worker()
 
     # Register built-in prompts on first run
     _register_default_prompts()
 
-    get_audit_logger().log_event("platform_startup", details={
+    # Compile the agent graph up front so the first request doesn't pay for it
+    try:
+        _init_agent()
+        agent.start_memory_extraction_worker()
+    except Exception as exc:
+        logger.warning("Agent graph compilation deferred: %s", exc)
+
+    # Start the background audit writer
+    _audit_queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+    writer_task = asyncio.create_task(_audit_writer(_audit_queue))
+
+    AUDIT_LOGGER.log_event("platform_startup", details={
         "environment": settings.environment.value,
         "api_host": settings.api_host,
         "api_port": settings.api_port,
@@ -80,51 +166,86 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    get_audit_logger().log_event("platform_shutdown")
+    # Finish queued memory extraction while Mem0 and the audit writer are still up
+    if agent is not None:
+        await agent.stop_memory_extraction_worker()
+    await MEM.stop_write_worker()
+
+    # Flush pending audit records before shutting the writer down
+    await _audit_queue.join()
+    writer_task.cancel()
+    _audit_queue = None
+
+    # Drain batched trace exports
+    TRACER.flush()
+
+    AUDIT_LOGGER.log_event("platform_shutdown", details={"audit_dropped": _audit_dropped})
+
+    # Make buffered audit, decision and cost records durable before exit
+    await asyncio.to_thread(AUDIT_LOGGER.flush, 5.0)
+    await asyncio.to_thread(get_decision_logger().flush, 5.0)
+    await asyncio.to_thread(COSTS.flush, 5.0)
     logger.info("Platform shutdown complete")
 
 
-def _register_default_prompts():
-    """Register core prompts in the registry if they don't exist."""
-    registry = get_prompt_registry()
-    if not registry.get_active("supervisor"):
-        from prompts.supervisor_prompt import system_prompt
-        registry.register(
-            name="supervisor",
-            template=system_prompt,
-            auto_activate=True,
-            metadata={"category": "routing", "agent": "supervisor"},
-        )
-    if not registry.get_active("information_agent"):
-        registry.register(
-            name="information_agent",
-            template=(
+def _default_prompts() -> dict[str, dict[str, Any]]:
+    """Built-in prompts keyed by registry name."""
+    from prompts.supervisor_prompt import system_prompt
+    return {
+        "supervisor": {
+            "template": system_prompt,
+            "metadata": {"category": "routing", "agent": "supervisor"},
+        },
+        "information_agent": {
+            "template": (
                 "You are specialized agent to provide information related to availability "
                 "of doctors or any FAQs related to hospital based on the query. "
                 "You have access to the tool.\n"
                 "Make sure to ask user politely if you need any further information to execute the tool.\n"
                 "For your information, Always consider current year is 2026."
             ),
-            auto_activate=True,
-            metadata={"category": "sub-agent", "agent": "information"},
-        )
-    if not registry.get_active("booking_agent"):
-        registry.register(
-            name="booking_agent",
-            template=(
+            "metadata": {"category": "sub-agent", "agent": "information"},
+        },
+        "booking_agent": {
+            "template": (
                 "You are specialized agent to set, cancel or reschedule appointment "
                 "based on the query. You have access to the tool.\n"
                 "Make sure to ask user politely if you need any further information "
                 "to execute the tool.\n"
                 "For your information, Always consider current year is 2026."
             ),
-            auto_activate=True,
-            metadata={"category": "sub-agent", "agent": "booking"},
-        )
+            "metadata": {"category": "sub-agent", "agent": "booking"},
+        },
+    }
+
+
+def _register_default_prompts():
+    """Register core prompts in the registry if they don't exist."""
+    registry = PROMPTS
+    defaults = _default_prompts()
+    existing = registry.get_active_many(list(defaults))
+    for name, spec in defaults.items():
+        if not existing[name]:
+            registry.register(
+                name=name,
+                template=spec["template"],
+                auto_activate=True,
+                metadata=spec["metadata"],
+            )
 
 
 # ── App creation ─────────────────────────────────────────────────
 
+class PlatformJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (single-pass bytes output)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
 settings = get_settings()
 
 app = FastAPI(
@@ -132,10 +253,162 @@ app = FastAPI(
     description="Enterprise AI orchestration platform for doctor appointment management",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=PlatformJSONResponse,
     docs_url="/docs" if not settings.is_production() else None,
     redoc_url="/redoc" if not settings.is_production() else None,
 )
 
+# ── Middleware: audit + metrics ──────────────────────────────────
+
+_REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9-]{8,128}")
+_UNAUDITED_PATHS = frozenset({"/health"})
+
+
+class AuditMetricsMiddleware:
+    """
+    Pure ASGI middleware — logs every request and measures latency.
+
+    Avoids ``BaseHTTPMiddleware`` so no per-request task group or
+    Request/Response objects are materialized on the hot path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Preflights and liveness probes are pure noise in the audit trail
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in _UNAUDITED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        # Extract tenant/user/request-id from headers (enterprise multi-tenant)
+        # in a single pass; endpoints read them back from scope state
+        header_tenant_id: Optional[str] = None
+        user_id = ""
+        request_id = ""
+        for key, value in scope["headers"]:
+            if key == b"x-tenant-id":
+                header_tenant_id = value.decode("latin-1")
+            elif key == b"x-user-id":
+                user_id = value.decode("latin-1")
+            elif key == b"x-request-id" and _REQUEST_ID_PATTERN.fullmatch(value):
+                # Preserve upstream correlation IDs (ingress, other services)
+                request_id = value.decode("latin-1")
+        tenant_id = header_tenant_id or "default"
+        if not request_id:
+            request_id = uuid.uuid4().hex
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["tenant_id"] = header_tenant_id
+        state["user_id"] = user_id
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                # Inject trace headers
+                headers = message.setdefault("headers", [])
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                headers.append((b"x-response-time-ms", f"{elapsed_ms:.2f}".encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Response has been fully sent at this point — audit off the critical path
+            _enqueue_api_audit({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "error": None if status_code < 400 else f"HTTP {status_code}",
+            })
+
+
+_PROFILE_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+class ProfilerMiddleware:
+    """
+    Opt-in per-request profiling with pyinstrument.
+
+    Activated by an ``X-Profile: 1`` header or ``?profile=1`` query param
+    (also true/yes/on); the endpoint still runs, but its response is replaced with the
+    pyinstrument HTML report. Zero overhead for normal requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        try:
+            from pyinstrument import Profiler
+            self._profiler_cls = Profiler
+        except ImportError:
+            logger.info("pyinstrument not installed — request profiling unavailable")
+            self._profiler_cls = None
+
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        query = scope["query_string"]
+        if b"profile=" in query:
+            for key, value in parse_qsl(query.decode("latin-1")):
+                if key == "profile" and value.strip().lower() in _PROFILE_TRUTHY:
+                    return True
+        return any(
+            key == b"x-profile" and value.decode("latin-1").strip().lower() in _PROFILE_TRUTHY
+            for key, value in scope["headers"]
+        )
+
+    async def __call__(self, scope, receive, send):
+        if self._profiler_cls is None or scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message):
+            pass
+
+        profiler = self._profiler_cls(interval=0.001, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        body = profiler.output_html().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Middleware order: each add_middleware() call wraps the previous ones,
+# so the last one registered is outermost. Resulting stack per request:
+#   CORSMiddleware          — outermost; answers preflights on its own
+#   AuditMetricsMiddleware  — audit + latency headers
+#   ProfilerMiddleware      — innermost, non-production debug/profiling only
+
+# Profiling is never exposed in production, and elsewhere only when switched on
+if not settings.is_production() and (settings.debug or settings.api_profiling_enabled):
+    app.add_middleware(ProfilerMiddleware)
+
+app.add_middleware(AuditMetricsMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -146,41 +419,14 @@ app.add_middleware(
 )
 
 
-# ── Middleware: audit + metrics ──────────────────────────────────
-
-@app.middleware("http")
-async def audit_and_metrics_middleware(request: Request, call_next):
-    """Log every request and measure latency."""
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    start = time.perf_counter()
-
-    # Extract tenant/user from headers (enterprise multi-tenant)
-    tenant_id = request.headers.get("X-Tenant-ID", "default")
-    user_id = request.headers.get("X-User-ID", "")
-
-    response: Response = await call_next(request)
-    elapsed_ms = (time.perf_counter() - start) * 1000
-
-    # Audit log
-    get_audit_logger().log_api_request(
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_ms=elapsed_ms,
-        tenant_id=tenant_id,
-        user_id=user_id,
-        error=None if response.status_code < 400 else f"HTTP {response.status_code}",
-    )
-
-    # Inject trace headers
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Response-Time-Ms"] = f"{elapsed_ms:.2f}"
-
-    return response
+# ── Request/Response models ──────────────────────────────────────
 
+def _strip_non_empty(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError("must not be empty or whitespace")
+    return value
 
-# ── Request/Response models ──────────────────────────────────────
 
 class UserQuery(BaseModel):
     id_number: int = Field(ge=1000000, le=99999999)
@@ -188,6 +434,11 @@ class UserQuery(BaseModel):
     tenant_id: str = Field(default="default")
     session_id: str = Field(default="")
 
+    @field_validator("messages")
+    @classmethod
+    def strip_messages(cls, v: str) -> str:
+        return _strip_non_empty(v)
+
 
 class AgentResponse(BaseModel):
     response: str
@@ -210,18 +461,41 @@ class PromptActivateRequest(BaseModel):
     version: int
 
 
-# ── Agent setup (deferred to avoid failures at import time) ──────
+# ── Agent setup (compiled in lifespan; import succeeds without creds) ──
 
 agent: DoctorAppointmentAgent | None = None
 app_graph = None
 
+# Sheds /execute load with a fast 503 once too many agent runs are in flight,
+# keeping the event loop responsive for health and dashboard endpoints
+EXECUTE_LIMITER = AdaptiveConcurrencyLimiter(
+    "execute",
+    max_limit=settings.max_concurrent_executions,
+    latency_slo_ms=settings.execute_latency_slo_ms,
+)
+
+# Initial values for the per-request AgentState fields that start empty
+_EMPTY_STATE: dict[str, str] = {
+    "next": "",
+    "query": "",
+    "current_reasoning": "",
+    "memory_context": "",
+}
+_agent_lock = threading.Lock()
 
-def _ensure_agent():
-    """Lazy-init agent on first use so import succeeds without creds."""
+
+def _init_agent():
+    """
+    Compile the agent graph.
+
+    Called eagerly from ``lifespan``; endpoints only fall back to it
+    when startup compilation failed (e.g. credentials were missing).
+    """
     global agent, app_graph
-    if agent is None:
-        agent = DoctorAppointmentAgent()
-        app_graph = agent.workflow()
+    with _agent_lock:
+        if app_graph is None:
+            agent = get_agent()
+            app_graph = agent.app
     return app_graph
 
 
@@ -230,117 +504,242 @@ def _ensure_agent():
 @app.get("/health")
 def health_check():
     """Extended health check with subsystem status."""
-    cb = get_circuit_breaker("llm_api")
-    mem = get_memory_manager()
     return {
         "status": "ok",
         "environment": settings.environment.value,
-        "circuit_breaker": cb.get_status(),
-        "tracing_enabled": get_tracer().enabled,
-        "memory": mem.get_status(),
+        "circuit_breaker": CIRCUIT_BREAKERS["llm_api"].get_status(),
+        "tracing_enabled": TRACER.enabled,
+        "memory": MEM.get_status(),
+        "memory_extraction": agent.get_extraction_status() if agent is not None else None,
+        "execute_concurrency": EXECUTE_LIMITER.get_status(),
+        "route_cache": ROUTE_CACHE.get_stats() if ROUTE_CACHE is not None else {"enabled": False},
     }
 
 
-@app.post("/execute", response_model=AgentResponse)
-def execute_agent(user_input: UserQuery, request: Request):
-    """Execute the agent workflow with full observability."""
-    request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
-    tenant_id = request.headers.get("X-Tenant-ID", user_input.tenant_id)
+# Sub-agent nodes whose LLM tokens make up the patient-facing reply; the
+# supervisor's structured routing output is never streamed
+_STREAMED_NODES = ("information_node", "booking_node")
+
+
+def _prepare_execution(user_input: UserQuery, request: Request) -> tuple[str, str, str, dict, dict]:
+    """Resolve request identity, LangChain config and initial graph state."""
+    # Populated by AuditMetricsMiddleware — avoids re-parsing request headers
+    state = request.scope.get("state", {})
+    request_id = state.get("request_id") or uuid.uuid4().hex
+    tenant_id = state.get("tenant_id")
+    if tenant_id is None:
+        tenant_id = user_input.tenant_id
     user_id = str(user_input.id_number)
-    session_id = user_input.session_id or str(uuid.uuid4())
+    session_id = user_input.session_id or uuid.uuid4().hex
 
     logger.info(
         "Execute request | tenant=%s user=%s request_id=%s",
         tenant_id, user_id, request_id,
     )
 
-    tracer = get_tracer()
-    lc_config = tracer.get_langchain_config(
+    lc_config = TRACER.get_langchain_config(
         tenant_id=tenant_id,
         user_id=user_id,
         session_id=session_id,
         run_name=f"appointment_agent_{request_id[:8]}",
     )
+    query_data = {
+        **_EMPTY_STATE,
+        "messages": [HumanMessage(content=user_input.messages)],
+        "id_number": user_input.id_number,
+        "tenant_id": tenant_id,
+    }
+    return request_id, tenant_id, user_id, lc_config, query_data
 
-    try:
-        query_data = {
-            "messages": [HumanMessage(content=user_input.messages.strip())],
-            "id_number": user_input.id_number,
-            "next": "",
-            "query": "",
-            "current_reasoning": "",
-            "memory_context": "",
-            "tenant_id": tenant_id,
-        }
 
-        graph = _ensure_agent()
-        response = graph.invoke(query_data, config=lc_config)
-        messages = response.get("messages", [])
-        assistant_text = messages[-1].content if messages else "No response generated."
+def _audit_execution_failure(exc: Exception, tenant_id: str, user_id: str) -> None:
+    AUDIT_LOGGER.log_agent_execution(
+        agent_name="orchestrator",
+        duration_ms=0,
+        success=False,
+        error=str(exc),
+        tenant_id=tenant_id,
+        user_id=user_id,
+    )
+
+
+def _sse(event: dict[str, Any]) -> bytes:
+    return b"data: " + orjson.dumps(event) + b"\n\n"
 
-        return AgentResponse(
-            response=assistant_text,
-            route=response.get("next", ""),
-            reasoning=response.get("current_reasoning", ""),
-            request_id=request_id,
-        )
-    except Exception as exc:
-        logger.exception("Agent execution failed | request_id=%s", request_id)
-        get_audit_logger().log_agent_execution(
-            agent_name="orchestrator",
-            duration_ms=0,
-            success=False,
-            error=str(exc),
-            tenant_id=tenant_id,
-            user_id=user_id,
-        )
-        raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(exc)}")
+
+class _LimitedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that returns its EXECUTE_LIMITER slot when sent.
+
+    Starlette skips the body iterator entirely when the client has gone
+    before the body starts, so the generator's own cleanup can't be relied
+    on; ``__call__`` always runs to completion or cancellation.
+    """
+
+    def __init__(self, content: Any, started: float, **kwargs: Any) -> None:
+        super().__init__(content, **kwargs)
+        self._started = started
+        self._released = False
+
+    def release_slot(self) -> None:
+        if not self._released:
+            self._released = True
+            EXECUTE_LIMITER.release((time.perf_counter() - self._started) * 1000)
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.release_slot()
+
+
+@app.post("/execute", response_model=AgentResponse)
+async def execute_agent(user_input: UserQuery, request: Request):
+    """Execute the agent workflow with full observability."""
+    # Fast-shed instead of queueing when too many agent runs are in flight;
+    # checked first so shed requests do no per-request work
+    if not EXECUTE_LIMITER.try_acquire():
+        raise HTTPException(status_code=503, detail="Server overloaded — please retry shortly")
+    started = time.perf_counter()
+
+    try:
+        request_id, tenant_id, user_id, lc_config, query_data = _prepare_execution(user_input, request)
+        try:
+            graph = app_graph if app_graph is not None else _init_agent()
+            with TRACER.sampled_run():
+                response = await graph.ainvoke(query_data, config=lc_config)
+            messages = response.get("messages", [])
+            assistant_text = messages[-1].content if messages else "No response generated."
+
+            return AgentResponse(
+                response=assistant_text,
+                route=response.get("next", ""),
+                reasoning=response.get("current_reasoning", ""),
+                request_id=request_id,
+            )
+        except Exception as exc:
+            logger.exception("Agent execution failed | request_id=%s", request_id)
+            _audit_execution_failure(exc, tenant_id, user_id)
+            raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(exc)}")
+    finally:
+        EXECUTE_LIMITER.release((time.perf_counter() - started) * 1000)
+
+
+@app.post("/execute/stream", response_model=None)
+async def execute_agent_stream(user_input: UserQuery, request: Request):
+    """
+    Server-sent events variant of ``/execute``.
+
+    Emits ``{"type": "token", "text": ...}`` events as the sub-agent
+    generates its reply, then a single ``done`` event carrying the same
+    fields as ``AgentResponse`` (or an ``error`` event). Clients should
+    render the ``done`` response as final, since replies that never hit
+    an LLM (circuit breaker, fast paths) arrive without tokens.
+    """
+    # Shed before the 200 is committed, so overload still surfaces as a 503
+    if not EXECUTE_LIMITER.try_acquire():
+        raise HTTPException(status_code=503, detail="Server overloaded — please retry shortly")
+    started = time.perf_counter()
+
+    try:
+        request_id, tenant_id, user_id, lc_config, query_data = _prepare_execution(user_input, request)
+    except BaseException:
+        EXECUTE_LIMITER.release((time.perf_counter() - started) * 1000)
+        raise
+
+    async def events():
+        final_state: dict[str, Any] = {}
+        try:
+            graph = app_graph if app_graph is not None else _init_agent()
+            with TRACER.sampled_run():
+                async for mode, payload in graph.astream(
+                    query_data, config=lc_config, stream_mode=["messages", "values"],
+                ):
+                    if mode == "values":
+                        final_state = payload
+                        continue
+                    chunk, metadata = payload
+                    if (
+                        isinstance(chunk, AIMessageChunk)
+                        and isinstance(chunk.content, str)
+                        and chunk.content
+                        and not chunk.tool_call_chunks
+                        and metadata.get("langgraph_checkpoint_ns", "").startswith(_STREAMED_NODES)
+                    ):
+                        yield _sse({"type": "token", "text": chunk.content})
+
+            messages = final_state.get("messages", [])
+            yield _sse({
+                "type": "done",
+                "response": messages[-1].content if messages else "No response generated.",
+                "route": final_state.get("next", ""),
+                "reasoning": final_state.get("current_reasoning", ""),
+                "request_id": request_id,
+            })
+        except Exception as exc:
+            logger.exception("Agent execution failed | request_id=%s", request_id)
+            _audit_execution_failure(exc, tenant_id, user_id)
+            yield _sse({"type": "error", "detail": f"Agent execution failed: {exc}"})
+        finally:
+            # Free the slot as soon as the agent run ends, not when the socket closes
+            response.release_slot()
+
+    response = _LimitedStreamingResponse(
+        events(),
+        started,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    return response
 
 
 # ── Metrics & Dashboard endpoints ────────────────────────────────
+#
+# Dashboard endpoints return opaque, already JSON-native dicts, so they
+# hand back a pre-rendered PlatformJSONResponse and skip jsonable_encoder.
 
-@app.get("/platform/metrics")
+@app.get("/platform/metrics", response_model=None)
 def get_metrics():
     """Tool execution metrics dashboard payload."""
-    return get_metrics_collector().get_dashboard_payload()
+    return PlatformJSONResponse(METRICS.get_dashboard_payload())
 
 
-@app.get("/platform/metrics/history")
+@app.get("/platform/metrics/history", response_model=None)
 def get_metrics_history(limit: int = 100):
     """Recent execution history."""
-    return get_metrics_collector().get_recent_history(limit)
+    return PlatformJSONResponse(METRICS.get_recent_history(limit))
 
 
-@app.get("/platform/costs")
+@app.get("/platform/costs", response_model=None)
 def get_cost_dashboard(since: Optional[float] = None):
     """Cost analytics dashboard."""
-    return get_cost_analytics().get_summary_dashboard(since)
+    return PlatformJSONResponse(COSTS.get_summary_dashboard(since))
 
 
-@app.get("/platform/costs/tenant/{tenant_id}")
+@app.get("/platform/costs/tenant/{tenant_id}", response_model=None)
 def get_tenant_costs(tenant_id: str, since: Optional[float] = None):
     """Cost breakdown for a specific tenant."""
-    return get_cost_analytics().get_tenant_costs(tenant_id, since)
+    return PlatformJSONResponse(COSTS.get_tenant_costs(tenant_id, since))
 
 
-@app.get("/platform/costs/user/{user_id}")
+@app.get("/platform/costs/user/{user_id}", response_model=None)
 def get_user_costs(user_id: str, since: Optional[float] = None):
     """Cost breakdown for a specific user."""
-    return get_cost_analytics().get_user_costs(user_id, since)
+    return PlatformJSONResponse(COSTS.get_user_costs(user_id, since))
 
 
 # ── Prompt Registry endpoints ────────────────────────────────────
 
-@app.get("/platform/prompts")
+@app.get("/platform/prompts", response_model=None)
 def list_prompts():
     """List all registered prompts and their versions."""
-    return get_prompt_registry().list_prompts()
+    return PlatformJSONResponse(PROMPTS.list_prompts())
 
 
 @app.post("/platform/prompts")
 def create_prompt(req: PromptCreateRequest):
     """Register a new prompt version."""
-    pv = get_prompt_registry().register(
+    pv = PROMPTS.register(
         name=req.name,
         template=req.template,
         variables=req.variables,
@@ -353,14 +752,14 @@ def create_prompt(req: PromptCreateRequest):
 @app.post("/platform/prompts/activate")
 def activate_prompt(req: PromptActivateRequest):
     """Activate a specific prompt version."""
-    pv = get_prompt_registry().activate(req.name, req.version)
+    pv = PROMPTS.activate(req.name, req.version)
     return pv.to_dict()
 
 
-@app.get("/platform/prompts/changelog")
+@app.get("/platform/prompts/changelog", response_model=None)
 def get_prompt_changelog(limit: int = 50):
     """Prompt change history."""
-    return get_prompt_registry().get_changelog(limit)
+    return PlatformJSONResponse(PROMPTS.get_changelog(limit))
 
 
 # ── Circuit Breaker endpoints ────────────────────────────────────
@@ -368,9 +767,7 @@ def get_prompt_changelog(limit: int = 50):
 @app.get("/platform/circuit-breakers")
 def get_circuit_breakers():
     """Status of all circuit breakers."""
-    return {
-        "llm_api": get_circuit_breaker("llm_api").get_status(),
-    }
+    return {name: cb.get_status() for name, cb in CIRCUIT_BREAKERS.items()}
 
 
 @app.post("/platform/circuit-breakers/{name}/reset")
@@ -378,7 +775,7 @@ def reset_circuit_breaker(name: str):
     """Manually reset a circuit breaker."""
     cb = get_circuit_breaker(name)
     cb.reset()
-    get_audit_logger().log_event(
+    AUDIT_LOGGER.log_event(
         "circuit_breaker_manual_reset",
         details={"breaker": name},
         severity="warning",
@@ -390,32 +787,31 @@ def reset_circuit_breaker(name: str):
 # ── Evaluation endpoints ─────────────────────────────────────────
 
 @app.post("/platform/evaluation/run")
-def run_evaluation(benchmark_name: str = "default"):
+async def run_evaluation(benchmark_name: str = "default"):
     """Trigger an evaluation run against benchmark dataset."""
     harness = get_evaluation_harness()
 
-    def invoke_fn(query: str, patient_id: int) -> dict[str, Any]:
+    async def ainvoke_fn(query: str, patient_id: int) -> dict[str, Any]:
         query_data = {
+            **_EMPTY_STATE,
             "messages": [HumanMessage(content=query)],
             "id_number": patient_id,
-            "next": "",
-            "query": "",
-            "current_reasoning": "",
-            "memory_context": "",
             "tenant_id": "evaluation",
+            "route_cache_bypass": True,
         }
-        graph = _ensure_agent()
-        result = graph.invoke(query_data, config={"recursion_limit": settings.recursion_limit})
+        graph = app_graph if app_graph is not None else _init_agent()
+        result = await graph.ainvoke(query_data, config={"recursion_limit": settings.recursion_limit})
         messages = result.get("messages", [])
         return {
             "response": messages[-1].content if messages else "",
             "route": result.get("next", ""),
+            "tools_used": result.get("tools_used", []),
         }
 
-    suite_result = harness.run_evaluation(invoke_fn, benchmark_name)
+    suite_result = await harness.arun_evaluation(ainvoke_fn, benchmark_name)
 
-    # Run regression check
-    previous = harness.get_previous_result(benchmark_name)
+    # Run regression check (reads result files, so off the event loop)
+    previous = await asyncio.to_thread(harness.get_previous_result, benchmark_name)
     regression_report = get_regression_checker().check(suite_result, previous)
 
     return {
@@ -424,13 +820,13 @@ def run_evaluation(benchmark_name: str = "default"):
     }
 
 
-@app.get("/platform/evaluation/results")
+@app.get("/platform/evaluation/results", response_model=None)
 def get_evaluation_results(benchmark_name: str = "default"):
     """Get the latest evaluation results."""
     result = get_evaluation_harness().get_latest_result(benchmark_name)
     if not result:
-        return {"message": "No evaluation results found"}
-    return result.to_dict()
+        return PlatformJSONResponse({"message": "No evaluation results found"})
+    return PlatformJSONResponse(result.to_dict())
 
 
 # ── Memory Management endpoints ──────────────────────────────────
@@ -441,6 +837,11 @@ class MemoryStoreRequest(BaseModel):
     category: str = Field(default="general", description="Memory category")
     tenant_id: str = Field(default="default")
 
+    @field_validator("content")
+    @classmethod
+    def strip_content(cls, v: str) -> str:
+        return _strip_non_empty(v)
+
 
 class MemorySearchRequest(BaseModel):
     user_id: str = Field(description="Patient/user ID")
@@ -449,17 +850,22 @@ class MemorySearchRequest(BaseModel):
     category: Optional[str] = None
     tenant_id: str = Field(default="default")
 
+    @field_validator("query")
+    @classmethod
+    def strip_query(cls, v: str) -> str:
+        return _strip_non_empty(v)
 
-@app.get("/platform/memory/status")
+
+@app.get("/platform/memory/status", response_model=None)
 def memory_status():
     """Memory subsystem health and configuration."""
-    return get_memory_manager().get_status()
+    return PlatformJSONResponse(MEM.get_status())
 
 
 @app.get("/platform/memory/user/{user_id}")
 def get_user_memories(user_id: str, tenant_id: str = "default"):
     """Retrieve all memories for a specific user."""
-    manager = get_memory_manager()
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
@@ -474,7 +880,7 @@ def get_user_memories(user_id: str, tenant_id: str = "default"):
 @app.get("/platform/memory/user/{user_id}/context")
 def get_user_memory_context(user_id: str, query: str = "", tenant_id: str = "default"):
     """Get structured memory context for a user (as agents see it)."""
-    manager = get_memory_manager()
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
@@ -488,7 +894,7 @@ def get_user_memory_context(user_id: str, query: str = "", tenant_id: str = "def
 @app.post("/platform/memory/store")
 def store_memory(req: MemoryStoreRequest):
     """Manually store a memory for a user."""
-    manager = get_memory_manager()
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
@@ -504,7 +910,7 @@ def store_memory(req: MemoryStoreRequest):
 @app.post("/platform/memory/search")
 def search_memories(req: MemorySearchRequest):
     """Semantic search across a user's memories."""
-    manager = get_memory_manager()
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
@@ -526,15 +932,18 @@ def search_memories(req: MemorySearchRequest):
 @app.delete("/platform/memory/user/{user_id}")
 def delete_user_memories(user_id: str, tenant_id: str = "default"):
     """Delete all memories for a user (GDPR right-to-erasure)."""
-    manager = get_memory_manager()
+    # Routes seeded by the patient's queries are erased even without Mem0
+    route_entries = ROUTE_CACHE.purge_user(tenant_id, user_id) if ROUTE_CACHE is not None else 0
+
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
     result = manager.delete_all(user_id=user_id, tenant_id=tenant_id)
 
-    get_audit_logger().log_event(
+    AUDIT_LOGGER.log_event(
         "memory_gdpr_erasure",
-        details={"user_id": user_id, "tenant_id": tenant_id},
+        details={"user_id": user_id, "tenant_id": tenant_id, "route_cache_entries": route_entries},
         severity="warning",
         source="api",
     )
@@ -544,7 +953,7 @@ def delete_user_memories(user_id: str, tenant_id: str = "default"):
 @app.delete("/platform/memory/{memory_id}")
 def delete_single_memory(memory_id: str, user_id: str, tenant_id: str = "default"):
     """Delete a specific memory by ID."""
-    manager = get_memory_manager()
+    manager = MEM
     if not manager.enabled:
         raise HTTPException(status_code=503, detail="Memory system is not enabled")
 
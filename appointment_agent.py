@@ -9,10 +9,15 @@ Production-grade agent with:
   - Cost-tracking LLM callbacks
   - Structured audit logging
   - Prompt registry integration
+  - Async nodes — LLM and Mem0 I/O never block the event loop
 """
 
 from __future__ import annotations
 
+import asyncio
+import operator
+import re
+import threading
 import time
 from typing import Literal, Any, Optional
 
@@ -22,7 +27,8 @@ from typing_extensions import TypedDict, Annotated
 from langchain_core.prompts.chat import ChatPromptTemplate
 from langgraph.graph import START, StateGraph, END
 from langgraph.prebuilt import create_react_agent
-from langchain_core.messages import HumanMessage, AIMessage
+from langgraph.prebuilt.chat_agent_executor import AgentState as ReactAgentState
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
 from prompts.supervisor_prompt import system_prompt
 from utils.llms import LLMModel
@@ -46,12 +52,12 @@ from infrastructure.audit.logger import get_audit_logger
 from infrastructure.audit.transparency import get_decision_logger
 from infrastructure.metrics.collector import get_metrics_collector
 from infrastructure.resilience.circuit_breaker import get_circuit_breaker, CircuitBreakerOpenError
-from infrastructure.memory import get_memory_manager, build_memory_context
+from infrastructure.memory import get_memory_manager, abuild_memory_context
+from infrastructure.cache import TTLCache, get_route_cache
 from config.settings import get_settings
 
 logger = get_logger(__name__)
 
-
 class Router(TypedDict):
     next: Literal["information_node", "booking_node", "FINISH"]
     reasoning: str
@@ -65,6 +71,155 @@ class AgentState(TypedDict):
     current_reasoning: str
     memory_context: str  # Injected per-user memory from Mem0
     tenant_id: str
+    # First-turn RouteCacheLookup prefetched by memory_retrieval; holds the
+    # query embedding, so the supervisor clears it once consumed
+    route_lookup: Any
+    # Set by evaluation runs so routing is always decided by the model,
+    # never read from or seeded into the route cache
+    route_cache_bypass: bool
+    # Tools the sub-agents invoked during this run, in call order
+    tools_used: Annotated[list[str], operator.add]
+
+
+_SUPERVISOR_SYSTEM_MESSAGE = {"role": "system", "content": system_prompt}
+
+
+# Greetings/acknowledgements that carry nothing worth a memory search
+_TRIVIAL_QUERY = re.compile(r"(hi|hello|hey|thanks?|thank you|ok|okay|yes|no)\W*", re.IGNORECASE)
+
+
+def _tools_called(messages: list[Any]) -> list[str]:
+    """Names of the tools executed in a sub-agent's new messages."""
+    return [m.name for m in messages if isinstance(m, ToolMessage) and m.name]
+
+
+def _is_trivial_query(query: str) -> bool:
+    query = query.strip()
+    return len(query) < 4 or _TRIVIAL_QUERY.fullmatch(query) is not None
+
+
+# A sub-agent reply matching this has completed the task; the supervisor
+# would only answer FINISH, so skip its LLM call
+_COMPLETION_RE = re.compile(
+    r"(confirmed|booked|cancelled|canceled|rescheduled|available slots?|no availability)",
+    re.IGNORECASE,
+)
+_FASTPATH_REASONING = "rule-based FINISH (post-subagent completion)"
+
+
+def _is_completed_subagent_reply(message: Any) -> bool:
+    return (
+        isinstance(message, AIMessage)
+        and message.name in ("information_node", "booking_node")
+        and isinstance(message.content, str)
+        and _COMPLETION_RE.search(message.content) is not None
+    )
+
+
+def _tail_window(messages: list[Any], k: int) -> list[Any]:
+    """Original patient query plus the last ``k`` messages."""
+    if len(messages) <= k + 1:
+        return messages
+    return [messages[0]] + messages[-k:]
+
+
+# additional_kwargs marker for messages the graph injects on the patient's
+# behalf; OpenAI serialization ignores it, memory extraction skips on it.
+_SYSTEM_INJECTED = "system_injected"
+
+
+def _id_message(id_number: int) -> str:
+    return f"user's identification number is {int(id_number)}"
+
+
+class SubAgentState(ReactAgentState):
+    memory_instruction: str  # Rendered into the sub-agent system prompt
+
+
+INFORMATION_SYSTEM_PROMPT = (
+    "You are specialized agent to provide information related to availability of doctors "
+    "or any FAQs related to hospital based on the query. You have access to the tool.\n"
+    "Make sure to ask user politely if you need any further information to execute the tool.\n"
+    "For your information, Always consider current year is 2026.\n"
+    "You can also store important patient preferences or context using the memory tools."
+)
+
+BOOKING_SYSTEM_PROMPT = (
+    "You are specialized agent to set, cancel or reschedule appointment based on the query. "
+    "You have access to the tool.\n"
+    "Make sure to ask user politely if you need any further information to execute the tool.\n"
+    "For your information, Always consider current year is 2026.\n"
+    "After completing a booking action, use the memory tools to store the appointment details "
+    "and any patient preferences mentioned during the conversation."
+)
+
+
+def _memory_instruction(memory_block: str) -> str:
+    if not memory_block:
+        return ""
+    return (
+        "\n\nYou have access to the patient's memory context below. Use it to personalize your responses.\n"
+        + memory_block + "\n"
+    )
+
+
+def _sub_agent_prompt(base_prompt: str) -> ChatPromptTemplate:
+    # Memory text is substituted as a variable, never parsed as template syntax
+    return ChatPromptTemplate.from_messages([
+        ("system", base_prompt.replace("{", "{{").replace("}", "}}") + "{memory_instruction}"),
+        ("placeholder", "{messages}"),
+    ])
+
+
+class _NodeTimer:
+    """
+    Times a node body once and fans the result out to metrics and audit.
+
+    The run counts as successful unless the body raises or calls fail();
+    set ``route`` to include the routing decision in the audit record.
+    """
+
+    __slots__ = ("_agent", "_name", "_audit", "_start", "success", "error", "route")
+
+    def __init__(self, agent: "DoctorAppointmentAgent", name: str, audit: bool = True):
+        self._agent = agent
+        self._name = name
+        self._audit = audit
+        self._start = 0.0
+        self.success = True
+        self.error: Optional[str] = None
+        self.route = ""
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def fail(self, error: str) -> None:
+        self.success = False
+        self.error = error
+
+    def __enter__(self) -> "_NodeTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        elapsed = time.perf_counter() - self._start
+        if exc is not None:
+            self.fail(str(exc))
+        self._agent._metrics.record_agent_execution(
+            agent_name=self._name,
+            duration_seconds=elapsed,
+            success=self.success,
+        )
+        if self._audit:
+            self._agent._audit.log_agent_execution(
+                agent_name=self._name,
+                duration_ms=elapsed * 1000,
+                success=self.success,
+                route=self.route,
+                error=self.error,
+            )
+        return False
 
 
 class DoctorAppointmentAgent:
@@ -84,135 +239,210 @@ class DoctorAppointmentAgent:
 
     def __init__(self):
         self._settings = get_settings()
+        self.graph: Optional[StateGraph] = None
+        self.app: Any = None
         self._tracer = get_tracer()
         self._audit = get_audit_logger()
         self._decisions = get_decision_logger()
         self._metrics = get_metrics_collector()
         self._circuit_breaker = get_circuit_breaker("llm_api")
         self._memory = get_memory_manager()
+        self._route_cache = get_route_cache()
+        self._memory_context_cache: Optional[TTLCache] = None
+        if self._settings.memory_context_ttl_seconds > 0:
+            self._memory_context_cache = TTLCache(
+                maxsize=4096, ttl_seconds=self._settings.memory_context_ttl_seconds,
+            )
+
+        # Background memory extraction — started by the API lifespan;
+        # without it (CLI evaluation) extraction runs inline.
+        self._extraction_queue: Optional[asyncio.Queue] = None
+        self._extraction_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._extraction_task: Optional[asyncio.Task] = None
+        self._extraction_dropped = 0
 
         llm_model = LLMModel()
         self.llm_model = llm_model.get_raw_model()
+        self._router_llm = self.llm_model.with_structured_output(Router)
+
+        # Sub-agents are compiled once; only the memory instruction varies per turn
+        self._information_agent = create_react_agent(
+            model=self.llm_model,
+            tools=[
+                check_availability_by_doctor,
+                check_availability_by_specialization,
+                recall_patient_memories,
+                store_patient_memory,
+            ],
+            prompt=_sub_agent_prompt(INFORMATION_SYSTEM_PROMPT),
+            state_schema=SubAgentState,
+        )
+        self._booking_agent = create_react_agent(
+            model=self.llm_model,
+            tools=[
+                set_appointment,
+                cancel_appointment,
+                reschedule_appointment,
+                recall_patient_memories,
+                store_patient_memory,
+                get_patient_appointment_history,
+            ],
+            prompt=_sub_agent_prompt(BOOKING_SYSTEM_PROMPT),
+            state_schema=SubAgentState,
+        )
 
     # ── Memory Retrieval Node ────────────────────────────────────
 
-    def memory_retrieval_node(self, state: AgentState) -> Command[Literal["supervisor"]]:
+    async def memory_retrieval_node(self, state: AgentState) -> Command[Literal["supervisor"]]:
         """
         Entry node: retrieve user's long-term memories from Mem0
         and inject them as context for downstream agents.
         """
-        start_time = time.perf_counter()
         user_id = str(state["id_number"])
         tenant_id = state.get("tenant_id", "default")
-        logger.info("Memory retrieval node | user=%s", user_id)
+
+        # Use the initial query for semantic memory retrieval
+        messages = state.get("messages") or []
+        query = ""
+        if messages:
+            last_msg = messages[-1]
+            query = last_msg.content if hasattr(last_msg, "content") else str(last_msg)
+
+        # The supervisor's route-cache lookup embeds the same query; start it
+        # now so its embedding round trip overlaps the Mem0 search
+        route_task = None
+        if (
+            query and len(messages) == 1 and self._route_cache is not None
+            and not state.get("route_cache_bypass")
+        ):
+            route_task = asyncio.create_task(
+                asyncio.to_thread(self._route_cache.lookup, tenant_id, query)
+            )
 
         memory_text = ""
         if self._memory.enabled:
+            # Repeat queries from one patient reuse the recent context. The
+            # memory version in the key retires entries after any write or
+            # erasure; the query is in it because it drives the Mem0 search
+            cache_key = (
+                tenant_id, user_id, self._memory.memory_version(user_id), " ".join(query.lower().split()),
+            )
+            cached_text = (
+                self._memory_context_cache.get(cache_key)
+                if self._memory_context_cache is not None else None
+            )
+            if cached_text is not None:
+                memory_text = cached_text
+                self._metrics.increment("memory_context_cache_hit")
+            elif _is_trivial_query(query):
+                self._metrics.increment("memory_retrieval_skipped")
+            else:
+                with _NodeTimer(self, "memory_retrieval", audit=False) as timer:
+                    try:
+                        ctx = await abuild_memory_context(
+                            user_id=user_id,
+                            query=query,
+                            tenant_id=tenant_id,
+                        )
+                        memory_text = ctx.to_prompt_block()
+                        if self._memory_context_cache is not None:
+                            self._memory_context_cache.set(cache_key, memory_text)
+                        logger.info(
+                            "Memory retrieved | user=%s memories=%d elapsed=%.1fms",
+                            user_id, ctx.total_memories, timer.elapsed_ms,
+                        )
+                    except Exception as exc:
+                        logger.error("Memory retrieval failed: %s", exc)
+                        timer.fail(str(exc))
+
+        update: dict[str, Any] = {"memory_context": memory_text}
+        if route_task is not None:
             try:
-                # Use the initial query for semantic memory retrieval
-                query = ""
-                if state.get("messages"):
-                    last_msg = state["messages"][-1]
-                    query = last_msg.content if hasattr(last_msg, "content") else str(last_msg)
-
-                ctx = build_memory_context(
-                    user_id=user_id,
-                    query=query,
-                    tenant_id=tenant_id,
-                )
-                memory_text = ctx.to_prompt_block()
-
-                elapsed_ms = (time.perf_counter() - start_time) * 1000
-                self._metrics.record_agent_execution(
-                    agent_name="memory_retrieval",
-                    duration_seconds=elapsed_ms / 1000,
-                    success=True,
-                )
-                logger.info(
-                    "Memory retrieved | user=%s memories=%d elapsed=%.1fms",
-                    user_id, ctx.total_memories, elapsed_ms,
-                )
+                update["route_lookup"] = await route_task
             except Exception as exc:
-                logger.error("Memory retrieval failed: %s", exc)
-                elapsed_ms = (time.perf_counter() - start_time) * 1000
-                self._metrics.record_agent_execution(
-                    agent_name="memory_retrieval",
-                    duration_seconds=elapsed_ms / 1000,
-                    success=False,
-                )
+                logger.warning("Route cache prefetch failed: %s", exc)
 
-        return Command(
-            goto="supervisor",
-            update={"memory_context": memory_text},
-        )
+        return Command(goto="supervisor", update=update)
 
     # ── Supervisor Node ──────────────────────────────────────────
 
-    def supervisor_node(self, state: AgentState) -> Command[Literal['information_node', 'booking_node', 'memory_extraction', '__end__']]:
-        start_time = time.perf_counter()
-        logger.info("Supervisor node invoked")
-
-        # Build memory-enriched system prompt
-        memory_block = state.get("memory_context", "")
-        enriched_system_prompt = system_prompt
-        if memory_block:
-            enriched_system_prompt = (
-                system_prompt + "\n\n" + memory_block
-            )
-
-        messages = [
-            {"role": "system", "content": enriched_system_prompt},
-            {"role": "user", "content": f"user's identification number is {state['id_number']}"},
-        ] + state["messages"]
-
-        query = ''
-        if len(state['messages']) == 1:
-            query = state['messages'][0].content
+    async def supervisor_node(self, state: AgentState) -> Command[Literal['information_node', 'booking_node', 'memory_extraction', '__end__']]:
+        logger.debug("Supervisor node invoked")
+
+        if state["messages"] and _is_completed_subagent_reply(state["messages"][-1]):
+            with _NodeTimer(self, "supervisor") as timer:
+                timer.route = "FINISH"
+                self._metrics.increment("supervisor_fastpath_hits")
+                self._decisions.log_routing_decision(
+                    agent_name="supervisor",
+                    available_routes=["information_node", "booking_node", "FINISH"],
+                    selected_route="FINISH",
+                    reasoning=_FASTPATH_REASONING,
+                    input_summary="(continuation)",
+                )
+            return Command(goto="memory_extraction", update={
+                "next": "memory_extraction",
+                "current_reasoning": _FASTPATH_REASONING,
+            })
 
-        # Invoke LLM through circuit breaker
-        try:
-            response = self._circuit_breaker.call(
-                self.llm_model.with_structured_output(Router).invoke,
-                messages,
-            )
-        except CircuitBreakerOpenError as exc:
-            logger.error("Circuit breaker open for supervisor LLM call: %s", exc)
-            self._audit.log_agent_execution(
+        with _NodeTimer(self, "supervisor") as timer:
+            # Static system prompt first and byte-identical on every call so the
+            # provider's prompt prefix cache can reuse it; per-user memory follows
+            # as its own message and is fixed for the whole conversation.
+            messages: list[Any] = [_SUPERVISOR_SYSTEM_MESSAGE]
+            memory_block = state.get("memory_context", "")
+            if memory_block:
+                messages.append({"role": "system", "content": memory_block})
+            messages.append({"role": "user", "content": _id_message(state["id_number"])})
+            # Routing needs the patient's intent and the latest replies, not
+            # the whole transcript; sub-agents still see full history
+            messages += _tail_window(state["messages"], self._settings.supervisor_context_window)
+
+            query = ''
+            if len(state['messages']) == 1:
+                query = state['messages'][0].content
+
+            # Only first-turn routing is cached: later turns depend on the
+            # sub-agent replies in state, not just the patient's query.
+            cache_lookup = None
+            tenant_id = state.get("tenant_id", "default")
+            if query and self._route_cache is not None and not state.get("route_cache_bypass"):
+                cache_lookup = state.get("route_lookup")
+                if cache_lookup is None:
+                    cache_lookup = await asyncio.to_thread(self._route_cache.lookup, tenant_id, query)
+
+            # Invoke LLM through circuit breaker
+            try:
+                if cache_lookup is not None and cache_lookup.hit:
+                    response = cache_lookup.route
+                    logger.info("Supervisor route cache hit (similarity=%.3f)", cache_lookup.similarity)
+                else:
+                    response = await self._circuit_breaker.acall(self._router_llm.ainvoke, messages)
+                    if cache_lookup is not None:
+                        await asyncio.to_thread(
+                            self._route_cache.store, tenant_id, query, response, cache_lookup.embedding,
+                            str(state["id_number"]),
+                        )
+            except CircuitBreakerOpenError as exc:
+                logger.error("Circuit breaker open for supervisor LLM call: %s", exc)
+                timer.fail(str(exc))
+                return Command(goto="memory_extraction", update={"next": "memory_extraction", "current_reasoning": f"Circuit breaker: {exc}"})
+
+            goto = response["next"]
+            reasoning = response["reasoning"]
+            timer.route = goto
+
+            logger.info("Supervisor routing decision: %s", goto)
+            logger.debug("Supervisor reasoning: %s", reasoning)
+
+            # ── Decision transparency logging ────────────────────
+            self._decisions.log_routing_decision(
                 agent_name="supervisor",
-                duration_ms=(time.perf_counter() - start_time) * 1000,
-                success=False,
-                error=str(exc),
+                available_routes=["information_node", "booking_node", "FINISH"],
+                selected_route=goto,
+                reasoning=reasoning,
+                input_summary=query[:200] if query else "(continuation)",
             )
-            return Command(goto="memory_extraction", update={"next": "memory_extraction", "current_reasoning": f"Circuit breaker: {exc}"})
-
-        goto = response["next"]
-        reasoning = response["reasoning"]
-
-        logger.info("Supervisor routing decision: %s", goto)
-        logger.debug("Supervisor reasoning: %s", reasoning)
-
-        # ── Decision transparency logging ────────────────────────
-        self._decisions.log_routing_decision(
-            agent_name="supervisor",
-            available_routes=["information_node", "booking_node", "FINISH"],
-            selected_route=goto,
-            reasoning=reasoning,
-            input_summary=query[:200] if query else "(continuation)",
-        )
-
-        # ── Metrics recording ────────────────────────────────────
-        elapsed = time.perf_counter() - start_time
-        self._metrics.record_agent_execution(
-            agent_name="supervisor",
-            duration_seconds=elapsed,
-            success=True,
-        )
-        self._audit.log_agent_execution(
-            agent_name="supervisor",
-            duration_ms=elapsed * 1000,
-            success=True,
-            route=goto,
-        )
 
         if goto == "FINISH":
             goto = "memory_extraction"
@@ -222,7 +452,11 @@ class DoctorAppointmentAgent:
                 'next': goto,
                 'query': query,
                 'current_reasoning': reasoning,
-                'messages': [HumanMessage(content=f"user's identification number is {state['id_number']}")]
+                'route_lookup': None,
+                'messages': [HumanMessage(
+                    content=_id_message(state['id_number']),
+                    additional_kwargs={_SYSTEM_INJECTED: True},
+                )]
             })
         return Command(goto=goto, update={
             'next': goto,
@@ -231,219 +465,219 @@ class DoctorAppointmentAgent:
 
     # ── Information Node ─────────────────────────────────────────
 
-    def information_node(self, state: AgentState) -> Command[Literal['supervisor']]:
-        start_time = time.perf_counter()
-        logger.info("Information node invoked")
-
-        memory_block = state.get("memory_context", "")
-        memory_instruction = ""
-        if memory_block:
-            memory_instruction = (
-                "\n\nYou have access to the patient's memory context below. Use it to personalize your responses.\n"
-                + memory_block + "\n"
-            )
-
-        info_system_prompt = (
-            "You are specialized agent to provide information related to availability of doctors "
-            "or any FAQs related to hospital based on the query. You have access to the tool.\n"
-            "Make sure to ask user politely if you need any further information to execute the tool.\n"
-            "For your information, Always consider current year is 2026.\n"
-            "You can also store important patient preferences or context using the memory tools."
-            + memory_instruction
-        )
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", info_system_prompt),
-            ("placeholder", "{messages}"),
-        ])
+    async def information_node(self, state: AgentState) -> Command[Literal['supervisor']]:
+        logger.debug("Information node invoked")
 
-        information_agent = create_react_agent(
-            model=self.llm_model,
-            tools=[
-                check_availability_by_doctor,
-                check_availability_by_specialization,
-                recall_patient_memories,
-                store_patient_memory,
-            ],
-            prompt=prompt,
-        )
+        agent_input = {
+            "messages": state["messages"],
+            "memory_instruction": _memory_instruction(state.get("memory_context", "")),
+        }
 
-        try:
-            result = self._circuit_breaker.call(information_agent.invoke, state)
-            success = True
-            error = None
-        except CircuitBreakerOpenError as exc:
-            logger.error("Circuit breaker open for information node: %s", exc)
-            error = str(exc)
-            success = False
-            result = {"messages": [AIMessage(content=f"Service temporarily unavailable: {exc}", name="information_node")]}
-        except Exception as exc:
-            logger.exception("Information node failed")
-            error = str(exc)
-            success = False
-            result = {"messages": [AIMessage(content=f"I encountered an error processing your request. Please try again.", name="information_node")]}
-
-        elapsed = time.perf_counter() - start_time
-        self._metrics.record_agent_execution(
-            agent_name="information_node",
-            duration_seconds=elapsed,
-            success=success,
-        )
-        self._audit.log_agent_execution(
-            agent_name="information_node",
-            duration_ms=elapsed * 1000,
-            success=success,
-            error=error,
-        )
+        with _NodeTimer(self, "information_node") as timer:
+            try:
+                result = await self._circuit_breaker.acall(self._information_agent.ainvoke, agent_input)
+            except CircuitBreakerOpenError as exc:
+                logger.error("Circuit breaker open for information node: %s", exc)
+                timer.fail(str(exc))
+                result = {"messages": [AIMessage(content=f"Service temporarily unavailable: {exc}", name="information_node")]}
+            except Exception as exc:
+                logger.exception("Information node failed")
+                timer.fail(str(exc))
+                result = {"messages": [AIMessage(content=f"I encountered an error processing your request. Please try again.", name="information_node")]}
 
         return Command(
             update={
-                "messages": state["messages"] + [
-                    AIMessage(content=result["messages"][-1].content, name="information_node")
-                ]
+                # add_messages appends the delta; no need to resend history
+                "messages": [AIMessage(content=result["messages"][-1].content, name="information_node")],
+                "tools_used": _tools_called(result["messages"][len(agent_input["messages"]):]),
             },
             goto="supervisor",
         )
 
     # ── Booking Node ─────────────────────────────────────────────
 
-    def booking_node(self, state: AgentState) -> Command[Literal['supervisor']]:
-        start_time = time.perf_counter()
-        logger.info("Booking node invoked")
+    async def booking_node(self, state: AgentState) -> Command[Literal['supervisor']]:
+        logger.debug("Booking node invoked")
 
-        memory_block = state.get("memory_context", "")
-        memory_instruction = ""
-        if memory_block:
-            memory_instruction = (
-                "\n\nYou have access to the patient's memory context below. Use it to personalize your responses.\n"
-                + memory_block + "\n"
-            )
+        agent_input = {
+            "messages": state["messages"],
+            "memory_instruction": _memory_instruction(state.get("memory_context", "")),
+        }
 
-        booking_system_prompt = (
-            "You are specialized agent to set, cancel or reschedule appointment based on the query. "
-            "You have access to the tool.\n"
-            "Make sure to ask user politely if you need any further information to execute the tool.\n"
-            "For your information, Always consider current year is 2026.\n"
-            "After completing a booking action, use the memory tools to store the appointment details "
-            "and any patient preferences mentioned during the conversation."
-            + memory_instruction
-        )
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", booking_system_prompt),
-            ("placeholder", "{messages}"),
-        ])
-
-        booking_agent = create_react_agent(
-            model=self.llm_model,
-            tools=[
-                set_appointment,
-                cancel_appointment,
-                reschedule_appointment,
-                recall_patient_memories,
-                store_patient_memory,
-                get_patient_appointment_history,
-            ],
-            prompt=prompt,
-        )
-
-        try:
-            result = self._circuit_breaker.call(booking_agent.invoke, state)
-            success = True
-            error = None
-        except CircuitBreakerOpenError as exc:
-            logger.error("Circuit breaker open for booking node: %s", exc)
-            error = str(exc)
-            success = False
-            result = {"messages": [AIMessage(content=f"Service temporarily unavailable: {exc}", name="booking_node")]}
-        except Exception as exc:
-            logger.exception("Booking node failed")
-            error = str(exc)
-            success = False
-            result = {"messages": [AIMessage(content=f"I encountered an error processing your request. Please try again.", name="booking_node")]}
-
-        elapsed = time.perf_counter() - start_time
-        self._metrics.record_agent_execution(
-            agent_name="booking_node",
-            duration_seconds=elapsed,
-            success=success,
-        )
-        self._audit.log_agent_execution(
-            agent_name="booking_node",
-            duration_ms=elapsed * 1000,
-            success=success,
-            error=error,
-        )
+        with _NodeTimer(self, "booking_node") as timer:
+            try:
+                result = await self._circuit_breaker.acall(self._booking_agent.ainvoke, agent_input)
+            except CircuitBreakerOpenError as exc:
+                logger.error("Circuit breaker open for booking node: %s", exc)
+                timer.fail(str(exc))
+                result = {"messages": [AIMessage(content=f"Service temporarily unavailable: {exc}", name="booking_node")]}
+            except Exception as exc:
+                logger.exception("Booking node failed")
+                timer.fail(str(exc))
+                result = {"messages": [AIMessage(content=f"I encountered an error processing your request. Please try again.", name="booking_node")]}
 
         return Command(
             update={
-                "messages": state["messages"] + [
-                    AIMessage(content=result["messages"][-1].content, name="booking_node")
-                ]
+                # add_messages appends the delta; no need to resend history
+                "messages": [AIMessage(content=result["messages"][-1].content, name="booking_node")],
+                "tools_used": _tools_called(result["messages"][len(agent_input["messages"]):]),
             },
             goto="supervisor",
         )
 
     # ── Workflow Compilation ─────────────────────────────────────
 
-    def memory_extraction_node(self, state: AgentState) -> dict[str, Any]:
+    async def memory_extraction_node(self, state: AgentState) -> dict[str, Any]:
         """
-        Terminal node: extract and store memories from the completed
-        conversation before returning the final response.
+        Terminal node: hand the completed conversation to memory extraction.
 
-        Runs asynchronously — failures here don't affect the user response.
+        When the background worker is running the job is queued and the
+        node returns immediately, keeping the Mem0 extraction LLM call off
+        the response path. Otherwise extraction runs inline.
         """
         if not self._memory.enabled or not self._settings.memory_auto_extract:
             return {}
 
-        user_id = str(state["id_number"])
-        tenant_id = state.get("tenant_id", "default")
-        logger.info("Memory extraction | user=%s", user_id)
+        # Build conversation messages for Mem0 extraction
+        conversation: list[dict[str, str]] = []
+        for msg in state.get("messages", []):
+            if hasattr(msg, "content"):
+                # Skip system-injected messages
+                if not msg.content or msg.additional_kwargs.get(_SYSTEM_INJECTED):
+                    continue
+                role = "user" if isinstance(msg, HumanMessage) else "assistant"
+                conversation.append({"role": role, "content": msg.content})
+
+        if not conversation:
+            return {}
 
-        start_time = time.perf_counter()
+        job = {
+            "user_id": str(state["id_number"]),
+            "tenant_id": state.get("tenant_id", "default"),
+            "conversation": conversation,
+        }
 
-        try:
-            # Build conversation messages for Mem0 extraction
-            conversation: list[dict[str, str]] = []
-            for msg in state.get("messages", []):
-                if hasattr(msg, "content"):
-                    role = "user" if isinstance(msg, HumanMessage) else "assistant"
-                    # Skip system-injected messages
-                    content = msg.content
-                    if content and not content.startswith("user's identification number"):
-                        conversation.append({"role": role, "content": content})
-
-            if conversation:
+        if self._extraction_queue is not None and self._extraction_loop is asyncio.get_running_loop():
+            try:
+                self._extraction_queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self._extraction_dropped += 1
+                logger.warning("Memory extraction queue full — dropped job for user=%s", job["user_id"])
+                self._metrics.record_agent_execution(
+                    agent_name="memory_extraction",
+                    duration_seconds=0.0,
+                    success=False,
+                )
+            return {}
+
+        await asyncio.to_thread(self._extract_memories, job)
+        return {}
+
+    def _extract_memories(self, job: dict[str, Any]) -> None:
+        user_id = job["user_id"]
+
+        with _NodeTimer(self, "memory_extraction", audit=False) as timer:
+            try:
                 self._memory.store_interaction_memories(
                     user_id=user_id,
-                    messages=conversation,
-                    tenant_id=tenant_id,
+                    messages=job["conversation"],
+                    tenant_id=job["tenant_id"],
                 )
-
-            elapsed_ms = (time.perf_counter() - start_time) * 1000
+                logger.info(
+                    "Memory extraction complete | user=%s msgs=%d elapsed=%.1fms",
+                    user_id, len(job["conversation"]), timer.elapsed_ms,
+                )
+            except Exception as exc:
+                logger.error("Memory extraction failed: %s", exc)
+                timer.fail(str(exc))
+
+    @staticmethod
+    def _coalesce_extraction_jobs(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Merge jobs for the same patient so Mem0 extracts from them in one call."""
+        merged: dict[tuple[str, str], dict[str, Any]] = {}
+        for job in jobs:
+            key = (job["tenant_id"], job["user_id"])
+            if key in merged:
+                merged[key]["conversation"].extend(job["conversation"])
+            else:
+                merged[key] = {**job, "conversation": list(job["conversation"])}
+        return list(merged.values())
+
+    async def _extraction_worker(self, queue: asyncio.Queue) -> None:
+        batch_size = self._settings.memory_extraction_batch_size
+        window = self._settings.memory_extraction_batch_window_ms / 1000
+        while True:
+            batch = [await queue.get()]
+            # Give concurrent requests a short window to join this batch
+            if queue.qsize() < batch_size - 1:
+                await asyncio.sleep(window)
+            while len(batch) < batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            start_time = time.perf_counter()
+            jobs = self._coalesce_extraction_jobs(batch)
+            try:
+                await asyncio.gather(*(
+                    asyncio.to_thread(self._extract_memories, job) for job in jobs
+                ))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+            elapsed = time.perf_counter() - start_time
             self._metrics.record_agent_execution(
-                agent_name="memory_extraction",
-                duration_seconds=elapsed_ms / 1000,
+                agent_name="memory_extraction_batch",
+                duration_seconds=elapsed,
                 success=True,
             )
-            logger.info(
-                "Memory extraction complete | user=%s msgs=%d elapsed=%.1fms",
-                user_id, len(conversation), elapsed_ms,
+            logger.debug(
+                "Memory extraction batch | jobs=%d patients=%d elapsed=%.1fms",
+                len(batch), len(jobs), elapsed * 1000,
             )
 
-        except Exception as exc:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000
-            logger.error("Memory extraction failed: %s", exc)
-            self._metrics.record_agent_execution(
-                agent_name="memory_extraction",
-                duration_seconds=elapsed_ms / 1000,
-                success=False,
+    def start_memory_extraction_worker(self) -> None:
+        """Start the background extraction consumer on the running event loop."""
+        if self._extraction_task is not None:
+            return
+        self._extraction_queue = asyncio.Queue(maxsize=self._settings.memory_extraction_queue_size)
+        self._extraction_loop = asyncio.get_running_loop()
+        self._extraction_task = asyncio.create_task(self._extraction_worker(self._extraction_queue))
+
+    async def stop_memory_extraction_worker(self, timeout: float = 30.0) -> None:
+        """Drain queued extraction jobs (up to timeout) and stop the consumer."""
+        if self._extraction_task is None:
+            return
+        try:
+            await asyncio.wait_for(self._extraction_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Memory extraction drain timed out — %d jobs abandoned",
+                self._extraction_queue.qsize(),
             )
-
-        return {}
+        self._extraction_task.cancel()
+        self._extraction_task = None
+        self._extraction_queue = None
+        self._extraction_loop = None
+
+    def get_extraction_status(self) -> dict[str, Any]:
+        return {
+            "background": self._extraction_task is not None,
+            "queued": self._extraction_queue.qsize() if self._extraction_queue is not None else 0,
+            "dropped": self._extraction_dropped,
+        }
 
     def workflow(self):
-        """Compile the memory-aware multi-agent state graph."""
+        """
+        Compile the memory-aware multi-agent state graph.
+
+        Compiled once per agent; later calls return the same app.
+        """
+        if self.app is not None:
+            return self.app
+
         self.graph = StateGraph(AgentState)
 
         # Nodes
@@ -463,3 +697,19 @@ class DoctorAppointmentAgent:
 
         self.app = self.graph.compile()
         return self.app
+
+
+_agent: Optional[DoctorAppointmentAgent] = None
+_agent_lock = threading.Lock()
+
+
+def get_agent() -> DoctorAppointmentAgent:
+    """Singleton factory — the agent with its workflow already compiled."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                agent = DoctorAppointmentAgent()
+                agent.workflow()
+                _agent = agent
+    return _agent
@@ -25,8 +25,28 @@ class Environment(str, Enum):
     TESTING = "testing"
 
 
+try:
+    # libyaml-backed loader; the pure-Python one is an order of magnitude slower
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 _CONFIG_DIR = Path(__file__).resolve().parent / "environments"
 
+# Parsed YAML per file path, invalidated when the file's mtime changes
+_YAML_CACHE: dict[Path, tuple[float, dict[str, Any]]] = {}
+
+
+def _read_yaml(path: Path) -> dict[str, Any]:
+    mtime = path.stat().st_mtime
+    cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        loaded = yaml.load(f, Loader=_YamlLoader) or {}
+    _YAML_CACHE[path] = (mtime, loaded)
+    return loaded
+
 
 def _load_yaml_config(env: str) -> dict[str, Any]:
     """Load base + environment-specific YAML, merged."""
@@ -35,9 +55,7 @@ def _load_yaml_config(env: str) -> dict[str, Any]:
     config: dict[str, Any] = {}
     for p in (base_path, env_path):
         if p.exists():
-            with open(p, "r") as f:
-                loaded = yaml.safe_load(f) or {}
-                config = _deep_merge(config, loaded)
+            config = _deep_merge(config, _read_yaml(p))
     return config
 
 
@@ -64,6 +82,9 @@ class LangSmithSettings(BaseSettings):
     endpoint: str = Field(default="https://api.smith.langchain.com", description="LangSmith API endpoint")
     tracing_v2: bool = Field(default=True, alias="LANGCHAIN_TRACING_V2")
     tracing_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0, description="Fraction of traces to sample")
+    callbacks_background: bool = Field(default=True, description="Submit runs from a background thread instead of inline")
+    batch_size_bytes: int = Field(default=0, ge=0, description="Max batch payload size for run export; 0 uses the client default")
+    flush_timeout: float = Field(default=5.0, ge=0.0, description="Seconds to wait for pending runs on shutdown")
 
     @field_validator("tracing_v2", mode="before")
     @classmethod
@@ -96,7 +117,13 @@ class Settings(BaseSettings):
     api_port: int = Field(default=8003)
     api_base_url: str = Field(default="")
     api_workers: int = Field(default=1)
+    api_loop: str = Field(default="auto", description="uvicorn event loop: auto | uvloop | asyncio")
+    api_http: str = Field(default="auto", description="uvicorn HTTP parser: auto | httptools | h11")
     api_cors_origins: list[str] = Field(default=["*"])
+    api_profiling_enabled: bool = Field(
+        default=False,
+        description="Allow per-request pyinstrument profiling outside debug (never in production)",
+    )
 
     # ── LLM ──────────────────────────────────────────────────────
     openai_api_key: str = Field(default="")
@@ -108,6 +135,7 @@ class Settings(BaseSettings):
     # ── Agent ────────────────────────────────────────────────────
     recursion_limit: int = Field(default=20, ge=1)
     max_agent_steps: int = Field(default=15, ge=1)
+    supervisor_context_window: int = Field(default=4, ge=1, description="Recent messages sent to the supervisor besides the original query")
 
     # ── LangSmith ────────────────────────────────────────────────
     langsmith: LangSmithSettings = Field(default_factory=LangSmithSettings)
@@ -119,20 +147,42 @@ class Settings(BaseSettings):
     retry_max_attempts: int = Field(default=3, ge=1)
     retry_base_delay: float = Field(default=1.0, ge=0.1)
     retry_max_delay: float = Field(default=30.0, ge=1.0)
+    max_concurrent_executions: int = Field(default=32, ge=1, description="In-flight /execute cap before shedding with 503")
+    execute_latency_slo_ms: float = Field(default=30_000.0, gt=0, description="p99 target that drives the adaptive /execute limit")
+
+    # ── Metrics ──────────────────────────────────────────────────
+    metrics_history_size: int = Field(default=10_000, ge=1, description="Execution records kept in memory")
+    metrics_duration_window: int = Field(default=1024, ge=1, description="Recent durations per tool/agent used for percentiles")
+
+    # ── Route Cache ──────────────────────────────────────────────
+    route_cache_enabled: bool = Field(default=True, description="Semantic cache in front of supervisor routing")
+    route_cache_db_path: str = Field(default="data/route_cache.db")
+    route_cache_hit_threshold: float = Field(default=0.95, ge=0.0, le=1.0, description="Cosine similarity for a direct hit")
+    route_cache_near_threshold: float = Field(default=0.85, ge=0.0, le=1.0, description="Below hit threshold: counted as near miss, LLM decides")
+    route_cache_max_entries: int = Field(default=5000, ge=1, description="Cached queries kept per tenant")
+    route_cache_ttl_seconds: float = Field(default=604800.0, gt=0.0, description="Cached routes expire after this long")
 
     # ── Cost Analytics ───────────────────────────────────────────
     cost_tracking_enabled: bool = Field(default=True)
     cost_storage_backend: str = Field(default="sqlite", description="sqlite | postgres | memory")
     cost_db_path: str = Field(default="data/cost_analytics.db")
+    cost_query_engine: str = Field(default="sqlite", description="sqlite | duckdb (optional, columnar reads of the SQLite file)")
 
     # ── Audit ────────────────────────────────────────────────────
     audit_log_enabled: bool = Field(default=True)
     audit_log_file: str = Field(default="logs/audit.jsonl")
     decision_log_file: str = Field(default="logs/decisions.jsonl")
+    audit_fsync_policy: str = Field(default="periodic", description="each | batch | periodic | none")
+    audit_fsync_interval: float = Field(default=1.0, gt=0.0, description="Max seconds between fsyncs of audit/decision logs")
+    audit_segment_bytes: int = Field(default=16 * 1024 * 1024, ge=0, description="Rotate audit/decision logs at this size (0 = never)")
+    audit_checksums: bool = Field(default=False, description="Prefix each audit/decision line with its CRC32")
 
     # ── Evaluation ───────────────────────────────────────────────
     eval_benchmark_dir: str = Field(default="evaluation/benchmarks")
     eval_results_dir: str = Field(default="evaluation/results")
+    eval_concurrency: int = Field(default=8, ge=1, description="Benchmark cases evaluated in parallel")
+    eval_batch_enabled: bool = Field(default=False, description="Allow routing evals through the OpenAI Batch API")
+    eval_batch_poll_seconds: float = Field(default=30.0, gt=0.0, description="Batch job status poll interval")
     regression_threshold_pct: float = Field(default=5.0, ge=0.0, description="Max allowed % regression")
 
     # ── Secrets ──────────────────────────────────────────────────
@@ -149,7 +199,17 @@ class Settings(BaseSettings):
     memory_llm_model: str = Field(default="", description="LLM for memory extraction; falls back to openai_model")
     memory_embedding_model: str = Field(default="text-embedding-3-small")
     memory_max_results: int = Field(default=15, ge=1, description="Max memories to retrieve per query")
+    memory_recall_cache_ttl_seconds: float = Field(default=60.0, ge=0.0, description="Reuse recall results per (user, query) for this long; 0 disables")
+    memory_recall_cache_size: int = Field(default=512, ge=1, description="Max cached recall results")
+    memory_min_score: float = Field(default=0.4, ge=0.0, le=1.0, description="Drop search hits below this similarity (qdrant/default stores); 0 disables")
     memory_auto_extract: bool = Field(default=True, description="Auto-extract memories from conversations")
+    memory_context_ttl_seconds: float = Field(default=60.0, ge=0.0, description="Reuse a patient's memory context for this long; 0 disables")
+    memory_extraction_queue_size: int = Field(default=1024, ge=1, description="Pending background extraction jobs before dropping")
+    memory_extraction_batch_size: int = Field(default=32, ge=1, description="Max extraction jobs per background batch")
+    memory_extraction_batch_window_ms: float = Field(default=50.0, ge=0.0, description="Wait for more jobs before running a batch")
+    memory_write_queue_size: int = Field(default=1024, ge=1, description="Pending write-behind memory adds before writing inline")
+    memory_write_batch_size: int = Field(default=32, ge=1, description="Max queued memory adds per background batch")
+    memory_write_batch_window_ms: float = Field(default=50.0, ge=0.0, description="Wait for more memory adds before writing a batch")
 
     # ── Data ─────────────────────────────────────────────────────
     data_dir: str = Field(default="data")
@@ -1,9 +1,11 @@
 from infrastructure.audit.logger import AuditLogger, get_audit_logger
 from infrastructure.audit.transparency import DecisionLogger, get_decision_logger
+from infrastructure.audit.writer import scan_jsonl
 
 __all__ = [
     "AuditLogger",
     "get_audit_logger",
     "DecisionLogger",
     "get_decision_logger",
+    "scan_jsonl",
 ]
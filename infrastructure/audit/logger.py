@@ -11,15 +11,24 @@ Provides an immutable, append-only audit trail for:
 
 from __future__ import annotations
 
-import json
 import logging
-import os
 import threading
 import uuid
-from datetime import datetime, timezone
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+import orjson
+
+from infrastructure.audit.writer import BackgroundJsonlWriter, scan_jsonl
+from utils.clock import utc_now_iso
+
+_SEVERITY_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
 
 
 class AuditLogger:
@@ -29,6 +38,9 @@ class AuditLogger:
     Writes JSON Lines to a file and optionally to Python logging.
     Each log entry is a self-contained JSON object with:
       - event_id, timestamp, event_type, details, context
+
+    File appends are handed to a background writer thread, so callers
+    never block on disk I/O; call ``flush()`` where durability matters.
     """
 
     def __init__(
@@ -36,18 +48,45 @@ class AuditLogger:
         log_file: str = "logs/audit.jsonl",
         enabled: bool = True,
         also_log_to_python: bool = True,
+        fsync_interval: float = 1.0,
+        fsync_policy: str = "periodic",
+        segment_bytes: int = 0,
+        checksums: bool = False,
     ):
         self._enabled = enabled
         self._also_log = also_log_to_python
-        self._lock = threading.Lock()
         self._logger = logging.getLogger("platform.audit")
 
+        self._writer: Optional[BackgroundJsonlWriter] = None
         if enabled:
-            path = Path(log_file)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            self._file_path = path
-        else:
-            self._file_path = None
+            self._writer = BackgroundJsonlWriter(
+                Path(log_file),
+                fsync_interval=fsync_interval,
+                fsync_policy=fsync_policy,
+                segment_bytes=segment_bytes,
+                checksums=checksums,
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued events are written and fsynced."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Drain pending records and release the log file handle."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def scan(self, from_segment: Optional[str] = None) -> Iterator[dict[str, Any]]:
+        """Iterate written events across rotated segments, oldest first."""
+        if self._writer is None:
+            return iter(())
+        return scan_jsonl(self._writer.path, from_segment=from_segment)
 
     def log_event(
         self,
@@ -63,11 +102,38 @@ class AuditLogger:
         """
         Write a structured audit event.
 
-        Returns the event dict (useful for testing).
+        Returns the event dict (useful for testing), or an empty dict
+        when auditing is disabled.
         """
-        event = {
-            "event_id": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        if not self._enabled:
+            return {}
+
+        event = self._build_event(
+            event_type,
+            details=details,
+            tenant_id=tenant_id,
+            user_id=user_id,
+            session_id=session_id,
+            severity=severity,
+            source=source,
+        )
+        self._write_events([event])
+        return event
+
+    def _build_event(
+        self,
+        event_type: str,
+        *,
+        details: Optional[dict[str, Any]] = None,
+        tenant_id: str = "",
+        user_id: str = "",
+        session_id: str = "",
+        severity: str = "info",
+        source: str = "",
+    ) -> dict[str, Any]:
+        return {
+            "event_id": uuid.uuid4().hex,
+            "timestamp": utc_now_iso(),
             "event_type": event_type,
             "severity": severity,
             "source": source,
@@ -77,24 +143,21 @@ class AuditLogger:
             "details": details or {},
         }
 
-        if not self._enabled:
-            return event
-
-        line = json.dumps(event, default=str, separators=(",", ":"))
-
-        with self._lock:
-            if self._file_path:
-                with open(self._file_path, "a", encoding="utf-8") as f:
-                    f.write(line + "\n")
+    def _write_events(self, events: list[dict[str, Any]]) -> None:
+        """Queue events for the JSONL file as a single append."""
+        lines = [orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS) for event in events]
+        if self._writer is not None:
+            self._writer.write(b"\n".join(lines) + b"\n")
 
         if self._also_log:
-            log_level = getattr(logging, severity.upper(), logging.INFO)
-            self._logger.log(log_level, "[AUDIT:%s] %s", event_type, json.dumps(details or {}, default=str))
-
-        return event
+            # Reuse the serialized line rather than encoding details twice
+            for event, line in zip(events, lines):
+                log_level = _SEVERITY_LEVELS.get(event["severity"], logging.INFO)
+                if self._logger.isEnabledFor(log_level):
+                    self._logger.log(log_level, "[AUDIT:%s] %s", event["event_type"], line.decode())
 
-    def log_api_request(
-        self,
+    @staticmethod
+    def _api_request_fields(
         *,
         method: str,
         path: str,
@@ -104,21 +167,61 @@ class AuditLogger:
         user_id: str = "",
         error: Optional[str] = None,
     ) -> dict[str, Any]:
-        return self.log_event(
-            "api_request",
-            details={
+        return {
+            "details": {
                 "method": method,
                 "path": path,
                 "status_code": status_code,
                 "duration_ms": round(duration_ms, 2),
                 "error": error,
             },
-            tenant_id=tenant_id,
-            user_id=user_id,
-            severity="error" if error else "info",
-            source="api",
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "severity": "error" if error else "info",
+            "source": "api",
+        }
+
+    def log_api_request(
+        self,
+        *,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_ms: float,
+        tenant_id: str = "",
+        user_id: str = "",
+        error: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return self.log_event(
+            "api_request",
+            **self._api_request_fields(
+                method=method,
+                path=path,
+                status_code=status_code,
+                duration_ms=duration_ms,
+                tenant_id=tenant_id,
+                user_id=user_id,
+                error=error,
+            ),
         )
 
+    def log_api_request_batch(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Write many API request events with a single file append.
+
+        Each record takes the same keyword arguments as ``log_api_request``.
+        """
+        if not self._enabled:
+            return []
+
+        events = [
+            self._build_event("api_request", **self._api_request_fields(**record))
+            for record in records
+        ]
+        if events:
+            self._write_events(events)
+        return events
+
     def log_agent_execution(
         self,
         *,
@@ -178,9 +281,16 @@ class AuditLogger:
         user_id: str = "",
         details: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
+        if not self._enabled:
+            return {}
+
+        # Caller-supplied details still take precedence over action/outcome
+        security_details = {"action": action, "outcome": outcome}
+        if details:
+            security_details.update(details)
         return self.log_event(
             "security",
-            details={"action": action, "outcome": outcome, **(details or {})},
+            details=security_details,
             tenant_id=tenant_id,
             user_id=user_id,
             severity="warning" if outcome != "success" else "info",
@@ -188,11 +298,26 @@ class AuditLogger:
         )
 
 
-@lru_cache(maxsize=1)
+# Module-level singleton rather than lru_cache: the fast path is a single
+# global read, and the lock guarantees only one writer thread per log file
+# even when the first calls race.
+_audit_logger: Optional[AuditLogger] = None
+_audit_logger_lock = threading.Lock()
+
+
 def get_audit_logger() -> AuditLogger:
-    from config.settings import get_settings
-    settings = get_settings()
-    return AuditLogger(
-        log_file=settings.audit_log_file,
-        enabled=settings.audit_log_enabled,
-    )
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_logger_lock:
+            if _audit_logger is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                _audit_logger = AuditLogger(
+                    log_file=settings.audit_log_file,
+                    enabled=settings.audit_log_enabled,
+                    fsync_interval=settings.audit_fsync_interval,
+                    fsync_policy=settings.audit_fsync_policy,
+                    segment_bytes=settings.audit_segment_bytes,
+                    checksums=settings.audit_checksums,
+                )
+    return _audit_logger
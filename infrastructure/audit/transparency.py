@@ -7,13 +7,15 @@ made by agents so that humans can audit and understand agent behavior.
 
 from __future__ import annotations
 
-import json
 import threading
 import uuid
-from datetime import datetime, timezone
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+import orjson
+
+from infrastructure.audit.writer import BackgroundJsonlWriter, scan_jsonl
+from utils.clock import utc_now_iso
 
 
 class DecisionLogger:
@@ -28,15 +30,42 @@ class DecisionLogger:
       - Input context that led to the decision
     """
 
-    def __init__(self, log_file: str = "logs/decisions.jsonl", enabled: bool = True):
+    def __init__(
+        self,
+        log_file: str = "logs/decisions.jsonl",
+        enabled: bool = True,
+        fsync_interval: float = 1.0,
+        fsync_policy: str = "periodic",
+        segment_bytes: int = 0,
+        checksums: bool = False,
+    ):
         self._enabled = enabled
-        self._lock = threading.Lock()
+        self._writer: Optional[BackgroundJsonlWriter] = None
         if enabled:
-            path = Path(log_file)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            self._file_path = path
-        else:
-            self._file_path = None
+            self._writer = BackgroundJsonlWriter(
+                Path(log_file),
+                fsync_interval=fsync_interval,
+                fsync_policy=fsync_policy,
+                segment_bytes=segment_bytes,
+                checksums=checksums,
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued decisions are written and fsynced."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Drain pending records and release the log file handle."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def scan(self, from_segment: Optional[str] = None) -> Iterator[dict[str, Any]]:
+        """Iterate written decisions across rotated segments, oldest first."""
+        if self._writer is None:
+            return iter(())
+        return scan_jsonl(self._writer.path, from_segment=from_segment)
 
     def log_routing_decision(
         self,
@@ -129,9 +158,12 @@ class DecisionLogger:
         session_id: str = "",
         metadata: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
+        if self._writer is None:
+            return {}
+
         record = {
-            "decision_id": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "decision_id": uuid.uuid4().hex,
+            "timestamp": utc_now_iso(),
             "decision_type": decision_type,
             "agent_name": agent_name,
             "tenant_id": tenant_id,
@@ -140,23 +172,32 @@ class DecisionLogger:
             "details": details,
             "metadata": metadata or {},
         }
+        line = orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        self._writer.write(line)
 
-        if not self._enabled or not self._file_path:
-            return record
+        return record
 
-        line = json.dumps(record, default=str, separators=(",", ":"))
-        with self._lock:
-            with open(self._file_path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
 
-        return record
+# Module-level singleton rather than lru_cache: the fast path is a single
+# global read, and the lock guarantees only one writer thread per log file
+# even when the first calls race.
+_decision_logger: Optional[DecisionLogger] = None
+_decision_logger_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_decision_logger() -> DecisionLogger:
-    from config.settings import get_settings
-    settings = get_settings()
-    return DecisionLogger(
-        log_file=settings.decision_log_file,
-        enabled=settings.audit_log_enabled,
-    )
+    global _decision_logger
+    if _decision_logger is None:
+        with _decision_logger_lock:
+            if _decision_logger is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                _decision_logger = DecisionLogger(
+                    log_file=settings.decision_log_file,
+                    enabled=settings.audit_log_enabled,
+                    fsync_interval=settings.audit_fsync_interval,
+                    fsync_policy=settings.audit_fsync_policy,
+                    segment_bytes=settings.audit_segment_bytes,
+                    checksums=settings.audit_checksums,
+                )
+    return _decision_logger
@@ -0,0 +1,278 @@
+"""
+Background JSONL appender with group commit.
+
+Callers hand over complete, newline-terminated lines and return
+immediately; a single daemon thread owns the file and writes whatever
+has accumulated as one batch. This keeps file I/O off the request path
+and amortizes write/sync cost across bursts of events.
+
+Durability follows ``fsync_policy``:
+  each     → file opened with O_DSYNC, every batch is durable once written
+  batch    → one fdatasync per written batch (group commit)
+  periodic → fdatasync at most once per ``fsync_interval``
+  none     → left to the OS page cache
+``flush()`` and ``close()`` always sync, whatever the policy.
+
+The file is opened with O_APPEND and each batch goes out in a single
+os.write(), so appends from several worker processes sharing the same
+log never interleave mid-line and no userspace lock is needed.
+
+Optionally the live file is rotated into fixed-size segments
+(``audit.jsonl`` → ``audit.<stamp>.jsonl``) and each line is prefixed
+with its CRC32 (``"1a2b3c4d {...}"``) so readers can detect torn or
+corrupted records. ``scan_jsonl`` reads segments back in order.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+import orjson
+
+from utils.clock import utc_file_stamp
+from utils.fs import ensure_dir
+
+_logger = logging.getLogger(__name__)
+
+_Item = Union[bytes, threading.Event, None]
+
+FSYNC_POLICIES = ("each", "batch", "periodic", "none")
+
+# fdatasync skips the metadata flush fsync does; not available on macOS
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+class BackgroundJsonlWriter:
+    """
+    Single-writer append-only file sink.
+
+    Usage:
+        writer = BackgroundJsonlWriter("logs/audit.jsonl")
+        writer.write(b'{"event": "x"}\\n')
+        writer.flush()   # block until everything queued so far is durable
+        writer.close()   # drain, fsync and stop (also registered atexit)
+
+    segment_bytes > 0 rotates the live file once it reaches that size;
+    checksums=True prefixes every line with its CRC32 in hex.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        max_batch: int = 512,
+        fsync_interval: float = 1.0,
+        fsync_policy: str = "periodic",
+        segment_bytes: int = 0,
+        checksums: bool = False,
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync_policy!r}; expected one of {FSYNC_POLICIES}")
+        self._path = Path(path)
+        ensure_dir(self._path.parent)
+        self._max_batch = max_batch
+        self._fsync_interval = fsync_interval
+        self._fsync_policy = fsync_policy
+        self._open_flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        if fsync_policy == "each":
+            self._open_flags |= getattr(os, "O_DSYNC", 0)
+        self._segment_bytes = segment_bytes
+        self._checksums = checksums
+
+        self._fd = self._open()
+        self._queue: "queue.SimpleQueue[_Item]" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"jsonl-writer:{self._path.name}", daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self, payload: bytes) -> None:
+        """Queue one or more complete lines for appending."""
+        if self._closed:
+            # Late events after shutdown still land on disk
+            fd = self._open()
+            try:
+                self._write_all(fd, self._frame(payload))
+            finally:
+                os.close(fd)
+            return
+        self._queue.put(payload)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is written and fsynced."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ── Writer thread ────────────────────────────────────────────
+
+    def _run(self) -> None:
+        policy = self._fsync_policy
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                # Periodic policy: wake up to sync even if no new events arrive
+                timeout = self._fsync_interval if dirty and policy == "periodic" else None
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                last_sync = time.monotonic()
+                dirty = False
+                continue
+
+            batch: list[bytes] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_all(self._fd, self._frame(b"".join(batch)))
+                    # O_DSYNC writes are already durable
+                    dirty = policy != "each"
+                    if self._segment_bytes > 0:
+                        dirty = self._maybe_rotate(dirty)
+                except OSError as exc:
+                    _logger.error("Audit log write failed (%s): %s", self._path, exc)
+
+            now = time.monotonic()
+            if dirty and (
+                waiters
+                or stop
+                or policy == "batch"
+                or (policy == "periodic" and now - last_sync >= self._fsync_interval)
+            ):
+                self._sync()
+                last_sync = now
+                dirty = False
+
+            for waiter in waiters:
+                waiter.set()
+
+            if stop:
+                os.close(self._fd)
+                return
+
+    def _open(self) -> int:
+        return os.open(self._path, self._open_flags, 0o644)
+
+    def _frame(self, payload: bytes) -> bytes:
+        if not self._checksums:
+            return payload
+        return b"".join(
+            b"%08x %s" % (zlib.crc32(line.rstrip(b"\n")), line)
+            for line in payload.splitlines(keepends=True)
+        )
+
+    def _maybe_rotate(self, dirty: bool) -> bool:
+        """Seal the live file as a segment once it is full; returns the new dirty flag."""
+        if os.fstat(self._fd).st_size < self._segment_bytes:
+            return dirty
+        if dirty:
+            self._sync()
+        try:
+            # Another process sharing the file may already have rotated it
+            if os.stat(self._path).st_ino == os.fstat(self._fd).st_ino:
+                sealed = self._path.with_name(f"{self._path.stem}.{utc_file_stamp()}{self._path.suffix}")
+                os.rename(self._path, sealed)
+        except FileNotFoundError:
+            pass
+        os.close(self._fd)
+        self._fd = self._open()
+        return False
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    def _sync(self) -> None:
+        try:
+            _datasync(self._fd)
+        except OSError as exc:
+            _logger.error("Audit log fsync failed (%s): %s", self._path, exc)
+
+
+# ── Reading ──────────────────────────────────────────────────────
+
+
+def list_segments(path: Union[str, Path]) -> list[Path]:
+    """Sealed segments for a log path, oldest first (the live file excluded)."""
+    path = Path(path)
+    return sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
+
+
+def scan_jsonl(
+    path: Union[str, Path],
+    *,
+    from_segment: Optional[str] = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield records from sealed segments and then the live file, in order.
+
+    from_segment skips segments whose file name sorts before it, so a
+    consumer can resume from the last segment it finished. Lines carrying
+    a CRC32 prefix are verified; corrupted lines are logged and skipped.
+    """
+    path = Path(path)
+    files = [p for p in list_segments(path) if from_segment is None or p.name >= from_segment]
+    if path.exists():
+        files.append(path)
+
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.rstrip(b"\n")
+                if not line:
+                    continue
+                if not line.startswith(b"{"):
+                    checksum, _, line = line.partition(b" ")
+                    try:
+                        valid = int(checksum, 16) == zlib.crc32(line)
+                    except ValueError:
+                        valid = False
+                    if not valid:
+                        _logger.error("Checksum mismatch in %s line %d", file_path, line_no)
+                        continue
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    _logger.error("Unparseable record in %s line %d", file_path, line_no)
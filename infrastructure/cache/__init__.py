@@ -0,0 +1,16 @@
+"""
+Response caching infrastructure.
+
+Semantic caches that let agents skip LLM calls for queries that are
+paraphrases of ones already answered.
+"""
+
+from .route_cache import SupervisorRouteCache, RouteCacheLookup, get_route_cache
+from .ttl import TTLCache
+
+__all__ = [
+    "SupervisorRouteCache",
+    "RouteCacheLookup",
+    "get_route_cache",
+    "TTLCache",
+]
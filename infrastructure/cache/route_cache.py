@@ -0,0 +1,369 @@
+"""
+Semantic cache for supervisor routing decisions.
+
+Most first-turn patient queries collapse into a handful of intents
+("is Dr. X free tomorrow", "cancel my appointment", ...), yet every one
+pays for a structured-output LLM call just to pick a route. This cache
+embeds the query, does a cosine kNN lookup against previously routed
+queries for the same tenant, and returns the stored Router decision
+when the top-1 similarity clears ``hit_threshold``.
+
+Two-stage thresholds:
+  - similarity >= hit_threshold                 → hit, LLM skipped
+  - near_threshold <= similarity < hit_threshold → near miss, LLM decides
+  - below near_threshold                        → miss
+
+Entries are persisted to SQLite keyed by tenant so tenants never share
+routes, and reloaded lazily per tenant on first lookup. Only the chosen
+route is kept: the LLM's reasoning describes the original patient's
+query, so hits carry a fixed ``ROUTE_CACHE_HIT_REASONING`` instead.
+
+Patient text is never written to disk: rows are keyed by a SHA-256 of
+the normalised query, expire after ``ttl_seconds``, and are scoped to a
+``prompt_version`` (a digest of the supervisor prompt) so editing the
+prompt retires every cached route. Rows remember the patient that seeded
+them so a right-to-erasure request can purge them (``purge_user``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from config.settings import get_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Reasoning reported for cached routes; the original text is never reused
+ROUTE_CACHE_HIT_REASONING = "route cache hit"
+
+
+@dataclass
+class RouteCacheLookup:
+    route: Optional[dict[str, str]] = None
+    similarity: float = 0.0
+    embedding: Optional[np.ndarray] = None
+
+    @property
+    def hit(self) -> bool:
+        return self.route is not None
+
+
+def _cached_route(nxt: str) -> dict[str, str]:
+    return {"next": nxt, "reasoning": ROUTE_CACHE_HIT_REASONING}
+
+
+class _TenantIndex:
+    """Normalised embedding matrix plus the routes aligned with its rows."""
+
+    def __init__(self) -> None:
+        self.vectors: list[np.ndarray] = []
+        self.routes: list[str] = []
+        self.created: list[float] = []
+        self.exact: dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._created: Optional[np.ndarray] = None
+
+    def add(self, query_hash: str, vector: np.ndarray, route: str, created_at: float) -> None:
+        self.exact[query_hash] = len(self.routes)
+        self.vectors.append(vector)
+        self.routes.append(route)
+        self.created.append(created_at)
+        self._matrix = None
+        self._created = None
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        return self._matrix
+
+    def created_at(self) -> np.ndarray:
+        if self._created is None:
+            self._created = np.asarray(self.created, dtype=np.float64)
+        return self._created
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+
+class SupervisorRouteCache:
+    """
+    Tenant-scoped semantic cache of supervisor Router outputs.
+
+    Usage:
+        cache = get_route_cache()
+        lookup = cache.lookup(tenant_id, query)
+        if lookup.hit:
+            response = lookup.route
+        else:
+            response = llm.with_structured_output(Router).invoke(messages)
+            cache.store(tenant_id, query, response, lookup.embedding, user_id=user_id)
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], list[float]],
+        db_path: str = "data/route_cache.db",
+        hit_threshold: float = 0.95,
+        near_threshold: float = 0.85,
+        max_entries_per_tenant: int = 5000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        prompt_version: str = "",
+    ):
+        self._embed_fn = embed_fn
+        self._db_path = db_path
+        self._hit_threshold = hit_threshold
+        self._near_threshold = near_threshold
+        self._max_entries = max_entries_per_tenant
+        self._ttl = ttl_seconds
+        self._prompt_version = prompt_version
+        self._lock = threading.Lock()
+        self._tenants: dict[str, _TenantIndex] = {}
+        self._stats = {"hits": 0, "exact_hits": 0, "near_misses": 0, "misses": 0, "errors": 0}
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_sqlite()
+
+    # ── SQLite setup ─────────────────────────────────────────────
+
+    def _init_sqlite(self) -> None:
+        with sqlite3.connect(self._db_path) as conn:
+            # Older builds kept raw query text and reasoning with no expiry
+            conn.execute("DROP TABLE IF EXISTS route_cache")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS route_entries (
+                    tenant_id TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    query_hash TEXT NOT NULL,
+                    user_id TEXT NOT NULL DEFAULT '',
+                    embedding BLOB NOT NULL,
+                    next TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (tenant_id, prompt_version, query_hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_route_entries_user ON route_entries(tenant_id, user_id)")
+            # Expired rows and routes chosen under another supervisor prompt are dead weight
+            conn.execute(
+                "DELETE FROM route_entries WHERE created_at < ? OR prompt_version != ?",
+                (self._cutoff(), self._prompt_version),
+            )
+            conn.commit()
+
+    def _cutoff(self) -> float:
+        return time.time() - self._ttl
+
+    def _load_tenant(self, tenant_id: str) -> _TenantIndex:
+        index = _TenantIndex()
+        with sqlite3.connect(self._db_path) as conn:
+            rows = conn.execute(
+                "SELECT query_hash, embedding, next, created_at FROM route_entries "
+                "WHERE tenant_id = ? AND prompt_version = ? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (tenant_id, self._prompt_version, self._cutoff(), self._max_entries),
+            ).fetchall()
+        for query_hash, blob, nxt, created_at in reversed(rows):
+            index.add(query_hash, np.frombuffer(blob, dtype=np.float32), nxt, created_at)
+        return index
+
+    def _tenant(self, tenant_id: str) -> _TenantIndex:
+        with self._lock:
+            index = self._tenants.get(tenant_id)
+        if index is None:
+            loaded = self._load_tenant(tenant_id)
+            with self._lock:
+                index = self._tenants.setdefault(tenant_id, loaded)
+        return index
+
+    # ── Lookup / store ───────────────────────────────────────────
+
+    @staticmethod
+    def _key(query: str) -> str:
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self._embed_fn(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, tenant_id: str, query: str) -> RouteCacheLookup:
+        """
+        Return the cached route for ``query`` if a close enough paraphrase
+        was routed before. On a miss the query embedding is returned so
+        ``store`` does not need to embed it again.
+        """
+        index = self._tenant(tenant_id)
+        key = self._key(query)
+        cutoff = self._cutoff()
+
+        with self._lock:
+            row = index.exact.get(key)
+            if row is not None and index.created[row] >= cutoff:
+                self._stats["hits"] += 1
+                self._stats["exact_hits"] += 1
+                return RouteCacheLookup(route=_cached_route(index.routes[row]), similarity=1.0)
+
+        try:
+            vector = self._embed(query)
+        except Exception as exc:
+            logger.warning("Route cache embedding failed: %s", exc)
+            with self._lock:
+                self._stats["errors"] += 1
+            return RouteCacheLookup()
+
+        with self._lock:
+            if not len(index):
+                self._stats["misses"] += 1
+                return RouteCacheLookup(embedding=vector)
+            scores = index.matrix() @ vector
+            # Expired rows stay in the loaded index until reload; never match them
+            scores = np.where(index.created_at() >= cutoff, scores, -np.inf)
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity >= self._hit_threshold:
+                self._stats["hits"] += 1
+                return RouteCacheLookup(route=_cached_route(index.routes[best]), similarity=similarity, embedding=vector)
+            if similarity >= self._near_threshold:
+                self._stats["near_misses"] += 1
+            else:
+                self._stats["misses"] += 1
+        return RouteCacheLookup(similarity=max(similarity, 0.0), embedding=vector)
+
+    def store(
+        self,
+        tenant_id: str,
+        query: str,
+        route: dict[str, Any],
+        embedding: Optional[np.ndarray] = None,
+        user_id: str = "",
+    ) -> None:
+        """Add a freshly routed query to the tenant's index and persist it."""
+        if embedding is None:
+            try:
+                embedding = self._embed(query)
+            except Exception as exc:
+                logger.warning("Route cache embedding failed: %s", exc)
+                return
+
+        key = self._key(query)
+        nxt = str(route["next"])
+        now = time.time()
+        index = self._tenant(tenant_id)
+        with self._lock:
+            row = index.exact.get(key)
+            if (row is not None and index.created[row] >= now - self._ttl) or len(index) >= self._max_entries:
+                return
+            index.add(key, embedding, nxt, now)
+
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO route_entries "
+                    "(tenant_id, prompt_version, query_hash, user_id, embedding, next, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        tenant_id, self._prompt_version, key, str(user_id),
+                        embedding.astype(np.float32).tobytes(), nxt, now,
+                    ),
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Route cache persist failed: %s", exc)
+
+    def purge_user(self, tenant_id: str, user_id: str) -> int:
+        """Delete routes seeded by one patient's queries; returns rows removed."""
+        with sqlite3.connect(self._db_path) as conn:
+            removed = conn.execute(
+                "DELETE FROM route_entries WHERE tenant_id = ? AND user_id = ?",
+                (tenant_id, str(user_id)),
+            ).rowcount
+            conn.commit()
+        # Reloaded from SQLite on the next lookup, without the purged rows
+        with self._lock:
+            self._tenants.pop(tenant_id, None)
+        return removed
+
+    def clear(self, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant_id is None:
+                self._tenants.clear()
+            else:
+                self._tenants.pop(tenant_id, None)
+        with sqlite3.connect(self._db_path) as conn:
+            if tenant_id is None:
+                conn.execute("DELETE FROM route_entries")
+            else:
+                conn.execute("DELETE FROM route_entries WHERE tenant_id = ?", (tenant_id,))
+            conn.commit()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tenants_loaded"] = len(self._tenants)
+            stats["entries"] = sum(len(i) for i in self._tenants.values())
+        lookups = stats["hits"] + stats["near_misses"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["hit_threshold"] = self._hit_threshold
+        stats["near_threshold"] = self._near_threshold
+        stats["ttl_seconds"] = self._ttl
+        stats["prompt_version"] = self._prompt_version
+        return stats
+
+
+def supervisor_prompt_version() -> str:
+    """Digest of the supervisor system prompt; changes whenever the prompt is edited."""
+    from prompts.supervisor_prompt import system_prompt
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+_route_cache: Optional[SupervisorRouteCache] = None
+# Tracked separately: None is also the answer when the cache is disabled
+_route_cache_resolved = False
+_route_cache_lock = threading.Lock()
+
+
+def get_route_cache() -> Optional[SupervisorRouteCache]:
+    """Returns None when the route cache is disabled in settings."""
+    global _route_cache, _route_cache_resolved
+    if not _route_cache_resolved:
+        with _route_cache_lock:
+            if not _route_cache_resolved:
+                _route_cache = _build_route_cache()
+                _route_cache_resolved = True
+    return _route_cache
+
+
+def _build_route_cache() -> Optional[SupervisorRouteCache]:
+    settings = get_settings()
+    if not settings.route_cache_enabled:
+        return None
+
+    try:
+        from langchain_openai import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings(
+            model=settings.memory_embedding_model,
+            max_retries=0,
+            request_timeout=settings.openai_request_timeout,
+        )
+    except Exception as exc:
+        logger.warning("Route cache disabled — embeddings unavailable: %s", exc)
+        return None
+    return SupervisorRouteCache(
+        embed_fn=embeddings.embed_query,
+        db_path=settings.route_cache_db_path,
+        hit_threshold=settings.route_cache_hit_threshold,
+        near_threshold=settings.route_cache_near_threshold,
+        max_entries_per_tenant=settings.route_cache_max_entries,
+        ttl_seconds=settings.route_cache_ttl_seconds,
+        prompt_version=supervisor_prompt_version(),
+    )
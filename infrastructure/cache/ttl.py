@@ -0,0 +1,64 @@
+"""
+Small thread-safe LRU cache with per-entry expiry.
+
+For short-lived, in-process reuse of values that are expensive to fetch
+but tolerate brief staleness (e.g. a patient's memory context across
+back-to-back requests).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU mapping whose entries expire ``ttl_seconds`` after insert.
+
+    Usage:
+        cache = TTLCache(maxsize=1024, ttl_seconds=60)
+        value = cache.get(key)
+        if value is None:
+            value = fetch()
+            cache.set(key, value)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 60.0):
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self._ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,3 +1,4 @@
+from infrastructure.evaluation.batch import run_routing_batch
 from infrastructure.evaluation.harness import EvaluationHarness, get_evaluation_harness
 from infrastructure.evaluation.regression import RegressionChecker, get_regression_checker
 
@@ -6,4 +7,5 @@ __all__ = [
     "get_evaluation_harness",
     "RegressionChecker",
     "get_regression_checker",
+    "run_routing_batch",
 ]
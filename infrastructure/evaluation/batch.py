@@ -0,0 +1,154 @@
+"""
+Offline routing evaluation through the OpenAI Batch API.
+
+Batch jobs are billed at half the synchronous token price and are not
+subject to the per-key request rate limits, which suits benchmark runs
+whose results are only compared later.
+
+A batch request is a single chat completion, so only the supervisor's
+first-turn routing decision can be evaluated this way: each case becomes
+one request with the live supervisor prompt and Router schema, and the
+returned route is scored against ``expected_route``. Keyword and tool
+expectations need the full graph and are left out. Results are saved as
+``<benchmark>.routing-batch`` so they never mix with live-run history in
+regression checks.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from typing import Any, get_args, get_type_hints
+
+import orjson
+
+from config.settings import get_settings
+from infrastructure.evaluation.harness import BenchmarkCase, EvalSuiteResult, EvaluationHarness
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def _router_response_format() -> dict[str, Any]:
+    """JSON schema equivalent of the supervisor's structured Router output."""
+    from appointment_agent import Router
+
+    routes = list(get_args(get_type_hints(Router)["next"]))
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "Router",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "next": {"type": "string", "enum": routes},
+                    "reasoning": {"type": "string"},
+                },
+                "required": ["next", "reasoning"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def build_batch_requests(cases: list[BenchmarkCase]) -> bytes:
+    """One /v1/chat/completions request per case, as Batch API JSONL."""
+    from appointment_agent import _SUPERVISOR_SYSTEM_MESSAGE, _id_message
+
+    settings = get_settings()
+    response_format = _router_response_format()
+    lines = [
+        orjson.dumps({
+            "custom_id": case.case_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": settings.openai_model,
+                "temperature": settings.openai_temperature,
+                "response_format": response_format,
+                # Same message order as the live supervisor's first turn
+                "messages": [
+                    _SUPERVISOR_SYSTEM_MESSAGE,
+                    {"role": "user", "content": _id_message(case.patient_id)},
+                    {"role": "user", "content": case.input_query},
+                ],
+            },
+        })
+        for case in cases
+    ]
+    return b"\n".join(lines) + b"\n"
+
+
+def parse_batch_output(content: bytes) -> dict[str, dict[str, Any]]:
+    """Map case_id → {"response", "route"} from a Batch API output file."""
+    outputs: dict[str, dict[str, Any]] = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            logger.warning("Batch request %s failed: %s", item.get("custom_id"), item.get("error"))
+            continue
+        try:
+            message = response["body"]["choices"][0]["message"]["content"]
+            routed = orjson.loads(message)
+        except (KeyError, IndexError, TypeError, orjson.JSONDecodeError) as exc:
+            logger.warning("Unparseable batch output for %s: %s", item.get("custom_id"), exc)
+            continue
+        outputs[item["custom_id"]] = {
+            "response": routed.get("reasoning", ""),
+            "route": routed.get("next", ""),
+        }
+    return outputs
+
+
+def run_routing_batch(
+    harness: EvaluationHarness,
+    benchmark_name: str = "default",
+) -> EvalSuiteResult:
+    """Submit a benchmark's routing cases as one batch job, wait, and score them."""
+    settings = get_settings()
+    if not settings.eval_batch_enabled:
+        raise RuntimeError("Batch evaluation is disabled (set EVAL_BATCH_ENABLED=true)")
+
+    cases = [
+        replace(case, expected_tool="", expected_keywords=[])
+        for case in harness.load_benchmark(benchmark_name)
+        if case.expected_route
+    ]
+    if not cases:
+        return EvalSuiteResult(total_cases=0)
+
+    from openai import OpenAI
+
+    client = OpenAI(
+        api_key=settings.openai_api_key or None,
+        max_retries=settings.openai_max_retries,
+    )
+    input_file = client.files.create(
+        file=(f"{benchmark_name}-routing.jsonl", build_batch_requests(cases)),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"benchmark": benchmark_name},
+    )
+    logger.info("Submitted routing batch %s (%d cases)", batch.id, len(cases))
+
+    while batch.status not in _TERMINAL_STATUSES:
+        time.sleep(settings.eval_batch_poll_seconds)
+        batch = client.batches.retrieve(batch.id)
+        logger.debug("Batch %s status: %s", batch.id, batch.status)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    outputs = parse_batch_output(client.files.content(batch.output_file_id).content)
+    logger.info("Batch %s returned %d/%d routing decisions", batch.id, len(outputs), len(cases))
+    return harness.score_outputs(cases, outputs, f"{benchmark_name}.routing-batch")
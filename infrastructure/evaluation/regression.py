@@ -12,14 +12,31 @@ Raises alerts when regressions exceed configurable thresholds.
 
 from __future__ import annotations
 
-import json
+import threading
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from functools import lru_cache
-from pathlib import Path
-from typing import Any, Optional
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+import orjson
 
 from infrastructure.evaluation.harness import EvalSuiteResult
+from utils.clock import utc_file_stamp, utc_now_iso
+from utils.fs import ensure_dir
+
+
+def _pass_rate(suite: EvalSuiteResult) -> Optional[float]:
+    return suite.passed / suite.total_cases if suite.total_cases > 0 else None
+
+
+# (metric, higher_is_better, reader) — evaluated in order by RegressionChecker.check
+_METRICS: tuple[tuple[str, bool, Callable[[EvalSuiteResult], Optional[float]]], ...] = (
+    ("pass_rate", True, _pass_rate),
+    ("route_accuracy", True, attrgetter("route_accuracy")),
+    ("tool_accuracy", True, attrgetter("tool_accuracy")),
+    ("avg_latency_ms", False, attrgetter("avg_latency_ms")),
+    ("p95_latency_ms", False, attrgetter("p95_latency_ms")),
+    ("keyword_match_avg", True, attrgetter("keyword_match_avg")),
+)
 
 
 @dataclass
@@ -38,7 +55,7 @@ class RegressionAlert:
 class RegressionReport:
     """Full regression analysis report."""
     report_id: str = ""
-    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = field(default_factory=utc_now_iso)
     has_regressions: bool = False
     alerts: list[RegressionAlert] = field(default_factory=list)
     summary: dict[str, Any] = field(default_factory=dict)
@@ -71,8 +88,7 @@ class RegressionChecker:
 
     def __init__(self, threshold_pct: float = 5.0, results_dir: str = "evaluation/results"):
         self._threshold_pct = threshold_pct
-        self._results_dir = Path(results_dir)
-        self._results_dir.mkdir(parents=True, exist_ok=True)
+        self._results_dir = ensure_dir(results_dir)
 
     def check(
         self,
@@ -90,36 +106,20 @@ class RegressionChecker:
             return report
 
         alerts: list[RegressionAlert] = []
-
-        # Pass rate regression (higher is better → check for decrease)
-        if previous.total_cases > 0 and current.total_cases > 0:
-            prev_pass_rate = previous.passed / previous.total_cases
-            curr_pass_rate = current.passed / current.total_cases
-            self._check_decrease("pass_rate", prev_pass_rate, curr_pass_rate, alerts)
-
-        # Route accuracy regression (higher is better)
-        if previous.route_accuracy > 0:
-            self._check_decrease("route_accuracy", previous.route_accuracy, current.route_accuracy, alerts)
-
-        # Tool accuracy regression (higher is better)
-        if previous.tool_accuracy > 0:
-            self._check_decrease("tool_accuracy", previous.tool_accuracy, current.tool_accuracy, alerts)
-
-        # Latency regression (lower is better → check for increase)
-        if previous.avg_latency_ms > 0:
-            self._check_increase("avg_latency_ms", previous.avg_latency_ms, current.avg_latency_ms, alerts)
-
-        if previous.p95_latency_ms > 0:
-            self._check_increase("p95_latency_ms", previous.p95_latency_ms, current.p95_latency_ms, alerts)
-
-        # Keyword match regression (higher is better)
-        if previous.keyword_match_avg > 0:
-            self._check_decrease("keyword_match_avg", previous.keyword_match_avg, current.keyword_match_avg, alerts)
+        for metric, higher_is_better, read in _METRICS:
+            prev = read(previous)
+            curr = read(current)
+            # No baseline (or no cases on either side) means nothing to compare
+            if prev is None or curr is None or prev <= 0:
+                continue
+            alert = self._compare(metric, higher_is_better, prev, curr)
+            if alert is not None:
+                alerts.append(alert)
 
         report.alerts = alerts
         report.has_regressions = len(alerts) > 0
         report.summary = {
-            "total_checks": 6,
+            "total_checks": len(_METRICS),
             "regressions_found": len(alerts),
             "critical_count": sum(1 for a in alerts if a.severity == "critical"),
             "warning_count": sum(1 for a in alerts if a.severity == "warning"),
@@ -130,64 +130,47 @@ class RegressionChecker:
 
         return report
 
-    def _check_decrease(
+    def _compare(
         self,
         metric: str,
+        higher_is_better: bool,
         prev: float,
         curr: float,
-        alerts: list[RegressionAlert],
-    ) -> None:
-        """Flag if current value decreased beyond threshold."""
-        if prev <= 0:
-            return
+    ) -> Optional[RegressionAlert]:
+        """Return an alert if curr moved in the bad direction beyond threshold."""
         change_pct = ((curr - prev) / prev) * 100
-        if change_pct < -self._threshold_pct:
-            severity = "critical" if change_pct < -(self._threshold_pct * 2) else "warning"
-            alerts.append(RegressionAlert(
-                metric=metric,
-                previous_value=prev,
-                current_value=curr,
-                change_pct=change_pct,
-                threshold_pct=self._threshold_pct,
-                severity=severity,
-                message=f"{metric} decreased by {abs(change_pct):.1f}% (threshold: {self._threshold_pct}%)",
-            ))
-
-    def _check_increase(
-        self,
-        metric: str,
-        prev: float,
-        curr: float,
-        alerts: list[RegressionAlert],
-    ) -> None:
-        """Flag if current value increased beyond threshold (for latency-type metrics)."""
-        if prev <= 0:
-            return
-        change_pct = ((curr - prev) / prev) * 100
-        if change_pct > self._threshold_pct:
-            severity = "critical" if change_pct > (self._threshold_pct * 2) else "warning"
-            alerts.append(RegressionAlert(
-                metric=metric,
-                previous_value=prev,
-                current_value=curr,
-                change_pct=change_pct,
-                threshold_pct=self._threshold_pct,
-                severity=severity,
-                message=f"{metric} increased by {change_pct:.1f}% (threshold: {self._threshold_pct}%)",
-            ))
+        regression_pct = -change_pct if higher_is_better else change_pct
+        if regression_pct <= self._threshold_pct:
+            return None
+        direction = "decreased" if higher_is_better else "increased"
+        return RegressionAlert(
+            metric=metric,
+            previous_value=prev,
+            current_value=curr,
+            change_pct=change_pct,
+            threshold_pct=self._threshold_pct,
+            severity="critical" if regression_pct > self._threshold_pct * 2 else "warning",
+            message=f"{metric} {direction} by {abs(change_pct):.1f}% (threshold: {self._threshold_pct}%)",
+        )
 
     def _save_report(self, report: RegressionReport) -> None:
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        path = self._results_dir / f"regression_{ts}.json"
-        with open(path, "w") as f:
-            json.dump(report.to_dict(), f, indent=2)
+        path = self._results_dir / f"regression_{utc_file_stamp()}.json"
+        path.write_bytes(orjson.dumps(report.to_dict(), option=orjson.OPT_INDENT_2))
+
+
+_checker: Optional[RegressionChecker] = None
+_checker_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_regression_checker() -> RegressionChecker:
-    from config.settings import get_settings
-    settings = get_settings()
-    return RegressionChecker(
-        threshold_pct=settings.regression_threshold_pct,
-        results_dir=settings.eval_results_dir,
-    )
+    global _checker
+    if _checker is None:
+        with _checker_lock:
+            if _checker is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                _checker = RegressionChecker(
+                    threshold_pct=settings.regression_threshold_pct,
+                    results_dir=settings.eval_results_dir,
+                )
+    return _checker
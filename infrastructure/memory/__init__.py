@@ -6,11 +6,12 @@ with HIPAA-aware audit logging and multi-tenant isolation.
 """
 
 from .manager import get_memory_manager, MemoryManager
-from .context import MemoryContext, build_memory_context
+from .context import MemoryContext, abuild_memory_context, build_memory_context
 
 __all__ = [
     "get_memory_manager",
     "MemoryManager",
     "MemoryContext",
     "build_memory_context",
+    "abuild_memory_context",
 ]
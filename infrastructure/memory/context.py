@@ -14,8 +14,18 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-
-@dataclass
+# (field, section header) in prompt order
+_PROMPT_SECTIONS = (
+    ("preferences", "\n## Scheduling & Doctor Preferences"),
+    ("medical_context", "\n## Medical Context"),
+    ("appointment_history", "\n## Appointment History Notes"),
+    ("communication_notes", "\n## Communication Preferences"),
+    ("insurance_info", "\n## Insurance Information"),
+    ("general_notes", "\n## Other Notes"),
+)
+
+
+@dataclass(slots=True)
 class MemoryContext:
     """
     Structured representation of a user's memory context.
@@ -30,21 +40,19 @@ class MemoryContext:
     insurance_info: list[str] = field(default_factory=list)
     general_notes: list[str] = field(default_factory=list)
     raw_memories: list[dict[str, Any]] = field(default_factory=list)
+    # Set by build_memory_context once the buckets are filled; None means
+    # the context was assembled by hand and is counted on demand
+    _total: Optional[int] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def has_memories(self) -> bool:
         """Check if any memory categories have content."""
-        return bool(
-            self.preferences
-            or self.medical_context
-            or self.appointment_history
-            or self.communication_notes
-            or self.insurance_info
-            or self.general_notes
-        )
+        return self.total_memories > 0
 
     @property
     def total_memories(self) -> int:
+        if self._total is not None:
+            return self._total
         return (
             len(self.preferences)
             + len(self.medical_context)
@@ -64,53 +72,33 @@ class MemoryContext:
         if not self.has_memories:
             return ""
 
-        sections: list[str] = []
-        sections.append(f"=== PATIENT MEMORY CONTEXT (User: {self.user_id}) ===")
-        sections.append(
+        lines = [
+            f"=== PATIENT MEMORY CONTEXT (User: {self.user_id}) ===",
             "The following is known about this patient from previous interactions. "
-            "Use this context to provide personalized, continuity-aware care."
-        )
-
-        if self.preferences:
-            sections.append("\n## Scheduling & Doctor Preferences")
-            for mem in self.preferences:
-                sections.append(f"  - {mem}")
-
-        if self.medical_context:
-            sections.append("\n## Medical Context")
-            for mem in self.medical_context:
-                sections.append(f"  - {mem}")
-
-        if self.appointment_history:
-            sections.append("\n## Appointment History Notes")
-            for mem in self.appointment_history:
-                sections.append(f"  - {mem}")
-
-        if self.communication_notes:
-            sections.append("\n## Communication Preferences")
-            for mem in self.communication_notes:
-                sections.append(f"  - {mem}")
-
-        if self.insurance_info:
-            sections.append("\n## Insurance Information")
-            for mem in self.insurance_info:
-                sections.append(f"  - {mem}")
-
-        if self.general_notes:
-            sections.append("\n## Other Notes")
-            for mem in self.general_notes:
-                sections.append(f"  - {mem}")
-
-        sections.append("\n=== END PATIENT MEMORY CONTEXT ===")
-
-        return "\n".join(sections)
+            "Use this context to provide personalized, continuity-aware care.",
+        ]
+        # Collect into a real list: str.join sizes its output in one pass
+        # over a list, whereas a generator is copied into one first
+        for attr, title in _PROMPT_SECTIONS:
+            mems = getattr(self, attr)
+            if mems:
+                lines.append(title)
+                lines.extend(["  - " + mem for mem in mems])
+        lines.append("\n=== END PATIENT MEMORY CONTEXT ===")
+        return "\n".join(lines)
 
     def to_dict(self) -> dict[str, Any]:
-        """Serialize for API responses."""
+        """
+        Serialize for API responses.
+
+        Category lists are shared with this context, not copied; callers
+        must not mutate them.
+        """
+        total = self.total_memories
         return {
             "user_id": self.user_id,
-            "total_memories": self.total_memories,
-            "has_memories": self.has_memories,
+            "total_memories": total,
+            "has_memories": total > 0,
             "preferences": self.preferences,
             "medical_context": self.medical_context,
             "appointment_history": self.appointment_history,
@@ -136,7 +124,7 @@ def build_memory_context(
     Returns:
         MemoryContext with categorized memories ready for prompt injection.
     """
-    from infrastructure.memory.manager import get_memory_manager, MemoryCategory
+    from infrastructure.memory.manager import get_memory_manager
 
     ctx = MemoryContext(user_id=user_id)
     manager = get_memory_manager()
@@ -150,34 +138,83 @@ def build_memory_context(
             query=query,
             tenant_id=tenant_id,
         )
+        _fill_context(ctx, grouped)
+    except Exception as exc:
+        logger.error("Failed to build memory context for user=%s: %s", user_id, exc)
+
+    return ctx
 
-        # Map category groups to context fields
-        _category_map = {
-            MemoryCategory.PREFERENCE: "preferences",
-            MemoryCategory.MEDICAL_CONTEXT: "medical_context",
-            MemoryCategory.APPOINTMENT_HISTORY: "appointment_history",
-            MemoryCategory.COMMUNICATION: "communication_notes",
-            MemoryCategory.INSURANCE: "insurance_info",
-            MemoryCategory.GENERAL: "general_notes",
-        }
 
-        all_memories: list[dict[str, Any]] = []
-        for category, memories in grouped.items():
-            field_name = _category_map.get(category, "general_notes")
-            for mem in memories:
-                text = mem.get("memory", mem.get("text", ""))
-                if text:
-                    getattr(ctx, field_name).append(text)
-                    all_memories.append(mem)
+async def abuild_memory_context(
+    user_id: str,
+    query: str = "",
+    tenant_id: str = "default",
+) -> MemoryContext:
+    """
+    Async build_memory_context for use on the event loop.
 
-        ctx.raw_memories = all_memories
+    Recall-cache hits are served inline; only a real Mem0 search is
+    moved to a worker thread.
+    """
+    from infrastructure.memory.manager import get_memory_manager
 
-        logger.debug(
-            "Memory context built | user=%s total=%d",
-            user_id, ctx.total_memories,
-        )
+    ctx = MemoryContext(user_id=user_id)
+    manager = get_memory_manager()
 
+    if not manager.enabled:
+        return ctx
+
+    try:
+        grouped = await manager.arecall_patient_context(
+            user_id=user_id,
+            query=query,
+            tenant_id=tenant_id,
+        )
+        _fill_context(ctx, grouped)
     except Exception as exc:
         logger.error("Failed to build memory context for user=%s: %s", user_id, exc)
 
     return ctx
+
+
+def _fill_context(ctx: MemoryContext, grouped: dict[Any, list[dict[str, Any]]]) -> None:
+    """Distribute recalled memories into the context's category buckets."""
+    from infrastructure.memory.manager import MemoryCategory
+
+    # Map each category straight to its bucket list once per build
+    buckets = {
+        MemoryCategory.PREFERENCE: ctx.preferences,
+        MemoryCategory.MEDICAL_CONTEXT: ctx.medical_context,
+        MemoryCategory.APPOINTMENT_HISTORY: ctx.appointment_history,
+        MemoryCategory.COMMUNICATION: ctx.communication_notes,
+        MemoryCategory.INSURANCE: ctx.insurance_info,
+        MemoryCategory.GENERAL: ctx.general_notes,
+    }
+
+    # All records come from one store, so resolve the text key once
+    # from the first one; records missing it fall back individually
+    first = next((mems[0] for mems in grouped.values() if mems), None)
+    key, alt = ("memory", "text") if first is None or "memory" in first else ("text", "memory")
+
+    all_memories: list[dict[str, Any]] = []
+    for category, memories in grouped.items():
+        bucket = buckets.get(category, ctx.general_notes)
+        texts = [mem.get(key) or mem.get(alt) for mem in memories]
+        if all(texts):
+            # Common case: extend from sized lists, one resize per bucket
+            bucket.extend(texts)
+            all_memories.extend(memories)
+            continue
+        for text, mem in zip(texts, memories):
+            if text:
+                bucket.append(text)
+                all_memories.append(mem)
+
+    ctx.raw_memories = all_memories
+    # Every kept memory landed in exactly one bucket
+    ctx._total = len(all_memories)
+
+    logger.debug(
+        "Memory context built | user=%s total=%d",
+        ctx.user_id, ctx.total_memories,
+    )
@@ -11,11 +11,17 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
-from datetime import datetime, timezone
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from typing import Any, Optional
 
+from infrastructure.cache import TTLCache
+from infrastructure.resilience.circuit_breaker import CircuitBreakerOpenError, get_circuit_breaker
+from infrastructure.resilience.retry import retry_with_backoff
+from utils.clock import utc_now_iso
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,7 +29,7 @@ logger = get_logger(__name__)
 
 # ── Memory Categories for Healthcare Context ─────────────────────
 
-class MemoryCategory:
+class MemoryCategory(str, Enum):
     """Standard categories for healthcare memory classification."""
     PREFERENCE = "preference"              # Scheduling preferences, doctor preferences
     MEDICAL_CONTEXT = "medical_context"    # Conditions, allergies, ongoing treatments
@@ -32,6 +38,28 @@ class MemoryCategory:
     INSURANCE = "insurance"                # Insurance details, coverage info
     GENERAL = "general"                    # Catch-all for unclassified memories
 
+    def __str__(self) -> str:
+        # Log lines and Mem0 metadata carry the bare value, not "MemoryCategory.X"
+        return self.value
+
+    @classmethod
+    def from_value(
+        cls, value: Any, default: Optional["MemoryCategory"] = None,
+    ) -> "MemoryCategory":
+        """Resolve a stored or user-supplied value, falling back to default (GENERAL)."""
+        return _CATEGORY_BY_VALUE.get(value, default or cls.GENERAL)
+
+
+_CATEGORY_BY_VALUE: dict[str, MemoryCategory] = {c.value: c for c in MemoryCategory}
+
+# Transient vector-store failures worth one quick retry; anything else
+# (bad config, auth) fails straight through to the breaker
+_RETRYABLE_STORE_ERRORS = (TimeoutError, ConnectionError)
+
+# Vector stores whose search score is a similarity (higher = closer);
+# Chroma returns distances, so a minimum-score cut would invert there
+_SIMILARITY_SCORED_STORES = frozenset({"qdrant", "default"})
+
 
 class MemoryManager:
     """
@@ -48,9 +76,46 @@ class MemoryManager:
         self._mem0_client = None
         self._initialized = False
 
+        # Recall results keyed by (tenant, user, version, query); writes for a
+        # user bump its version so stale entries are simply never hit again
+        self._recall_cache: Optional[TTLCache] = None
+        if self._settings.memory_recall_cache_ttl_seconds > 0:
+            self._recall_cache = TTLCache(
+                maxsize=self._settings.memory_recall_cache_size,
+                ttl_seconds=self._settings.memory_recall_cache_ttl_seconds,
+            )
+        self._user_versions: dict[str, int] = {}
+        self._audit: Any = None  # AuditLogger, resolved on first memory access
+
+        # Write-behind queue for tool-initiated adds; lives on the API event loop
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._write_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+
         if self._enabled:
             self._initialize_mem0()
 
+        # Reads go through one bounded retry inside a shared breaker, so a
+        # flaky store degrades to empty recall instead of retry storms
+        self._store_breaker = get_circuit_breaker("memory_store", failure_threshold=5, recovery_timeout=30)
+        retry = retry_with_backoff(
+            max_attempts=2,
+            base_delay=0.1,
+            max_delay=1.0,
+            retryable_exceptions=_RETRYABLE_STORE_ERRORS,
+        )
+        self._store_search = retry(self._mem0_search)
+        self._store_get_all = retry(self._mem0_get_all)
+
+        # Status depends only on settings and the init outcome above
+        self._status: dict[str, Any] = {
+            "enabled": self._enabled,
+            "initialized": self._initialized,
+            "vector_store": self._settings.memory_vector_store if self._enabled else None,
+            "collection": self._settings.memory_collection_name if self._enabled else None,
+        }
+
     def _initialize_mem0(self) -> None:
         """Initialize Mem0 client with configured backend."""
         try:
@@ -73,6 +138,12 @@ class MemoryManager:
             logger.error("Failed to initialize Mem0: %s", exc)
             self._enabled = False
 
+    def _mem0_search(self, **kwargs: Any) -> Any:
+        return self._mem0_client.search(**kwargs)
+
+    def _mem0_get_all(self, **kwargs: Any) -> Any:
+        return self._mem0_client.get_all(**kwargs)
+
     def _build_mem0_config(self) -> dict[str, Any]:
         """Build Mem0 configuration from platform settings."""
         settings = self._settings
@@ -152,7 +223,7 @@ class MemoryManager:
         enriched_metadata = {
             "category": category,
             "tenant_id": tenant_id,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": utc_now_iso(),
             **(metadata or {}),
         }
 
@@ -192,6 +263,82 @@ class MemoryManager:
                 error=str(exc),
             )
             return {"status": "error", "message": str(exc)}
+        finally:
+            self._invalidate_user(user_id)
+
+    def add_many(
+        self,
+        contents: list[str],
+        user_id: str,
+        category: str = MemoryCategory.GENERAL,
+        metadata: Optional[dict[str, Any]] = None,
+        tenant_id: str = "default",
+    ) -> dict[str, Any]:
+        """
+        Store several memories for one user in a single Mem0 call.
+
+        The items are passed to Mem0 as one message list, so embedding and
+        fact extraction run once for the batch instead of once per item.
+        All items share the same category and metadata.
+
+        Returns:
+            Dict with status, the Mem0 result, and the number of items sent.
+        """
+        if not self._enabled:
+            return {"status": "disabled", "message": "Memory system is not enabled"}
+
+        contents = [c for c in contents if c and c.strip()]
+        if not contents:
+            return {"status": "success", "result": None, "count": 0}
+
+        start = time.perf_counter()
+        enriched_metadata = {
+            "category": category,
+            "tenant_id": tenant_id,
+            "created_at": utc_now_iso(),
+            **(metadata or {}),
+        }
+
+        try:
+            result = self._mem0_client.add(
+                [{"role": "user", "content": content} for content in contents],
+                user_id=str(user_id),
+                metadata=enriched_metadata,
+            )
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._audit_memory_access(
+                action="add_many",
+                user_id=user_id,
+                tenant_id=tenant_id,
+                category=category,
+                duration_ms=elapsed_ms,
+                success=True,
+                details={"count": len(contents)},
+            )
+
+            logger.debug(
+                "Memories added | user=%s category=%s count=%d elapsed=%.1fms",
+                user_id, category, len(contents), elapsed_ms,
+            )
+            return {"status": "success", "result": result, "count": len(contents)}
+
+        except Exception as exc:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.error("Failed to add memories: %s", exc)
+            self._audit_memory_access(
+                action="add_many",
+                user_id=user_id,
+                tenant_id=tenant_id,
+                category=category,
+                duration_ms=elapsed_ms,
+                success=False,
+                error=str(exc),
+                details={"count": len(contents)},
+            )
+            return {"status": "error", "message": str(exc)}
+        finally:
+            self._invalidate_user(user_id)
 
     def search(
         self,
@@ -200,6 +347,7 @@ class MemoryManager:
         limit: int = 10,
         category: Optional[str] = None,
         tenant_id: str = "default",
+        min_score: Optional[float] = None,
     ) -> list[dict[str, Any]]:
         """
         Semantically search a user's memories.
@@ -210,6 +358,9 @@ class MemoryManager:
             limit: Maximum number of results.
             category: Optional category filter.
             tenant_id: Tenant for isolation.
+            min_score: Drop hits below this similarity; defaults to
+                settings.memory_min_score. Only applied for vector stores
+                that score by similarity (Chroma reports distances).
 
         Returns:
             List of matching memory dicts with scores.
@@ -226,15 +377,26 @@ class MemoryManager:
                 "limit": limit,
             }
 
-            results = self._mem0_client.search(**search_kwargs)
+            results = self._store_breaker.call(self._store_search, **search_kwargs)
+            # Mem0's v1.1 output format wraps hits as {"results": [...]}
+            if isinstance(results, dict):
+                results = results.get("results", [])
 
             # Post-filter by category if specified
             if category:
                 results = [
                     r for r in results
-                    if r.get("metadata", {}).get("category") == category
+                    if (r.get("metadata") or {}).get("category") == category
                 ]
 
+            # Low-similarity hits only add prompt tokens downstream
+            threshold = self._settings.memory_min_score if min_score is None else min_score
+            dropped = 0
+            if threshold > 0 and self._settings.memory_vector_store in _SIMILARITY_SCORED_STORES:
+                kept = [r for r in results if r.get("score", 1.0) >= threshold]
+                dropped = len(results) - len(kept)
+                results = kept
+
             elapsed_ms = (time.perf_counter() - start) * 1000
             self._audit_memory_access(
                 action="search",
@@ -243,7 +405,11 @@ class MemoryManager:
                 category=category or "all",
                 duration_ms=elapsed_ms,
                 success=True,
-                details={"query_length": len(query), "results_count": len(results)},
+                details={
+                    "query_length": len(query),
+                    "results_count": len(results),
+                    "below_min_score": dropped,
+                },
             )
 
             logger.debug(
@@ -254,7 +420,9 @@ class MemoryManager:
 
         except Exception as exc:
             elapsed_ms = (time.perf_counter() - start) * 1000
-            logger.error("Memory search failed: %s", exc)
+            # An open breaker is expected back-pressure, not a new failure
+            log = logger.warning if isinstance(exc, CircuitBreakerOpenError) else logger.error
+            log("Memory search failed: %s", exc)
             self._audit_memory_access(
                 action="search",
                 user_id=user_id,
@@ -287,7 +455,7 @@ class MemoryManager:
         start = time.perf_counter()
 
         try:
-            results = self._mem0_client.get_all(user_id=str(user_id))
+            results = self._store_breaker.call(self._store_get_all, user_id=str(user_id))
 
             elapsed_ms = (time.perf_counter() - start) * 1000
             self._audit_memory_access(
@@ -302,7 +470,9 @@ class MemoryManager:
 
         except Exception as exc:
             elapsed_ms = (time.perf_counter() - start) * 1000
-            logger.error("Memory get_all failed: %s", exc)
+            # An open breaker is expected back-pressure, not a new failure
+            log = logger.warning if isinstance(exc, CircuitBreakerOpenError) else logger.error
+            log("Memory get_all failed: %s", exc)
             self._audit_memory_access(
                 action="get_all",
                 user_id=user_id,
@@ -361,6 +531,8 @@ class MemoryManager:
                 error=str(exc),
             )
             return {"status": "error", "message": str(exc)}
+        finally:
+            self._invalidate_user(user_id)
 
     def delete_all(
         self,
@@ -408,6 +580,128 @@ class MemoryManager:
                 error=str(exc),
             )
             return {"status": "error", "message": str(exc)}
+        finally:
+            self._invalidate_user(user_id)
+
+    def _invalidate_user(self, user_id: str) -> None:
+        """Retire cached recalls for a user after any write to their memories."""
+        key = str(user_id)
+        self._user_versions[key] = self._user_versions.get(key, 0) + 1
+
+    def memory_version(self, user_id: str) -> int:
+        """
+        Counter bumped on every add, delete or extraction for the user.
+
+        Callers caching anything derived from a user's memories include it
+        in their cache key, so stale entries are never hit after a write.
+        """
+        return self._user_versions.get(str(user_id), 0)
+
+    # ── Write-behind ─────────────────────────────────────────────
+
+    def enqueue_add(
+        self,
+        content: str,
+        user_id: str,
+        category: str = MemoryCategory.GENERAL,
+        tenant_id: str = "default",
+    ) -> bool:
+        """
+        Queue a memory for the background writer instead of adding it inline.
+
+        Safe to call from worker threads (sync LangChain tools run in an
+        executor). Returns False when no writer is running, in which case
+        the caller should fall back to ``add``.
+        """
+        if not self._enabled:
+            return False
+        item = (str(tenant_id), str(user_id), str(category), content)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        # Held so stop_write_worker cannot close the writer between the check and the put
+        with self._write_lock:
+            loop = self._write_loop
+            if loop is None:
+                return False
+            if running is loop:
+                self._put_write(item)
+            else:
+                loop.call_soon_threadsafe(self._put_write, item)
+        return True
+
+    def _put_write(self, item: tuple[str, str, str, str]) -> None:
+        # Runs on the writer's loop; a put scheduled just before shutdown may
+        # land after the drain, so once closed it is written directly instead
+        queue = self._write_queue
+        if self._write_loop is not None and queue is not None:
+            try:
+                queue.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Memory write queue full — writing inline for user=%s", item[1])
+        # The caller was already told the memory is stored; write it directly
+        tenant_id, user_id, category, content = item
+        asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.add(content, user_id, category=category, tenant_id=tenant_id),
+        )
+
+    async def _write_worker(self, queue: asyncio.Queue) -> None:
+        batch_size = self._settings.memory_write_batch_size
+        window = self._settings.memory_write_batch_window_ms / 1000
+        while True:
+            batch = [await queue.get()]
+            # Give the other facts from the same turn a moment to join
+            if queue.qsize() < batch_size - 1:
+                await asyncio.sleep(window)
+            while len(batch) < batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # add_many shares metadata, so group by (tenant, user, category)
+            groups: dict[tuple[str, str, str], list[str]] = {}
+            for tenant_id, user_id, category, content in batch:
+                groups.setdefault((tenant_id, user_id, category), []).append(content)
+            try:
+                await asyncio.gather(*(
+                    asyncio.to_thread(
+                        self.add_many, contents, user_id, category=category, tenant_id=tenant_id,
+                    )
+                    for (tenant_id, user_id, category), contents in groups.items()
+                ))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+            logger.debug("Memory write batch | items=%d groups=%d", len(batch), len(groups))
+
+    def start_write_worker(self) -> None:
+        """Start the write-behind consumer on the running event loop."""
+        if self._write_task is not None or not self.enabled:
+            return
+        self._write_queue = asyncio.Queue(maxsize=self._settings.memory_write_queue_size)
+        self._write_task = asyncio.create_task(self._write_worker(self._write_queue))
+        with self._write_lock:
+            self._write_loop = asyncio.get_running_loop()
+
+    async def stop_write_worker(self, timeout: float = 30.0) -> None:
+        """Flush queued writes (up to timeout) and stop the consumer."""
+        if self._write_task is None:
+            return
+        with self._write_lock:
+            self._write_loop = None  # new adds go inline from here on
+        try:
+            await asyncio.wait_for(self._write_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Memory write drain timed out — %d writes abandoned",
+                self._write_queue.qsize(),
+            )
+        self._write_task.cancel()
+        self._write_task = None
+        self._write_queue = None
 
     # ── Healthcare-Specific Convenience Methods ──────────────────
 
@@ -416,16 +710,24 @@ class MemoryManager:
         user_id: str,
         query: str = "",
         tenant_id: str = "default",
-    ) -> dict[str, list[dict[str, Any]]]:
+    ) -> dict[MemoryCategory, list[dict[str, Any]]]:
         """
         Retrieve comprehensive patient context organized by category.
 
         Returns memories grouped by category for structured injection
-        into agent prompts.
+        into agent prompts. Results are reused for repeat (user, query)
+        pairs until they expire or the user's memories change; treat the
+        returned dict as read-only.
         """
         if not self._enabled:
             return {}
 
+        cache_key = self._recall_cache_key(user_id, query, tenant_id)
+        if cache_key is not None:
+            cached = self._recall_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # If a query is provided, do semantic search; otherwise get all
         if query:
             memories = self.search(
@@ -437,14 +739,68 @@ class MemoryManager:
         else:
             memories = self.get_all(user_id=user_id, tenant_id=tenant_id)
 
-        # Group by category
-        grouped: dict[str, list[dict[str, Any]]] = {}
+        # Group by category; unknown or missing categories collapse into GENERAL
+        grouped: dict[MemoryCategory, list[dict[str, Any]]] = {}
+        # Locals for the per-memory loop
+        setdefault = grouped.setdefault
+        resolve = _CATEGORY_BY_VALUE.get
+        general = MemoryCategory.GENERAL
+        empty: dict[str, Any] = {}
         for mem in memories:
-            cat = mem.get("metadata", {}).get("category", MemoryCategory.GENERAL)
-            grouped.setdefault(cat, []).append(mem)
+            cat = resolve((mem.get("metadata") or empty).get("category"), general)
+            setdefault(cat, []).append(mem)
 
+        if cache_key is not None:
+            self._recall_cache.set(cache_key, grouped)
         return grouped
 
+    async def arecall_patient_context(
+        self,
+        user_id: str,
+        query: str = "",
+        tenant_id: str = "default",
+    ) -> dict[MemoryCategory, list[dict[str, Any]]]:
+        """Async recall_patient_context; the blocking Mem0 calls run in a worker thread."""
+        if not self._enabled:
+            return {}
+        # Cache hits are answered on the loop without a thread hop
+        cache_key = self._recall_cache_key(user_id, query, tenant_id)
+        if cache_key is not None:
+            cached = self._recall_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        return await asyncio.to_thread(self.recall_patient_context, user_id, query, tenant_id)
+
+    def _recall_cache_key(self, user_id: str, query: str, tenant_id: str) -> Optional[tuple]:
+        if self._recall_cache is None:
+            return None
+        return (tenant_id, str(user_id), self._user_versions.get(str(user_id), 0), query)
+
+    def recall_patient_contexts(
+        self,
+        user_ids: list[str],
+        query: str = "",
+        tenant_id: str = "default",
+        max_workers: int = 8,
+    ) -> dict[str, dict[MemoryCategory, list[dict[str, Any]]]]:
+        """
+        Recall context for several users concurrently.
+
+        Vector-store round-trips overlap on a thread pool, so wall time is
+        roughly one retrieval instead of one per user. Keyed by user_id.
+        """
+        if not self._enabled or not user_ids:
+            return {user_id: {} for user_id in user_ids}
+
+        unique_ids = list(dict.fromkeys(user_ids))
+        workers = max(1, min(max_workers, len(unique_ids)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mem-recall") as pool:
+            results = pool.map(
+                lambda uid: self.recall_patient_context(uid, query, tenant_id),
+                unique_ids,
+            )
+            return dict(zip(unique_ids, results))
+
     def store_interaction_memories(
         self,
         user_id: str,
@@ -470,7 +826,7 @@ class MemoryManager:
                     "category": MemoryCategory.GENERAL,
                     "tenant_id": tenant_id,
                     "source": "conversation_extraction",
-                    "extracted_at": datetime.now(timezone.utc).isoformat(),
+                    "extracted_at": utc_now_iso(),
                 },
             )
 
@@ -496,6 +852,8 @@ class MemoryManager:
                 error=str(exc),
             )
             return {"status": "error", "message": str(exc)}
+        finally:
+            self._invalidate_user(user_id)
 
     # ── Audit Logging ────────────────────────────────────────────
 
@@ -510,11 +868,19 @@ class MemoryManager:
         error: Optional[str] = None,
         details: Optional[dict[str, Any]] = None,
     ) -> None:
-        """Log memory access for HIPAA compliance and audit trail."""
-        try:
-            from infrastructure.audit.logger import get_audit_logger
+        """
+        Log memory access for HIPAA compliance and audit trail.
 
-            audit = get_audit_logger()
+        The audit logger only queues the encoded record for its background
+        writer thread, so this never waits on disk I/O.
+        """
+        try:
+            audit = self._audit
+            if audit is None:
+                from infrastructure.audit.logger import get_audit_logger
+                audit = self._audit = get_audit_logger()
+            if not audit.enabled:
+                return
             audit.log_event(
                 event_type=f"memory_{action}",
                 details={
@@ -540,18 +906,14 @@ class MemoryManager:
         return self._enabled and self._initialized
 
     def get_status(self) -> dict[str, Any]:
-        """Return memory subsystem status for health checks."""
-        return {
-            "enabled": self._enabled,
-            "initialized": self._initialized,
-            "vector_store": self._settings.memory_vector_store if self._enabled else None,
-            "collection": self._settings.memory_collection_name if self._enabled else None,
-        }
+        """Return memory subsystem status for health checks (shared; do not mutate)."""
+        return self._status
 
 
 # ── Singleton Factory ────────────────────────────────────────────
 
 _manager_instance: Optional[MemoryManager] = None
+_manager_lock = threading.Lock()
 
 
 def get_memory_manager() -> MemoryManager:
@@ -559,8 +921,11 @@ def get_memory_manager() -> MemoryManager:
     Singleton factory for the memory manager.
 
     Returns a single shared instance across the application lifecycle.
+    The lock keeps concurrent first calls from each building a Mem0 client.
     """
     global _manager_instance
     if _manager_instance is None:
-        _manager_instance = MemoryManager()
+        with _manager_lock:
+            if _manager_instance is None:
+                _manager_instance = MemoryManager()
     return _manager_instance
@@ -9,20 +9,53 @@ from __future__ import annotations
 
 import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
 from dataclasses import dataclass, field
-from functools import lru_cache
+from functools import partial
 from typing import Any, Optional
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutionRecord:
     """Single execution measurement."""
     name: str
     duration_seconds: float
     success: bool
     timestamp: float = field(default_factory=time.time)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    # None rather than {} so the common no-metadata record allocates no dict
+    metadata: Optional[dict[str, Any]] = None
+
+
+class DurationStats:
+    """
+    Per-name duration aggregate with bounded memory.
+
+    Count, total and max are exact over the collector's lifetime;
+    percentiles are taken over the most recent ``window`` samples, kept
+    in a preallocated float64 ring so summaries copy one contiguous block.
+    """
+
+    __slots__ = ("count", "total", "max", "_ring")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._ring = np.empty(window, dtype=np.float64)
+
+    def add(self, value: float) -> None:
+        self._ring[self.count % len(self._ring)] = value
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def recent(self) -> np.ndarray:
+        """Copy of the retained samples (order is not preserved)."""
+        return self._ring[:min(self.count, len(self._ring))].copy()
 
 
 class MetricsCollector:
@@ -33,7 +66,7 @@ class MetricsCollector:
     Designed to be scraped by Prometheus or exported to any dashboard.
     """
 
-    def __init__(self, max_history: int = 10_000):
+    def __init__(self, max_history: int = 10_000, duration_window: int = 1024):
         self._lock = threading.Lock()
         self._max_history = max_history
 
@@ -42,13 +75,15 @@ class MetricsCollector:
         self._tool_errors: dict[str, int] = defaultdict(int)
         self._agent_calls: dict[str, int] = defaultdict(int)
         self._agent_errors: dict[str, int] = defaultdict(int)
+        self._counters: dict[str, int] = defaultdict(int)
 
-        # Histograms (recent durations)
-        self._tool_durations: dict[str, list[float]] = defaultdict(list)
-        self._agent_durations: dict[str, list[float]] = defaultdict(list)
+        # Duration aggregates; percentile windows are bounded per name
+        new_stats = partial(DurationStats, duration_window)
+        self._tool_durations: dict[str, DurationStats] = defaultdict(new_stats)
+        self._agent_durations: dict[str, DurationStats] = defaultdict(new_stats)
 
-        # Full history ring buffer
-        self._history: list[ExecutionRecord] = []
+        # Full history ring buffer — deque evicts the oldest record in O(1)
+        self._history: deque[ExecutionRecord] = deque(maxlen=max_history)
 
     # ── Recording ────────────────────────────────────────────────
 
@@ -59,19 +94,19 @@ class MetricsCollector:
         success: bool,
         metadata: Optional[dict[str, Any]] = None,
     ) -> None:
+        # Build the record before taking the lock to keep the critical section short
+        record = ExecutionRecord(
+            name=f"tool:{tool_name}",
+            duration_seconds=duration_seconds,
+            success=success,
+            metadata=metadata,
+        )
         with self._lock:
             self._tool_calls[tool_name] += 1
             if not success:
                 self._tool_errors[tool_name] += 1
-            self._tool_durations[tool_name].append(duration_seconds)
-            self._append_history(
-                ExecutionRecord(
-                    name=f"tool:{tool_name}",
-                    duration_seconds=duration_seconds,
-                    success=success,
-                    metadata=metadata or {},
-                )
-            )
+            self._tool_durations[tool_name].add(duration_seconds)
+            self._history.append(record)
 
     def record_agent_execution(
         self,
@@ -80,63 +115,74 @@ class MetricsCollector:
         success: bool,
         metadata: Optional[dict[str, Any]] = None,
     ) -> None:
+        # Build the record before taking the lock to keep the critical section short
+        record = ExecutionRecord(
+            name=f"agent:{agent_name}",
+            duration_seconds=duration_seconds,
+            success=success,
+            metadata=metadata,
+        )
         with self._lock:
             self._agent_calls[agent_name] += 1
             if not success:
                 self._agent_errors[agent_name] += 1
-            self._agent_durations[agent_name].append(duration_seconds)
-            self._append_history(
-                ExecutionRecord(
-                    name=f"agent:{agent_name}",
-                    duration_seconds=duration_seconds,
-                    success=success,
-                    metadata=metadata or {},
-                )
-            )
+            self._agent_durations[agent_name].add(duration_seconds)
+            self._history.append(record)
 
-    def _append_history(self, record: ExecutionRecord) -> None:
-        self._history.append(record)
-        if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
+    def increment(self, name: str, value: int = 1) -> None:
+        """Bump a named event counter (cache hits, skipped work, drops)."""
+        with self._lock:
+            self._counters[name] += value
 
     # ── Querying ─────────────────────────────────────────────────
 
     def get_tool_summary(self) -> dict[str, Any]:
         """Return aggregated tool metrics for dashboard export."""
+        # Snapshot under the lock, aggregate outside it so recorders never
+        # wait on percentile computation
         with self._lock:
-            summary = {}
-            for tool_name in self._tool_calls:
-                durations = self._tool_durations[tool_name]
-                total = self._tool_calls[tool_name]
-                errors = self._tool_errors[tool_name]
-                summary[tool_name] = {
-                    "total_calls": total,
-                    "error_count": errors,
-                    "success_rate": (total - errors) / total if total else 0.0,
-                    "avg_duration_ms": (sum(durations) / len(durations) * 1000) if durations else 0.0,
-                    "p95_duration_ms": self._percentile(durations, 0.95) * 1000 if durations else 0.0,
-                    "p99_duration_ms": self._percentile(durations, 0.99) * 1000 if durations else 0.0,
-                    "max_duration_ms": max(durations) * 1000 if durations else 0.0,
-                }
-            return summary
+            snapshot = [
+                (name, total, self._tool_errors.get(name, 0), self._snapshot_stats(self._tool_durations[name]))
+                for name, total in self._tool_calls.items()
+            ]
+
+        summary = {}
+        for tool_name, total, errors, (count, duration_sum, duration_max, recent) in snapshot:
+            p95, p99 = self._percentiles(recent, 0.95, 0.99)
+            summary[tool_name] = {
+                "total_calls": total,
+                "error_count": errors,
+                "success_rate": (total - errors) / total if total else 0.0,
+                "avg_duration_ms": duration_sum / count * 1000 if count else 0.0,
+                "p95_duration_ms": p95 * 1000,
+                "p99_duration_ms": p99 * 1000,
+                "max_duration_ms": duration_max * 1000,
+            }
+        return summary
 
     def get_agent_summary(self) -> dict[str, Any]:
         """Return aggregated agent metrics."""
         with self._lock:
-            summary = {}
-            for agent_name in self._agent_calls:
-                durations = self._agent_durations[agent_name]
-                total = self._agent_calls[agent_name]
-                errors = self._agent_errors[agent_name]
-                summary[agent_name] = {
-                    "total_calls": total,
-                    "error_count": errors,
-                    "success_rate": (total - errors) / total if total else 0.0,
-                    "avg_duration_ms": (sum(durations) / len(durations) * 1000) if durations else 0.0,
-                    "p95_duration_ms": self._percentile(durations, 0.95) * 1000 if durations else 0.0,
-                    "max_duration_ms": max(durations) * 1000 if durations else 0.0,
-                }
-            return summary
+            snapshot = [
+                (name, total, self._agent_errors.get(name, 0), self._snapshot_stats(self._agent_durations[name]))
+                for name, total in self._agent_calls.items()
+            ]
+
+        summary = {}
+        for agent_name, total, errors, (count, duration_sum, duration_max, recent) in snapshot:
+            summary[agent_name] = {
+                "total_calls": total,
+                "error_count": errors,
+                "success_rate": (total - errors) / total if total else 0.0,
+                "avg_duration_ms": duration_sum / count * 1000 if count else 0.0,
+                "p95_duration_ms": self._percentiles(recent, 0.95)[0] * 1000,
+                "max_duration_ms": duration_max * 1000,
+            }
+        return summary
+
+    def get_counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
 
     def get_dashboard_payload(self) -> dict[str, Any]:
         """Full metrics payload suitable for dashboard ingestion."""
@@ -144,6 +190,7 @@ class MetricsCollector:
             "timestamp": time.time(),
             "tools": self.get_tool_summary(),
             "agents": self.get_agent_summary(),
+            "counters": self.get_counters(),
             "total_requests": sum(self._agent_calls.values()),
             "total_tool_invocations": sum(self._tool_calls.values()),
         }
@@ -156,9 +203,9 @@ class MetricsCollector:
                     "duration_ms": round(r.duration_seconds * 1000, 2),
                     "success": r.success,
                     "timestamp": r.timestamp,
-                    "metadata": r.metadata,
+                    "metadata": r.metadata or {},
                 }
-                for r in self._history[-limit:]
+                for r in islice(self._history, max(len(self._history) - limit, 0), None)
             ]
 
     def reset(self) -> None:
@@ -168,6 +215,7 @@ class MetricsCollector:
             self._tool_errors.clear()
             self._agent_calls.clear()
             self._agent_errors.clear()
+            self._counters.clear()
             self._tool_durations.clear()
             self._agent_durations.clear()
             self._history.clear()
@@ -175,15 +223,33 @@ class MetricsCollector:
     # ── Helpers ──────────────────────────────────────────────────
 
     @staticmethod
-    def _percentile(data: list[float], pct: float) -> float:
-        if not data:
-            return 0.0
-        sorted_data = sorted(data)
-        idx = int(len(sorted_data) * pct)
-        idx = min(idx, len(sorted_data) - 1)
-        return sorted_data[idx]
+    def _snapshot_stats(stats: DurationStats) -> tuple[int, float, float, np.ndarray]:
+        return stats.count, stats.total, stats.max, stats.recent()
+
+    @staticmethod
+    def _percentiles(data: np.ndarray, *pcts: float) -> list[float]:
+        if not data.size:
+            return [0.0] * len(pcts)
+        idx = [min(int(data.size * pct), data.size - 1) for pct in pcts]
+        # One O(n) selection pass for all requested ranks instead of a sort;
+        # partitions the snapshot in place
+        data.partition(idx)
+        return data[idx].tolist()
+
+
+_metrics_collector: Optional[MetricsCollector] = None
+_metrics_collector_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_metrics_collector() -> MetricsCollector:
-    return MetricsCollector()
+    global _metrics_collector
+    if _metrics_collector is None:
+        with _metrics_collector_lock:
+            if _metrics_collector is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                _metrics_collector = MetricsCollector(
+                    max_history=settings.metrics_history_size,
+                    duration_window=settings.metrics_duration_window,
+                )
+    return _metrics_collector
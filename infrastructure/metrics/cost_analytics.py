@@ -5,22 +5,35 @@ Tracks token usage and estimated costs from OpenAI model invocations.
 Supports SQLite (default), in-memory, and extensible to Postgres.
 
 Pricing is configurable and defaults to approximate OpenAI rates.
+
+SQLite inserts are write-behind: ``record_usage`` only enqueues, and a
+daemon thread commits whatever has accumulated (up to ``max_batch``
+rows, or ``linger_seconds`` after the first) with one executemany per
+transaction on a long-lived WAL connection. Queries flush first, so
+reads still see every record made before them.
 """
 
 from __future__ import annotations
 
-import json
+import atexit
+import contextlib
+import queue
 import sqlite3
 import threading
 import time
 import uuid
 from collections import defaultdict
 from dataclasses import dataclass, field
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+import orjson
 
 from config.settings import get_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 # ── Token pricing (per 1K tokens, approximate) ──────────────────
@@ -33,8 +46,40 @@ DEFAULT_PRICING: dict[str, dict[str, float]] = {
     "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
 }
 
+# Applied to models missing from the pricing table
+FALLBACK_PRICING: dict[str, float] = {"input": 0.003, "output": 0.006}
+
+
+def _per_token_rates(prices: dict[str, float]) -> tuple[float, float]:
+    return prices["input"] / 1000, prices["output"] / 1000
+
+
+_FALLBACK_RATES = _per_token_rates(FALLBACK_PRICING)
+
+
+# Upper bound on how long a cost query waits for queued records to commit
+_READ_FLUSH_TIMEOUT = 5.0
+
+_INSERT_SQL = """
+    INSERT INTO cost_records
+        (record_id, timestamp, tenant_id, user_id, model,
+         input_tokens, output_tokens,
+         estimated_cost_usd, operation, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Databases created before total_tokens became a generated column store it
+# explicitly; it goes last so both statements share the same leading row
+_INSERT_SQL_STORED_TOTAL = """
+    INSERT INTO cost_records
+        (record_id, timestamp, tenant_id, user_id, model,
+         input_tokens, output_tokens,
+         estimated_cost_usd, operation, metadata, total_tokens)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
-@dataclass
+@dataclass(slots=True)
 class UsageRecord:
     record_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     timestamp: float = field(default_factory=time.time)
@@ -59,23 +104,47 @@ class CostAnalytics:
         backend: str = "sqlite",
         db_path: str = "data/cost_analytics.db",
         pricing: Optional[dict[str, dict[str, float]]] = None,
+        max_batch: int = 256,
+        linger_seconds: float = 0.05,
+        query_engine: str = "sqlite",
     ):
         self._backend = backend
         self._pricing = pricing or DEFAULT_PRICING
+        # (input, output) USD per token, so estimates are two multiply-adds
+        self._rates = {model: _per_token_rates(p) for model, p in self._pricing.items()}
         self._lock = threading.Lock()
 
         # In-memory fallback
         self._memory_records: list[UsageRecord] = []
 
+        # SQLite write-behind queue, drained by the writer thread
+        self._queue: "queue.SimpleQueue[Union[UsageRecord, threading.Event, None]]" = queue.SimpleQueue()
+        self._max_batch = max_batch
+        self._linger = linger_seconds
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._stored_total = False
+
         if backend == "sqlite":
             Path(db_path).parent.mkdir(parents=True, exist_ok=True)
             self._db_path = db_path
             self._init_sqlite()
+            self._writer = threading.Thread(target=self._run_writer, name="cost-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+        # Optional columnar engine for the aggregate queries; writes always
+        # go through SQLite, which stays the source of truth
+        self._duckdb = None
+        if backend == "sqlite" and query_engine == "duckdb":
+            self._duckdb = self._attach_duckdb()
 
     # ── SQLite setup ─────────────────────────────────────────────
 
     def _init_sqlite(self) -> None:
         with sqlite3.connect(self._db_path) as conn:
+            # WAL lets readers run alongside the writer thread's commits
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cost_records (
                     record_id TEXT PRIMARY KEY,
@@ -85,7 +154,7 @@ class CostAnalytics:
                     model TEXT DEFAULT '',
                     input_tokens INTEGER DEFAULT 0,
                     output_tokens INTEGER DEFAULT 0,
-                    total_tokens INTEGER DEFAULT 0,
+                    total_tokens INTEGER GENERATED ALWAYS AS (input_tokens + output_tokens) VIRTUAL,
                     estimated_cost_usd REAL DEFAULT 0.0,
                     operation TEXT DEFAULT '',
                     metadata TEXT DEFAULT '{}'
@@ -99,13 +168,105 @@ class CostAnalytics:
                 CREATE INDEX IF NOT EXISTS idx_cost_user
                 ON cost_records (user_id, timestamp)
             """)
+            # Covering index for the model breakdown: the time-range scan and
+            # GROUP BY are answered from the index without touching table rows
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cost_ts_model
+                ON cost_records (timestamp, model, input_tokens, output_tokens,
+                                 total_tokens, estimated_cost_usd)
+            """)
             conn.commit()
+            # table_xinfo marks generated columns as hidden (2 virtual, 3 stored);
+            # older databases still have total_tokens as a plain column
+            self._stored_total = any(
+                row[1] == "total_tokens" and row[6] == 0
+                for row in conn.execute("PRAGMA table_xinfo(cost_records)")
+            )
+
+    def _attach_duckdb(self) -> Any:
+        try:
+            import duckdb
+
+            conn = duckdb.connect()
+            conn.execute("INSTALL sqlite")
+            conn.execute("LOAD sqlite")
+            # ATTACH takes no bound parameters; quote the path as a literal
+            db_literal = "'" + str(self._db_path).replace("'", "''") + "'"
+            conn.execute(f"ATTACH {db_literal} AS costs (TYPE SQLITE, READ_ONLY)")
+            logger.info("Cost analytics queries running on DuckDB | db=%s", self._db_path)
+            return conn
+        except ImportError:
+            logger.warning(
+                "duckdb package not installed — cost queries use SQLite. "
+                "Install with: pip install duckdb"
+            )
+        except Exception as exc:
+            logger.error("Failed to attach DuckDB to %s, using SQLite: %s", self._db_path, exc)
+        return None
 
     # ── Recording ────────────────────────────────────────────────
 
     def estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
-        prices = self._pricing.get(model, {"input": 0.003, "output": 0.006})
-        return (input_tokens / 1000 * prices["input"]) + (output_tokens / 1000 * prices["output"])
+        in_rate, out_rate = self._rates.get(model, _FALLBACK_RATES)
+        return input_tokens * in_rate + output_tokens * out_rate
+
+    def estimate_cost_batch(
+        self,
+        models: Sequence[str],
+        input_tokens: Sequence[int],
+        output_tokens: Sequence[int],
+    ) -> np.ndarray:
+        """
+        Vectorized ``estimate_cost`` over parallel sequences.
+
+        Prices are looked up once per distinct model and broadcast, so
+        re-pricing large histories costs a few array ops instead of a
+        Python call per row. Results match ``estimate_cost`` exactly.
+        """
+        if len(models) == 0:
+            return np.zeros(0)
+        distinct, idx = np.unique(np.asarray(models, dtype=object).astype(str), return_inverse=True)
+        rates = np.array([self._rates.get(m, _FALLBACK_RATES) for m in distinct])
+        return (
+            np.asarray(input_tokens, dtype=np.float64) * rates[idx, 0]
+            + np.asarray(output_tokens, dtype=np.float64) * rates[idx, 1]
+        )
+
+    def reprice(self, since_timestamp: Optional[float] = None) -> int:
+        """
+        Recompute stored ``estimated_cost_usd`` with the current pricing table.
+
+        Used after pricing changes. Returns the number of records updated.
+        """
+        since = since_timestamp or 0
+        if self._backend != "sqlite":
+            with self._lock:
+                records = [r for r in self._memory_records if r.timestamp >= since]
+                costs = self.estimate_cost_batch(
+                    [r.model for r in records],
+                    [r.input_tokens for r in records],
+                    [r.output_tokens for r in records],
+                )
+                for record, cost in zip(records, costs.tolist()):
+                    record.estimated_cost_usd = cost
+            return len(records)
+
+        self._flush_for_read()
+        with sqlite3.connect(self._db_path) as conn:
+            rows = conn.execute(
+                "SELECT record_id, model, input_tokens, output_tokens FROM cost_records WHERE timestamp >= ?",
+                (since,),
+            ).fetchall()
+            if not rows:
+                return 0
+            record_ids, models, input_tokens, output_tokens = zip(*rows)
+            costs = self.estimate_cost_batch(models, input_tokens, output_tokens)
+            conn.executemany(
+                "UPDATE cost_records SET estimated_cost_usd = ? WHERE record_id = ?",
+                zip(costs.tolist(), record_ids),
+            )
+            conn.commit()
+        return len(rows)
 
     def record_usage(
         self,
@@ -133,39 +294,115 @@ class CostAnalytics:
             metadata=metadata or {},
         )
 
-        with self._lock:
-            if self._backend == "sqlite":
-                self._persist_sqlite(record)
+        if self._backend == "sqlite":
+            if self._closed:
+                # Late records after shutdown are written synchronously
+                with sqlite3.connect(self._db_path) as conn:
+                    self._insert(conn, [record])
             else:
+                self._queue.put(record)
+        else:
+            with self._lock:
                 self._memory_records.append(record)
 
         return record
 
-    def _persist_sqlite(self, record: UsageRecord) -> None:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO cost_records
-                    (record_id, timestamp, tenant_id, user_id, model,
-                     input_tokens, output_tokens, total_tokens,
-                     estimated_cost_usd, operation, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    record.record_id,
-                    record.timestamp,
-                    record.tenant_id,
-                    record.user_id,
-                    record.model,
-                    record.input_tokens,
-                    record.output_tokens,
-                    record.total_tokens,
-                    record.estimated_cost_usd,
-                    record.operation,
-                    json.dumps(record.metadata),
-                ),
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record queued before this call is committed."""
+        if self._writer is None or self._closed:
+            return True
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _flush_for_read(self) -> None:
+        # Reads are served from whatever is committed if the writer is stuck
+        if not self.flush(_READ_FLUSH_TIMEOUT):
+            logger.warning("Cost writer flush timed out — reading without pending records")
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Commit pending records and stop the writer thread."""
+        if self._writer is None or self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    # ── SQLite writer thread ─────────────────────────────────────
+
+    def _run_writer(self) -> None:
+        conn = sqlite3.connect(self._db_path)
+        # Durable at checkpoints rather than on every commit; WAL keeps
+        # the database consistent either way
+        conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            item = self._queue.get()
+            batch: list[UsageRecord] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self._linger
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                # A flush or shutdown commits right away instead of lingering
+                if stop or waiters or len(batch) >= self._max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._insert(conn, batch)
+            except Exception as exc:
+                # Drop the batch but keep the thread alive; flush() relies on it
+                with contextlib.suppress(sqlite3.Error):
+                    conn.rollback()
+                logger.error("Failed to persist %d cost records: %s", len(batch), exc)
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+
+            if stop:
+                conn.close()
+                return
+
+    def _insert(self, conn: sqlite3.Connection, records: list[UsageRecord]) -> None:
+        # Row packing and metadata encoding stay off the producer path;
+        # sqlite3 caches the prepared statement per connection
+        rows = [
+            (
+                r.record_id,
+                r.timestamp,
+                r.tenant_id,
+                r.user_id,
+                r.model,
+                r.input_tokens,
+                r.output_tokens,
+                r.estimated_cost_usd,
+                r.operation,
+                orjson.dumps(r.metadata, default=str, option=orjson.OPT_NON_STR_KEYS).decode(),
             )
-            conn.commit()
+            for r in records
+        ]
+        if self._stored_total:
+            conn.executemany(
+                _INSERT_SQL_STORED_TOTAL,
+                [row + (r.total_tokens,) for row, r in zip(rows, records)],
+            )
+        else:
+            conn.executemany(_INSERT_SQL, rows)
+        conn.commit()
 
     # ── Querying ─────────────────────────────────────────────────
 
@@ -184,25 +421,22 @@ class CostAnalytics:
     def get_model_breakdown(self, since_timestamp: Optional[float] = None) -> dict[str, Any]:
         """Breakdown by model."""
         if self._backend == "sqlite":
-            since = since_timestamp or 0
-            with sqlite3.connect(self._db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                rows = conn.execute(
-                    """
-                    SELECT model,
-                           COUNT(*) as request_count,
-                           SUM(input_tokens) as total_input_tokens,
-                           SUM(output_tokens) as total_output_tokens,
-                           SUM(total_tokens) as total_tokens,
-                           SUM(estimated_cost_usd) as total_cost_usd
-                    FROM cost_records
-                    WHERE timestamp >= ?
-                    GROUP BY model
-                    ORDER BY total_cost_usd DESC
-                    """,
-                    (since,),
-                ).fetchall()
-                return {row["model"]: dict(row) for row in rows}
+            rows = self._select(
+                """
+                SELECT model,
+                       COUNT(*) as request_count,
+                       SUM(input_tokens) as total_input_tokens,
+                       SUM(output_tokens) as total_output_tokens,
+                       SUM(input_tokens + output_tokens) as total_tokens,
+                       SUM(estimated_cost_usd) as total_cost_usd
+                FROM {table}
+                WHERE timestamp >= ?
+                GROUP BY model
+                ORDER BY total_cost_usd DESC
+                """,
+                (since_timestamp or 0,),
+            )
+            return {row["model"]: row for row in rows}
         else:
             breakdown: dict[str, Any] = defaultdict(
                 lambda: {"request_count": 0, "total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0, "total_cost_usd": 0.0}
@@ -220,22 +454,19 @@ class CostAnalytics:
 
     def _aggregate(self, field_name: str, field_value: str, since_timestamp: Optional[float] = None) -> dict[str, Any]:
         if self._backend == "sqlite":
-            since = since_timestamp or 0
-            with sqlite3.connect(self._db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                row = conn.execute(
-                    f"""
-                    SELECT COUNT(*) as request_count,
-                           SUM(input_tokens) as total_input_tokens,
-                           SUM(output_tokens) as total_output_tokens,
-                           SUM(total_tokens) as total_tokens,
-                           SUM(estimated_cost_usd) as total_cost_usd
-                    FROM cost_records
-                    WHERE {field_name} = ? AND timestamp >= ?
-                    """,
-                    (field_value, since),
-                ).fetchone()
-                return dict(row) if row else {}
+            rows = self._select(
+                f"""
+                SELECT COUNT(*) as request_count,
+                       SUM(input_tokens) as total_input_tokens,
+                       SUM(output_tokens) as total_output_tokens,
+                       SUM(input_tokens + output_tokens) as total_tokens,
+                       SUM(estimated_cost_usd) as total_cost_usd
+                FROM {{table}}
+                WHERE {field_name} = ? AND timestamp >= ?
+                """,
+                (field_value, since_timestamp or 0),
+            )
+            return rows[0] if rows else {}
         else:
             totals = {"request_count": 0, "total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0, "total_cost_usd": 0.0}
             for r in self._memory_records:
@@ -250,6 +481,22 @@ class CostAnalytics:
                 totals["total_cost_usd"] += r.estimated_cost_usd
             return totals
 
+    def _select(self, sql: str, params: tuple[Any, ...]) -> list[dict[str, Any]]:
+        """Run a read query (``{table}`` placeholder) on the configured engine."""
+        self._flush_for_read()
+        if self._duckdb is not None:
+            # Cursors give each calling thread its own DuckDB connection handle
+            cur = self._duckdb.cursor()
+            try:
+                cur.execute(sql.format(table="costs.cost_records"), list(params))
+                columns = [d[0] for d in cur.description]
+                return [dict(zip(columns, row)) for row in cur.fetchall()]
+            finally:
+                cur.close()
+        with sqlite3.connect(self._db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql.format(table="cost_records"), params)]
+
     def get_summary_dashboard(self, since_timestamp: Optional[float] = None) -> dict[str, Any]:
         """Full cost dashboard payload."""
         return {
@@ -259,10 +506,19 @@ class CostAnalytics:
         }
 
 
-@lru_cache(maxsize=1)
+_cost_analytics: Optional[CostAnalytics] = None
+_cost_analytics_lock = threading.Lock()
+
+
 def get_cost_analytics() -> CostAnalytics:
-    settings = get_settings()
-    return CostAnalytics(
-        backend=settings.cost_storage_backend,
-        db_path=settings.cost_db_path,
-    )
+    global _cost_analytics
+    if _cost_analytics is None:
+        with _cost_analytics_lock:
+            if _cost_analytics is None:
+                settings = get_settings()
+                _cost_analytics = CostAnalytics(
+                    backend=settings.cost_storage_backend,
+                    db_path=settings.cost_db_path,
+                    query_engine=settings.cost_query_engine,
+                )
+    return _cost_analytics
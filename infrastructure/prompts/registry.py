@@ -7,19 +7,60 @@ Features:
   - Audit trail for every prompt change
   - LangSmith Hub integration (push/pull)
   - Environment-scoped prompt deployment
+
+Each prompt is persisted as an append-only JSONL log
+(``<prompt_id>.jsonl``): every change appends the affected versions,
+and the last line per version wins on load. The log is rewritten as a
+compact snapshot once it holds ``_COMPACT_FACTOR`` times more lines than
+there are versions. Legacy ``<prompt_id>.json`` array files are still
+read and are converted on the next change to that prompt.
 """
 
 from __future__ import annotations
 
 import copy
-import json
+import os
+import re
 import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+import orjson
+
+# Template placeholders: {name}
+_VAR_RE = re.compile(r"\{(\w+)\}")
+
+
+def _compile_renderer(parts: list[str]) -> Callable[[dict[str, Any]], str]:
+    """
+    Generate a render function for a template pre-split by ``_VAR_RE``.
+
+    The function joins one tuple of literals and per-placeholder
+    conditionals, so rendering runs no Python-level loop. Every literal
+    and name enters the generated source through ``repr()`` (names are
+    ``\\w+`` by construction), so template content cannot inject code.
+    Placeholders missing from the kwargs are kept as written.
+    """
+    pieces = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            if part:
+                pieces.append(repr(part))
+        else:
+            pieces.append(f"(_str(kw[{part!r}]) if {part!r} in kw else {('{' + part + '}')!r})")
+    src = f"def _render(kw, _str=str):\n    return ''.join(({', '.join(pieces)},))\n"
+    namespace: dict[str, Any] = {}
+    exec(compile(src, "<prompt-template>", "exec"), namespace)
+    return namespace["_render"]
+
+
+# Rewrite a prompt's log once it is this many times longer than its version list
+_COMPACT_FACTOR = 10
 
 
 class PromptStatus(str, Enum):
@@ -29,6 +70,9 @@ class PromptStatus(str, Enum):
     ARCHIVED = "archived"
 
 
+_STATUS_BY_VALUE: dict[str, PromptStatus] = {s.value: s for s in PromptStatus}
+
+
 class PromptVersion:
     """Immutable snapshot of a prompt at a point in time."""
 
@@ -54,13 +98,17 @@ class PromptVersion:
         self.created_by = created_by
         self.created_at = datetime.now(timezone.utc).isoformat()
         self.version_id = f"{prompt_id}:v{version}"
+        # Split once: even indices are literal text, odd indices are
+        # placeholder names; templates with placeholders get a generated
+        # renderer, plain ones render as the template itself
+        parts = _VAR_RE.split(template)
+        self._render = _compile_renderer(parts) if len(parts) > 1 else None
 
     def render(self, **kwargs: Any) -> str:
         """Render the prompt template with given variables."""
-        result = self.template
-        for key, value in kwargs.items():
-            result = result.replace(f"{{{key}}}", str(value))
-        return result
+        if self._render is None:
+            return self.template
+        return self._render(kwargs)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -91,7 +139,14 @@ class PromptRegistry:
         self._storage_dir = Path(storage_dir)
         self._storage_dir.mkdir(parents=True, exist_ok=True)
         self._change_log: list[dict[str, Any]] = []
+        # Lines in each prompt's log file, and prompts still in legacy .json form
+        self._log_lines: dict[str, int] = {}
+        self._legacy: set[str] = set()
+        # Active version per prompt name, refreshed on every status change
+        self._active: dict[str, PromptVersion] = {}
         self._load_from_disk()
+        for name in self._prompts:
+            self._refresh_active(name)
 
     # ── Core operations ──────────────────────────────────────────
 
@@ -122,15 +177,18 @@ class PromptRegistry:
                 created_by=created_by,
             )
 
+            changed = [pv]
             if auto_activate:
                 # Deactivate previous active
                 for v in versions:
                     if v.status == PromptStatus.ACTIVE:
                         v.status = PromptStatus.DEPRECATED
+                        changed.append(v)
 
             versions.append(pv)
+            self._refresh_active(name)
             self._log_change("register", pv)
-            self._persist(name)
+            self._persist(name, changed)
             return pv
 
     def activate(self, name: str, version: int) -> PromptVersion:
@@ -138,18 +196,22 @@ class PromptRegistry:
         with self._lock:
             versions = self._prompts.get(name, [])
             target = None
+            changed: list[PromptVersion] = []
             for v in versions:
                 if v.version == version:
                     target = v
                 elif v.status == PromptStatus.ACTIVE:
                     v.status = PromptStatus.DEPRECATED
+                    changed.append(v)
 
             if not target:
                 raise ValueError(f"Prompt '{name}' version {version} not found")
 
             target.status = PromptStatus.ACTIVE
+            changed.append(target)
+            self._refresh_active(name)
             self._log_change("activate", target)
-            self._persist(name)
+            self._persist(name, changed)
             return target
 
     def deprecate(self, name: str, version: int) -> PromptVersion:
@@ -157,17 +219,20 @@ class PromptRegistry:
         with self._lock:
             target = self._get_version(name, version)
             target.status = PromptStatus.DEPRECATED
+            self._refresh_active(name)
             self._log_change("deprecate", target)
-            self._persist(name)
+            self._persist(name, [target])
             return target
 
     def get_active(self, name: str) -> Optional[PromptVersion]:
         """Get the currently active version of a prompt."""
-        with self._lock:
-            for v in reversed(self._prompts.get(name, [])):
-                if v.status == PromptStatus.ACTIVE:
-                    return v
-            return None
+        # Single dict read; writers replace entries under the lock
+        return self._active.get(name)
+
+    def get_active_many(self, names: list[str]) -> dict[str, Optional[PromptVersion]]:
+        """Get the active version of several prompts."""
+        active = self._active
+        return {name: active.get(name) for name in names}
 
     def get_version(self, name: str, version: int) -> Optional[PromptVersion]:
         with self._lock:
@@ -196,6 +261,14 @@ class PromptRegistry:
 
     # ── Internal ─────────────────────────────────────────────────
 
+    def _refresh_active(self, name: str) -> None:
+        """Point the active cache at the newest ACTIVE version of a prompt."""
+        for v in reversed(self._prompts.get(name, [])):
+            if v.status == PromptStatus.ACTIVE:
+                self._active[name] = v
+                return
+        self._active.pop(name, None)
+
     def _get_version(self, name: str, version: int) -> PromptVersion:
         for v in self._prompts.get(name, []):
             if v.version == version:
@@ -203,13 +276,14 @@ class PromptRegistry:
         raise ValueError(f"Prompt '{name}' version {version} not found")
 
     @staticmethod
+    @lru_cache(maxsize=512)
     def _name_to_id(name: str) -> str:
         return name.lower().replace(" ", "_").replace("-", "_")
 
     @staticmethod
     def _extract_variables(template: str) -> list[str]:
-        import re
-        return list(set(re.findall(r"\{(\w+)\}", template)))
+        # Deduplicate in order of first appearance
+        return list(dict.fromkeys(_VAR_RE.findall(template)))
 
     def _log_change(self, action: str, pv: PromptVersion) -> None:
         self._change_log.append({
@@ -221,38 +295,118 @@ class PromptRegistry:
             "created_by": pv.created_by,
         })
 
-    def _persist(self, name: str) -> None:
-        """Persist prompt versions to disk as JSON."""
-        data = [v.to_dict() for v in self._prompts.get(name, [])]
-        file_path = self._storage_dir / f"{self._name_to_id(name)}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+    def _persist(self, name: str, changed: list[PromptVersion]) -> None:
+        """Append the changed versions to the prompt's log, compacting when it grows."""
+        versions = self._prompts.get(name, [])
+        lines = self._log_lines.get(name, 0) + len(changed)
+        if name in self._legacy or lines > _COMPACT_FACTOR * len(versions):
+            self._compact(name)
+            return
+        file_path = self._storage_dir / f"{self._name_to_id(name)}.jsonl"
+        with open(file_path, "ab") as f:
+            f.write(b"".join(
+                orjson.dumps(v.to_dict(), option=orjson.OPT_APPEND_NEWLINE) for v in changed
+            ))
+        self._log_lines[name] = lines
+
+    def _compact(self, name: str) -> None:
+        """Rewrite the prompt's log as one line per version."""
+        versions = self._prompts.get(name, [])
+        prompt_id = self._name_to_id(name)
+        file_path = self._storage_dir / f"{prompt_id}.jsonl"
+        tmp_path = file_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(
+                orjson.dumps(v.to_dict(), option=orjson.OPT_APPEND_NEWLINE) for v in versions
+            ))
+        os.replace(tmp_path, file_path)
+        self._log_lines[name] = len(versions)
+        if name in self._legacy:
+            (self._storage_dir / f"{prompt_id}.json").unlink(missing_ok=True)
+            self._legacy.discard(name)
 
     def _load_from_disk(self) -> None:
         """Load persisted prompts from disk on startup."""
-        for p in self._storage_dir.glob("*.json"):
+        logs = list(self._storage_dir.glob("*.jsonl"))
+        legacy = [p for p in self._storage_dir.glob("*.json") if not p.with_suffix(".jsonl").exists()]
+        if not logs and not legacy:
+            return
+
+        # Files are read and parsed concurrently, then merged in order here
+        with ThreadPoolExecutor(max_workers=min(8, len(logs) + len(legacy))) as pool:
+            log_results = list(pool.map(self._read_log, logs))
+            legacy_results = list(pool.map(self._read_legacy, legacy))
+
+        for versions, line_count in log_results:
+            if versions:
+                self._prompts.setdefault(versions[0].name, []).extend(versions)
+                self._log_lines[versions[0].name] = line_count
+        for versions in legacy_results:
+            for pv in versions:
+                self._prompts.setdefault(pv.name, []).append(pv)
+                self._legacy.add(pv.name)
+
+    @classmethod
+    def _read_log(cls, path: Path) -> tuple[list[PromptVersion], int]:
+        """Parse a prompt log; returns its versions in order and its line count."""
+        # Later lines supersede earlier ones for the same version
+        latest: dict[int, dict[str, Any]] = {}
+        line_count = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                line_count += 1
+                try:
+                    item = orjson.loads(line)
+                    latest[item["version"]] = item
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    continue  # Skip a torn or corrupted line
+        versions = []
+        for _, item in sorted(latest.items()):
             try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                for item in data:
-                    name = item["name"]
-                    versions = self._prompts.setdefault(name, [])
-                    pv = PromptVersion(
-                        prompt_id=item["prompt_id"],
-                        version=item["version"],
-                        name=name,
-                        template=item["template"],
-                        variables=item["variables"],
-                        status=PromptStatus(item["status"]),
-                        metadata=item.get("metadata", {}),
-                        created_by=item.get("created_by", "system"),
-                    )
-                    pv.created_at = item.get("created_at", pv.created_at)
-                    versions.append(pv)
+                versions.append(cls._version_from_item(item))
             except Exception:
-                pass  # Skip corrupted files
+                continue
+        return versions, line_count
+
+    @classmethod
+    def _read_legacy(cls, path: Path) -> list[PromptVersion]:
+        """Parse a legacy JSON array file, keeping the versions read before any error."""
+        versions: list[PromptVersion] = []
+        try:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+            for item in data:
+                versions.append(cls._version_from_item(item))
+        except Exception:
+            pass  # Skip corrupted files
+        return versions
+
+    @staticmethod
+    def _version_from_item(item: dict[str, Any]) -> PromptVersion:
+        pv = PromptVersion(
+            prompt_id=item["prompt_id"],
+            version=item["version"],
+            name=item["name"],
+            template=item["template"],
+            variables=item["variables"],
+            status=_STATUS_BY_VALUE[item["status"]],
+            metadata=item.get("metadata", {}),
+            created_by=item.get("created_by", "system"),
+        )
+        pv.created_at = item.get("created_at", pv.created_at)
+        return pv
+
+
+_prompt_registry: Optional[PromptRegistry] = None
+_prompt_registry_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_prompt_registry() -> PromptRegistry:
-    return PromptRegistry()
+    global _prompt_registry
+    if _prompt_registry is None:
+        with _prompt_registry_lock:
+            if _prompt_registry is None:
+                _prompt_registry = PromptRegistry()
+    return _prompt_registry
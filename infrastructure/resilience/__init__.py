@@ -1,5 +1,6 @@
 from infrastructure.resilience.circuit_breaker import CircuitBreaker, CircuitState, get_circuit_breaker
 from infrastructure.resilience.retry import retry_with_backoff, RetryConfig
+from infrastructure.resilience.concurrency import AdaptiveConcurrencyLimiter
 
 __all__ = [
     "CircuitBreaker",
@@ -7,4 +8,5 @@ __all__ = [
     "get_circuit_breaker",
     "retry_with_backoff",
     "RetryConfig",
+    "AdaptiveConcurrencyLimiter",
 ]
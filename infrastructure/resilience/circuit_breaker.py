@@ -8,6 +8,11 @@ States:
 
 Prevents cascading failures when downstream services
 (LLM APIs, databases) are unhealthy.
+
+The healthy CLOSED path never takes the lock: ``_state`` is only ever
+rebound (a single atomic store), so a plain read is safe, and a success
+just clears the failure count. The lock is held for failures and for
+everything in OPEN/HALF_OPEN, where several fields change together.
 """
 
 from __future__ import annotations
@@ -16,7 +21,7 @@ import threading
 import time
 from enum import Enum
 from functools import lru_cache
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from infrastructure.audit.logger import get_audit_logger
 
@@ -27,6 +32,13 @@ class CircuitState(str, Enum):
     HALF_OPEN = "half_open"
 
 
+# Module-level aliases: state checks are identity compares on a global
+# instead of an attribute lookup on the enum class
+_CLOSED = CircuitState.CLOSED
+_OPEN = CircuitState.OPEN
+_HALF_OPEN = CircuitState.HALF_OPEN
+
+
 class CircuitBreakerOpenError(Exception):
     """Raised when circuit is open and request is rejected."""
     pass
@@ -39,8 +51,15 @@ class CircuitBreaker:
     Usage:
         cb = CircuitBreaker("llm_api", failure_threshold=5, recovery_timeout=60)
         result = cb.call(lambda: llm.invoke(prompt))
+        result = await cb.acall(llm.ainvoke, prompt)
     """
 
+    __slots__ = (
+        "name", "_failure_threshold", "_recovery_timeout", "_half_open_max_calls",
+        "_state", "_failure_count", "_success_count", "_half_open_calls",
+        "_last_failure_time", "_lock", "_audit",
+    )
+
     def __init__(
         self,
         name: str,
@@ -53,19 +72,26 @@ class CircuitBreaker:
         self._recovery_timeout = recovery_timeout
         self._half_open_max_calls = half_open_max_calls
 
-        self._state = CircuitState.CLOSED
+        self._state = _CLOSED
         self._failure_count = 0
         self._success_count = 0
         self._half_open_calls = 0
+        # Monotonic clock, so wall-clock jumps cannot shorten or stretch recovery
         self._last_failure_time: float = 0
         self._lock = threading.Lock()
         self._audit = get_audit_logger()
 
     @property
     def state(self) -> CircuitState:
+        state = self._state
+        if state is _CLOSED:
+            return state
         with self._lock:
-            self._check_state_transition()
-            return self._state
+            transition = self._check_state_transition()
+            state = self._state
+        if transition:
+            self._log_transition(transition)
+        return state
 
     @property
     def failure_count(self) -> int:
@@ -76,27 +102,7 @@ class CircuitBreaker:
         Execute func through the circuit breaker.
         Raises CircuitBreakerOpenError if circuit is open.
         """
-        with self._lock:
-            self._check_state_transition()
-
-            if self._state == CircuitState.OPEN:
-                self._audit.log_event(
-                    "circuit_breaker_rejected",
-                    details={"breaker": self.name, "state": self._state.value},
-                    severity="warning",
-                    source="resilience",
-                )
-                raise CircuitBreakerOpenError(
-                    f"Circuit breaker '{self.name}' is OPEN. "
-                    f"Recovery in {self._time_until_recovery():.0f}s."
-                )
-
-            if self._state == CircuitState.HALF_OPEN:
-                if self._half_open_calls >= self._half_open_max_calls:
-                    raise CircuitBreakerOpenError(
-                        f"Circuit breaker '{self.name}' HALF_OPEN limit reached."
-                    )
-                self._half_open_calls += 1
+        self._before_call()
 
         # Execute outside lock
         try:
@@ -108,87 +114,161 @@ class CircuitBreaker:
             self._on_success()
             return result
 
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await coroutine func through the circuit breaker.
+        Raises CircuitBreakerOpenError if circuit is open.
+        """
+        self._before_call()
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as exc:
+            self._on_failure(exc)
+            raise
+        else:
+            self._on_success()
+            return result
+
+    def _before_call(self) -> None:
+        if self._state is _CLOSED:
+            return
+        # Audit events are staged under the lock and emitted after it
+        rejected: Optional[str] = None
+        with self._lock:
+            transition = self._check_state_transition()
+
+            if self._state is _OPEN:
+                rejected = (
+                    f"Circuit breaker '{self.name}' is OPEN. "
+                    f"Recovery in {self._time_until_recovery():.0f}s."
+                )
+            elif self._state is _HALF_OPEN:
+                if self._half_open_calls >= self._half_open_max_calls:
+                    raise CircuitBreakerOpenError(
+                        f"Circuit breaker '{self.name}' HALF_OPEN limit reached."
+                    )
+                self._half_open_calls += 1
+
+        if transition:
+            self._log_transition(transition)
+        if rejected:
+            self._audit.log_event(
+                "circuit_breaker_rejected",
+                details={"breaker": self.name, "state": _OPEN.value},
+                severity="warning",
+                source="resilience",
+            )
+            raise CircuitBreakerOpenError(rejected)
+
     def _on_success(self) -> None:
+        if self._state is _CLOSED:
+            # A failure racing with this store can be lost, which only
+            # delays tripping by one call; skip the write when already zero
+            if self._failure_count:
+                self._failure_count = 0
+            return
+        transition = None
         with self._lock:
-            if self._state == CircuitState.HALF_OPEN:
+            if self._state is _HALF_OPEN:
                 self._success_count += 1
                 if self._success_count >= self._half_open_max_calls:
-                    self._transition_to(CircuitState.CLOSED)
-            elif self._state == CircuitState.CLOSED:
+                    transition = self._transition_to(_CLOSED)
+            elif self._state is _CLOSED:
                 self._failure_count = 0
+        if transition:
+            self._log_transition(transition)
 
     def _on_failure(self, exc: Exception) -> None:
+        transition = None
         with self._lock:
             self._failure_count += 1
-            self._last_failure_time = time.time()
+            self._last_failure_time = time.monotonic()
 
-            if self._state == CircuitState.HALF_OPEN:
-                self._transition_to(CircuitState.OPEN)
-            elif self._state == CircuitState.CLOSED:
+            if self._state is _HALF_OPEN:
+                transition = self._transition_to(_OPEN)
+            elif self._state is _CLOSED:
                 if self._failure_count >= self._failure_threshold:
-                    self._transition_to(CircuitState.OPEN)
+                    transition = self._transition_to(_OPEN)
 
-            self._audit.log_event(
-                "circuit_breaker_failure",
-                details={
-                    "breaker": self.name,
-                    "state": self._state.value,
-                    "failure_count": self._failure_count,
-                    "error": str(exc),
-                },
-                severity="warning",
-                source="resilience",
-            )
+            details = {
+                "breaker": self.name,
+                "state": self._state.value,
+                "failure_count": self._failure_count,
+                "error": str(exc),
+            }
 
-    def _check_state_transition(self) -> None:
-        if self._state == CircuitState.OPEN:
-            if time.time() - self._last_failure_time >= self._recovery_timeout:
-                self._transition_to(CircuitState.HALF_OPEN)
+        if transition:
+            self._log_transition(transition)
+        self._audit.log_event(
+            "circuit_breaker_failure",
+            details=details,
+            severity="warning",
+            source="resilience",
+        )
+
+    def _check_state_transition(self) -> Optional[dict[str, Any]]:
+        """Move OPEN → HALF_OPEN once recovery is due. Caller holds the lock."""
+        if self._state is _OPEN:
+            if time.monotonic() - self._last_failure_time >= self._recovery_timeout:
+                return self._transition_to(_HALF_OPEN)
+        return None
 
-    def _transition_to(self, new_state: CircuitState) -> None:
+    def _transition_to(self, new_state: CircuitState) -> dict[str, Any]:
+        """
+        Switch state under the held lock and return the audit details;
+        the caller logs them once the lock is released.
+        """
         old_state = self._state
         self._state = new_state
 
-        if new_state == CircuitState.CLOSED:
+        if new_state is _CLOSED:
             self._failure_count = 0
             self._success_count = 0
             self._half_open_calls = 0
-        elif new_state == CircuitState.HALF_OPEN:
+        elif new_state is _HALF_OPEN:
             self._half_open_calls = 0
             self._success_count = 0
 
+        return {
+            "breaker": self.name,
+            "from_state": old_state.value,
+            "to_state": new_state.value,
+            "failure_count": self._failure_count,
+        }
+
+    def _log_transition(self, details: dict[str, Any]) -> None:
         self._audit.log_event(
             "circuit_breaker_transition",
-            details={
-                "breaker": self.name,
-                "from_state": old_state.value,
-                "to_state": new_state.value,
-                "failure_count": self._failure_count,
-            },
+            details=details,
             severity="info",
             source="resilience",
         )
 
     def _time_until_recovery(self) -> float:
-        elapsed = time.time() - self._last_failure_time
+        elapsed = time.monotonic() - self._last_failure_time
         return max(0, self._recovery_timeout - elapsed)
 
     def reset(self) -> None:
         """Manually reset the circuit breaker."""
         with self._lock:
-            self._transition_to(CircuitState.CLOSED)
+            transition = self._transition_to(_CLOSED)
+        self._log_transition(transition)
 
     def get_status(self) -> dict[str, Any]:
         with self._lock:
-            self._check_state_transition()
-            return {
+            transition = self._check_state_transition()
+            status = {
                 "name": self.name,
                 "state": self._state.value,
                 "failure_count": self._failure_count,
                 "failure_threshold": self._failure_threshold,
                 "recovery_timeout": self._recovery_timeout,
-                "time_until_recovery": self._time_until_recovery() if self._state == CircuitState.OPEN else 0,
+                "time_until_recovery": self._time_until_recovery() if self._state is _OPEN else 0,
             }
+        if transition:
+            self._log_transition(transition)
+        return status
 
 
 # ── Registry of circuit breakers per service ────────────────────
@@ -204,14 +284,19 @@ def get_circuit_breaker(
     half_open_max_calls: Optional[int] = None,
 ) -> CircuitBreaker:
     """Get or create a named circuit breaker."""
+    # Breakers are never removed, so a hit needs no lock
+    cb = _breakers.get(name)
+    if cb is not None:
+        return cb
     with _breakers_lock:
-        if name not in _breakers:
+        cb = _breakers.get(name)
+        if cb is None:
             from config.settings import get_settings
             settings = get_settings()
-            _breakers[name] = CircuitBreaker(
+            cb = _breakers[name] = CircuitBreaker(
                 name=name,
                 failure_threshold=failure_threshold or settings.circuit_breaker_failure_threshold,
                 recovery_timeout=recovery_timeout or settings.circuit_breaker_recovery_timeout,
                 half_open_max_calls=half_open_max_calls or settings.circuit_breaker_half_open_max_calls,
             )
-        return _breakers[name]
+        return cb
@@ -0,0 +1,102 @@
+"""
+Adaptive concurrency limiter with fast load shedding.
+
+Bounds the number of in-flight executions of an expensive operation
+(e.g. a full agent run) and rejects new work immediately once the
+limit is reached, instead of letting requests pile up on the event loop.
+
+The limit adapts with AIMD (additive increase, multiplicative decrease)
+against a latency SLO:
+  - p99 over the last window above the SLO → limit *= decrease_factor
+  - p99 within the SLO                     → limit += 1 (up to max_limit)
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Any
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    In-flight request cap for a single asyncio event loop.
+
+    Not thread-safe by design: acquire/release are expected to run on
+    the event loop thread, where no preemption can occur between them.
+
+    Usage:
+        limiter = AdaptiveConcurrencyLimiter("execute", max_limit=32, latency_slo_ms=30_000)
+        if not limiter.try_acquire():
+            raise HTTPException(status_code=503, detail="Server overloaded")
+        start = time.perf_counter()
+        try:
+            ...
+        finally:
+            limiter.release((time.perf_counter() - start) * 1000)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        latency_slo_ms: float,
+        min_limit: int = 1,
+        window: int = 100,
+        decrease_factor: float = 0.8,
+    ):
+        self.name = name
+        self._max_limit = max_limit
+        self._min_limit = min(min_limit, max_limit)
+        self._latency_slo_ms = latency_slo_ms
+        self._window = window
+        self._decrease_factor = decrease_factor
+
+        self._limit = max_limit
+        self._in_flight = 0
+        self._shed_count = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._samples_since_adjust = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot; returns False (and counts a shed) when saturated."""
+        if self._in_flight >= self._limit:
+            self._shed_count += 1
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self, elapsed_ms: float) -> None:
+        """Free a slot and feed the observed latency into the AIMD loop."""
+        self._in_flight -= 1
+        self._latencies.append(elapsed_ms)
+        self._samples_since_adjust += 1
+        if self._samples_since_adjust >= self._window:
+            self._samples_since_adjust = 0
+            self._adjust()
+
+    def _adjust(self) -> None:
+        n = len(self._latencies)
+        p99 = heapq.nlargest(n - min(int(n * 0.99), n - 1), self._latencies)[-1]
+        if p99 > self._latency_slo_ms:
+            self._limit = max(self._min_limit, int(self._limit * self._decrease_factor))
+        else:
+            self._limit = min(self._max_limit, self._limit + 1)
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "limit": self._limit,
+            "max_limit": self._max_limit,
+            "in_flight": self._in_flight,
+            "shed_count": self._shed_count,
+            "latency_slo_ms": self._latency_slo_ms,
+        }
@@ -17,7 +17,7 @@ from typing import Any, Callable, Optional, Sequence, Type
 logger = logging.getLogger("platform.resilience.retry")
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryConfig:
     """Configuration for retry behavior."""
     max_attempts: int = 3
@@ -52,37 +52,48 @@ def retry_with_backoff(
             retryable_exceptions=retryable_exceptions or (Exception,),
         )
 
+    # The backoff schedule only depends on the config, so compute it once;
+    # jitter is still drawn per attempt
+    delays = tuple(
+        min(config.base_delay * config.exponential_base ** i, config.max_delay)
+        for i in range(max(config.max_attempts - 1, 0))
+    )
+    attempts = config.max_attempts
+    retryable = config.retryable_exceptions
+    jitter = config.jitter
+
     def decorator(func: Callable) -> Callable:
+        name = func.__name__
+        # Own generator per decorated function instead of the shared module one
+        uniform = random.Random().random
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             last_exception: Optional[Exception] = None
 
-            for attempt in range(1, config.max_attempts + 1):
+            for attempt in range(1, attempts + 1):
                 try:
                     return func(*args, **kwargs)
-                except config.retryable_exceptions as exc:
+                except retryable as exc:
                     last_exception = exc
-                    if attempt == config.max_attempts:
+                    if attempt == attempts:
                         logger.error(
                             "All %d retry attempts exhausted for %s: %s",
-                            config.max_attempts,
-                            func.__name__,
+                            attempts,
+                            name,
                             exc,
                         )
                         raise
 
-                    delay = min(
-                        config.base_delay * (config.exponential_base ** (attempt - 1)),
-                        config.max_delay,
-                    )
-                    if config.jitter:
-                        delay = delay * (0.5 + random.random())
+                    delay = delays[attempt - 1]
+                    if jitter:
+                        delay *= 0.5 + uniform()
 
                     logger.warning(
                         "Retry %d/%d for %s after %.1fs: %s",
                         attempt,
-                        config.max_attempts,
-                        func.__name__,
+                        attempts,
+                        name,
                         delay,
                         exc,
                     )
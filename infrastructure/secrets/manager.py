@@ -16,17 +16,21 @@ from __future__ import annotations
 import logging
 import os
 import threading
-import time
 from abc import ABC, abstractmethod
 from functools import lru_cache
 from typing import Any, Optional
 
+from infrastructure.audit.logger import get_audit_logger
+from infrastructure.cache import TTLCache
+
 logger = logging.getLogger("platform.secrets")
 
 
 class SecretsBackend(ABC):
     """Abstract interface for secrets backends."""
 
+    __slots__ = ()
+
     @abstractmethod
     def get_secret(self, key: str) -> Optional[str]:
         ...
@@ -43,36 +47,66 @@ class SecretsBackend(ABC):
     def list_secrets(self, prefix: str = "") -> list[str]:
         ...
 
+    def load_all(self) -> dict[str, str]:
+        """
+        Bulk-fetch every secret under the backend's prefix.
+
+        Backends where one call can return many values override this;
+        the default returns nothing and secrets are fetched per key.
+        """
+        return {}
+
+
+_ENV_KEY_TABLE = str.maketrans("/-", "__")
+
+
+@lru_cache(maxsize=256)
+def _normalize_env_key(prefix: str, key: str) -> str:
+    """Map a secret key to its env var name (``llm/api-key`` → ``LLM_API_KEY``)."""
+    normalized = key.strip("/").translate(_ENV_KEY_TABLE).upper()
+    if prefix:
+        return f"{prefix}_{normalized}"
+    return normalized
+
 
 class EnvSecretsBackend(SecretsBackend):
     """Read secrets from environment variables."""
 
+    __slots__ = ("_prefix", "_listings")
+
     def __init__(self, prefix: str = ""):
         self._prefix = prefix.strip("/").replace("/", "_").upper()
+        # env prefix → matching names; the environment is effectively fixed
+        # after startup, so only our own writes invalidate it
+        self._listings: dict[str, list[str]] = {}
 
     def _env_key(self, key: str) -> str:
-        normalized = key.strip("/").replace("/", "_").replace("-", "_").upper()
-        if self._prefix:
-            return f"{self._prefix}_{normalized}"
-        return normalized
+        return _normalize_env_key(self._prefix, key)
 
     def get_secret(self, key: str) -> Optional[str]:
         return os.environ.get(self._env_key(key))
 
     def set_secret(self, key: str, value: str) -> None:
         os.environ[self._env_key(key)] = value
+        self._listings.clear()
 
     def delete_secret(self, key: str) -> None:
         os.environ.pop(self._env_key(key), None)
+        self._listings.clear()
 
     def list_secrets(self, prefix: str = "") -> list[str]:
         env_prefix = self._env_key(prefix) if prefix else (self._prefix + "_" if self._prefix else "")
-        return [k for k in os.environ if k.startswith(env_prefix)]
+        names = self._listings.get(env_prefix)
+        if names is None:
+            names = self._listings[env_prefix] = [k for k in os.environ if k.startswith(env_prefix)]
+        return list(names)
 
 
 class AWSSSMBackend(SecretsBackend):
     """AWS Systems Manager Parameter Store backend."""
 
+    __slots__ = ("_prefix", "_client")
+
     def __init__(self, prefix: str = "/doctor-appointment/"):
         self._prefix = prefix
         try:
@@ -98,6 +132,24 @@ class AWSSSMBackend(SecretsBackend):
             logger.debug("SSM get_parameter failed for %s: %s", key, exc)
             return None
 
+    def load_all(self) -> dict[str, str]:
+        if not self._client:
+            return {}
+        try:
+            paginator = self._client.get_paginator("get_parameters_by_path")
+            secrets: dict[str, str] = {}
+            for page in paginator.paginate(
+                Path=self._prefix.rstrip("/") or "/",
+                Recursive=True,
+                WithDecryption=True,
+            ):
+                for param in page.get("Parameters", []):
+                    secrets[param["Name"].removeprefix(self._prefix)] = param["Value"]
+            return secrets
+        except Exception as exc:
+            logger.warning("SSM get_parameters_by_path failed, fetching per key: %s", exc)
+            return {}
+
     def set_secret(self, key: str, value: str) -> None:
         if not self._client:
             return
@@ -141,79 +193,113 @@ class SecretsManager:
       - In-memory TTL cache
       - Access audit logging (without logging values)
       - Thread safety
+
+    Misses take one of a fixed set of striped locks, so concurrent misses
+    on the same key hit the backend once while unrelated keys proceed in
+    parallel.
     """
 
+    __slots__ = ("_backend", "_cache_ttl", "_cache", "_locks")
+
+    _LOCK_STRIPES = 16
+
     def __init__(
         self,
         backend: SecretsBackend,
         cache_ttl: int = 300,
+        cache_maxsize: int = 1024,
     ):
         self._backend = backend
         self._cache_ttl = cache_ttl
-        self._cache: dict[str, tuple[str, float]] = {}
-        self._lock = threading.Lock()
+        # Bounded so per-tenant key names cannot grow the cache forever
+        self._cache = TTLCache(maxsize=cache_maxsize, ttl_seconds=cache_ttl)
+        self._locks = tuple(threading.Lock() for _ in range(self._LOCK_STRIPES))
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % self._LOCK_STRIPES]
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get a secret value with caching."""
-        with self._lock:
-            # Check cache
-            if key in self._cache:
-                value, cached_at = self._cache[key]
-                if time.time() - cached_at < self._cache_ttl:
-                    return value
-                else:
-                    del self._cache[key]
+        value = self._cache.get(key)
+        if value is not None:
+            return value
 
-        value = self._backend.get_secret(key)
+        with self._lock_for(key):
+            # Another thread may have filled it while we waited
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+            value = self._backend.get_secret(key)
+            if value is not None:
+                self._cache.set(key, value)
 
         if value is not None:
-            with self._lock:
-                self._cache[key] = (value, time.time())
             logger.debug("Secret '%s' retrieved successfully", key)
         else:
             logger.debug("Secret '%s' not found, using default", key)
             value = default
 
-        # Audit access (never log the value)
-        try:
-            from infrastructure.audit.logger import get_audit_logger
-            get_audit_logger().log_security_event(
-                action="secret_access",
-                outcome="found" if value is not None else "not_found",
-                details={"key": key},
-            )
-        except Exception:
-            pass
+        # Audit access (never log the value); the audit logger only queues
+        get_audit_logger().log_security_event(
+            action="secret_access",
+            outcome="found" if value is not None else "not_found",
+            details={"key": key},
+        )
 
         return value
 
+    def prime(self) -> int:
+        """
+        Seed the cache from one bulk backend read (e.g. SSM by path), so
+        startup lookups hit memory instead of one round-trip per key.
+        Returns the number of secrets cached.
+        """
+        secrets = self._backend.load_all()
+        for key, value in secrets.items():
+            self._cache.set(key, value)
+        if secrets:
+            logger.info("Primed secrets cache with %d entries", len(secrets))
+        return len(secrets)
+
     def set(self, key: str, value: str) -> None:
         """Set a secret value."""
         self._backend.set_secret(key, value)
-        with self._lock:
-            self._cache[key] = (value, time.time())
+        with self._lock_for(key):
+            self._cache.set(key, value)
         logger.info("Secret '%s' updated", key)
 
     def delete(self, key: str) -> None:
         """Delete a secret."""
         self._backend.delete_secret(key)
-        with self._lock:
-            self._cache.pop(key, None)
+        with self._lock_for(key):
+            self._cache.pop(key)
 
     def list_keys(self, prefix: str = "") -> list[str]:
         return self._backend.list_secrets(prefix)
 
     def invalidate_cache(self, key: Optional[str] = None) -> None:
         """Invalidate cache for a key or all keys."""
-        with self._lock:
-            if key:
-                self._cache.pop(key, None)
-            else:
-                self._cache.clear()
+        if key:
+            with self._lock_for(key):
+                self._cache.pop(key)
+        else:
+            self._cache.clear()
+
+
+_secrets_manager: Optional[SecretsManager] = None
+_secrets_manager_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_secrets_manager() -> SecretsManager:
+    global _secrets_manager
+    if _secrets_manager is None:
+        with _secrets_manager_lock:
+            if _secrets_manager is None:
+                _secrets_manager = _build_secrets_manager()
+    return _secrets_manager
+
+
+def _build_secrets_manager() -> SecretsManager:
     from config.settings import get_settings
     settings = get_settings()
 
@@ -224,4 +310,6 @@ def get_secrets_manager() -> SecretsManager:
 
     factory = backend_map.get(settings.secrets_backend, backend_map["env"])
     backend = factory()
-    return SecretsManager(backend=backend)
+    manager = SecretsManager(backend=backend)
+    manager.prime()
+    return manager
@@ -1,8 +1,9 @@
-from infrastructure.tracing.langsmith_tracer import PlatformTracer, get_tracer
+from infrastructure.tracing.langsmith_tracer import PlatformTracer, configure_tracing, get_tracer
 from infrastructure.tracing.spans import traced_agent, traced_tool, traced_node
 
 __all__ = [
     "PlatformTracer",
+    "configure_tracing",
     "get_tracer",
     "traced_agent",
     "traced_tool",
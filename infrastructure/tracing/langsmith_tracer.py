@@ -3,7 +3,7 @@ LangSmith-backed distributed tracing layer.
 
 Provides:
   - Automatic environment propagation to LangSmith
-  - Configurable sampling rate
+  - Configurable per-request sampling rate
   - Run-tree parent/child correlation for multi-agent flows
   - Custom metadata injection (tenant, user, session, environment)
 """
@@ -13,9 +13,9 @@ from __future__ import annotations
 import logging
 import os
 import random
-import uuid
+import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime, timezone
 from functools import lru_cache
 from typing import Any, Generator, Optional, TYPE_CHECKING
 
@@ -29,16 +29,64 @@ from infrastructure.audit.logger import AuditLogger, get_audit_logger
 _logger = logging.getLogger(__name__)
 
 
-def _get_langsmith_client(api_key: str, api_url: str) -> Any:
+def _get_langsmith_client(api_key: str, api_url: str, **kwargs: Any) -> Any:
     """Lazy-import LangSmith client to avoid import-time side effects."""
     try:
         from langsmith.client import Client
-        return Client(api_key=api_key, api_url=api_url)
+        return Client(api_key=api_key, api_url=api_url, **kwargs)
     except Exception as exc:
         _logger.warning("LangSmith client unavailable: %s", exc)
         return None
 
 
+_env_configured = False
+
+
+def configure_tracing(settings: Optional[Settings] = None) -> None:
+    """
+    Export the LangChain tracing env vars so LangChain auto-instruments.
+
+    Call once at process start (API lifespan, CLI entry points) before any
+    worker threads; later calls are no-ops. Constructing a PlatformTracer
+    never touches os.environ.
+    """
+    global _env_configured
+    if _env_configured:
+        return
+    _env_configured = True
+    ls = (settings or get_settings()).langsmith
+    if not (ls.api_key and ls.tracing_v2):
+        return
+    os.environ["LANGCHAIN_TRACING_V2"] = "true"
+    os.environ["LANGCHAIN_API_KEY"] = ls.api_key
+    os.environ["LANGCHAIN_PROJECT"] = ls.project
+    os.environ["LANGCHAIN_ENDPOINT"] = ls.endpoint
+    # Hand run submission to LangChain's background thread
+    os.environ["LANGCHAIN_CALLBACKS_BACKGROUND"] = "true" if ls.callbacks_background else "false"
+
+
+_SESSION_ID_BATCH = 64
+_session_ids: list[str] = []
+_session_ids_lock = threading.Lock()
+
+
+def _new_session_id() -> str:
+    """
+    Random 128-bit hex id for spans without a session.
+
+    Ids are cut from one os.urandom read per batch rather than one
+    uuid4() (and one urandom syscall) per span.
+    """
+    try:
+        return _session_ids.pop()
+    except IndexError:
+        pass
+    with _session_ids_lock:
+        raw = os.urandom(16 * _SESSION_ID_BATCH).hex()
+        _session_ids.extend(raw[i:i + 32] for i in range(32, len(raw), 32))
+        return raw[:32]
+
+
 def _create_run_tree(**kwargs: Any) -> Any:
     """Lazy-import RunTree."""
     try:
@@ -49,27 +97,44 @@ def _create_run_tree(**kwargs: Any) -> Any:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _tenant_tags(environment: str, tenant_id: str) -> tuple[str, ...]:
+    """Run tags for a tenant; fixed per tenant, so built once."""
+    return (
+        f"env:{environment}",
+        f"tenant:{tenant_id}" if tenant_id else "tenant:unknown",
+    )
+
+
 class PlatformTracer:
     """Central tracing coordinator backed by LangSmith."""
 
+    __slots__ = (
+        "_settings", "_enabled", "_sample_rate", "_sample_threshold",
+        "_project", "_client", "_audit",
+    )
+
     def __init__(self, settings: Optional[Settings] = None):
         self._settings = settings or get_settings()
         ls = self._settings.langsmith
         self._enabled = bool(ls.api_key) and ls.tracing_v2
         self._sample_rate = ls.tracing_sample_rate
+        # Sampling draws 32 random bits and compares against this threshold
+        self._sample_threshold = int(min(max(self._sample_rate, 0.0), 1.0) * (1 << 32))
         self._project = ls.project
         self._client: Any = None
         self._audit: AuditLogger = get_audit_logger()
 
         if self._enabled:
-            # Push env vars so LangChain auto-instruments
-            os.environ["LANGCHAIN_TRACING_V2"] = "true"
-            os.environ["LANGCHAIN_API_KEY"] = ls.api_key
-            os.environ["LANGCHAIN_PROJECT"] = ls.project
-            os.environ["LANGCHAIN_ENDPOINT"] = ls.endpoint
+            # Batched export: runs are enqueued and shipped by the client's
+            # background tracing thread rather than one request per span
+            client_kwargs: dict[str, Any] = {"auto_batch_tracing": True}
+            if ls.batch_size_bytes:
+                client_kwargs["max_batch_size_bytes"] = ls.batch_size_bytes
             self._client = _get_langsmith_client(
                 api_key=ls.api_key,
                 api_url=ls.endpoint,
+                **client_kwargs,
             )
 
     # ── Properties ───────────────────────────────────────────────
@@ -82,12 +147,43 @@ class PlatformTracer:
     def client(self) -> Any:
         return self._client
 
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until queued runs are exported (call on shutdown)."""
+        if self._client is None:
+            return
+        if timeout is None:
+            timeout = self._settings.langsmith.flush_timeout
+        try:
+            self._client.flush(timeout=timeout)
+        except Exception as exc:
+            _logger.warning("LangSmith flush failed: %s", exc)
+
     # ── Sampling ─────────────────────────────────────────────────
 
     def should_sample(self) -> bool:
         if not self._enabled:
             return False
-        return random.random() < self._sample_rate
+        return random.getrandbits(32) < self._sample_threshold
+
+    @contextmanager
+    def sampled_run(self) -> Generator[bool, None, None]:
+        """
+        Per-request sampling for LangChain auto-instrumentation.
+
+        With LANGCHAIN_TRACING_V2 set, every graph run is traced. Runs that
+        lose the sampling draw execute inside a disabled tracing context, so
+        no tracer callbacks are attached and nothing is serialized or shipped.
+        Yields whether the run is traced.
+        """
+        if not self._enabled or self._sample_rate >= 1.0:
+            yield self._enabled
+            return
+        if random.getrandbits(32) < self._sample_threshold:
+            yield True
+            return
+        from langsmith.run_helpers import tracing_context
+        with tracing_context(enabled=False):
+            yield False
 
     # ── Trace context ────────────────────────────────────────────
 
@@ -117,7 +213,7 @@ class PlatformTracer:
             "platform_version": "1.0.0",
             "tenant_id": tenant_id,
             "user_id": user_id,
-            "session_id": session_id or str(uuid.uuid4()),
+            "session_id": session_id or _new_session_id(),
             **(metadata or {}),
         }
 
@@ -128,13 +224,14 @@ class PlatformTracer:
             extra={"metadata": enriched_metadata},
             inputs=inputs or {},
             parent_run=parent_run,
+            client=self._client,
         )
 
         if run_tree is None:
             yield None
             return
 
-        start_time = datetime.now(timezone.utc)
+        start_ns = time.perf_counter_ns()
         error_info: Optional[str] = None
         try:
             run_tree.post()
@@ -148,7 +245,7 @@ class PlatformTracer:
             run_tree.end()
             run_tree.patch()
         finally:
-            elapsed_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
             self._audit.log_event(
                 event_type="trace_span",
                 details={
@@ -175,23 +272,29 @@ class PlatformTracer:
         Return a LangChain/LangGraph `config` dict with tracing
         callbacks, metadata, and tags pre-configured.
         """
-        cfg: dict[str, Any] = {
+        env = self._settings.environment.value
+        return {
             "recursion_limit": self._settings.recursion_limit,
             "metadata": {
-                "environment": self._settings.environment.value,
+                "environment": env,
                 "tenant_id": tenant_id,
                 "user_id": user_id,
                 "session_id": session_id,
             },
-            "tags": [
-                f"env:{self._settings.environment.value}",
-                f"tenant:{tenant_id}" if tenant_id else "tenant:unknown",
-            ],
+            # Fresh list per call: LangChain may extend the tags it is given
+            "tags": list(_tenant_tags(env, tenant_id)),
             "run_name": run_name,
         }
-        return cfg
 
 
-@lru_cache(maxsize=1)
+_tracer: Optional[PlatformTracer] = None
+_tracer_lock = threading.Lock()
+
+
 def get_tracer() -> PlatformTracer:
-    return PlatformTracer()
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = PlatformTracer()
+    return _tracer
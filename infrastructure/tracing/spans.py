@@ -1,6 +1,11 @@
 """
 Decorator-based span helpers for agent, tool and node tracing.
 
+The tracer and metrics collector are resolved once, when the decorator
+is applied, not on every call. With tracing disabled the wrappers skip
+the span context manager and its metadata entirely and only record
+metrics.
+
 Usage:
     @traced_agent("supervisor")
     def supervisor_node(state):
@@ -24,30 +29,48 @@ from infrastructure.metrics.collector import get_metrics_collector
 def traced_agent(name: str, *, metadata: Optional[dict[str, Any]] = None):
     """Decorator: wraps an agent node function with a LangSmith trace span."""
     def decorator(func: Callable) -> Callable:
+        tracer = get_tracer()
+        collector = get_metrics_collector()
+
+        if not tracer.enabled:
+            @functools.wraps(func)
+            def untraced(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                success = False
+                try:
+                    result = func(*args, **kwargs)
+                    success = True
+                    return result
+                finally:
+                    collector.record_agent_execution(
+                        agent_name=name,
+                        duration_seconds=time.perf_counter() - start,
+                        success=success,
+                    )
+            return untraced
+
+        span_metadata = {"agent_name": name, **(metadata or {})}
+        span_name = f"agent:{name}"
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tracer = get_tracer()
-            collector = get_metrics_collector()
             start = time.perf_counter()
-            error_occurred = False
+            success = False
             try:
                 with tracer.trace(
-                    name=f"agent:{name}",
+                    name=span_name,
                     run_type="chain",
-                    metadata={"agent_name": name, **(metadata or {})},
-                    inputs={"args_count": len(args), "kwargs_keys": list(kwargs.keys())},
+                    metadata=span_metadata,
+                    inputs={"args_count": len(args), "kwargs_keys": list(kwargs)},
                 ):
                     result = func(*args, **kwargs)
+                success = True
                 return result
-            except Exception:
-                error_occurred = True
-                raise
             finally:
-                elapsed = time.perf_counter() - start
                 collector.record_agent_execution(
                     agent_name=name,
-                    duration_seconds=elapsed,
-                    success=not error_occurred,
+                    duration_seconds=time.perf_counter() - start,
+                    success=success,
                 )
         return wrapper
     return decorator
@@ -56,29 +79,47 @@ def traced_agent(name: str, *, metadata: Optional[dict[str, Any]] = None):
 def traced_tool(name: str, *, metadata: Optional[dict[str, Any]] = None):
     """Decorator: wraps a tool function with a LangSmith trace span + metrics."""
     def decorator(func: Callable) -> Callable:
+        tracer = get_tracer()
+        collector = get_metrics_collector()
+
+        if not tracer.enabled:
+            @functools.wraps(func)
+            def untraced(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                success = False
+                try:
+                    result = func(*args, **kwargs)
+                    success = True
+                    return result
+                finally:
+                    collector.record_tool_execution(
+                        tool_name=name,
+                        duration_seconds=time.perf_counter() - start,
+                        success=success,
+                    )
+            return untraced
+
+        span_metadata = {"tool_name": name, **(metadata or {})}
+        span_name = f"tool:{name}"
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tracer = get_tracer()
-            collector = get_metrics_collector()
             start = time.perf_counter()
-            error_occurred = False
+            success = False
             try:
                 with tracer.trace(
-                    name=f"tool:{name}",
+                    name=span_name,
                     run_type="tool",
-                    metadata={"tool_name": name, **(metadata or {})},
+                    metadata=span_metadata,
                 ):
                     result = func(*args, **kwargs)
+                success = True
                 return result
-            except Exception:
-                error_occurred = True
-                raise
             finally:
-                elapsed = time.perf_counter() - start
                 collector.record_tool_execution(
                     tool_name=name,
-                    duration_seconds=elapsed,
-                    success=not error_occurred,
+                    duration_seconds=time.perf_counter() - start,
+                    success=success,
                 )
         return wrapper
     return decorator
@@ -87,21 +128,17 @@ def traced_tool(name: str, *, metadata: Optional[dict[str, Any]] = None):
 def traced_node(name: str, *, node_type: str = "node", metadata: Optional[dict[str, Any]] = None):
     """Decorator: generic node-level trace span."""
     def decorator(func: Callable) -> Callable:
+        tracer = get_tracer()
+        if not tracer.enabled:
+            # Nothing to record without a span; duration lives in the parent
+            return func
+
+        span_metadata = {"node_name": name, "node_type": node_type, **(metadata or {})}
+        span_name = f"{node_type}:{name}"
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tracer = get_tracer()
-            start = time.perf_counter()
-            try:
-                with tracer.trace(
-                    name=f"{node_type}:{name}",
-                    run_type="chain",
-                    metadata={"node_name": name, "node_type": node_type, **(metadata or {})},
-                ):
-                    result = func(*args, **kwargs)
-                return result
-            except Exception:
-                raise
-            finally:
-                pass  # duration captured in parent trace
+            with tracer.trace(name=span_name, run_type="chain", metadata=span_metadata):
+                return func(*args, **kwargs)
         return wrapper
     return decorator
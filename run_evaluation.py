@@ -5,21 +5,22 @@ Usage:
     python run_evaluation.py                               # default benchmark
     python run_evaluation.py --benchmark routing_tests     # specific benchmark
     python run_evaluation.py --check-only                  # regression check only
+    python run_evaluation.py --offline-batch               # routing only, via the Batch API
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 
+import orjson
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from config.settings import get_settings
-from infrastructure.evaluation.harness import get_evaluation_harness
-from infrastructure.evaluation.regression import get_regression_checker
+# Settings, the evaluation stack and tracing are imported where they are
+# used, so `--help` and argument errors return without loading them
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,32 +28,39 @@ logger = get_logger(__name__)
 
 def run_evaluation(benchmark_name: str = "default") -> dict:
     """Run evaluation suite and return results."""
-    from appointment_agent import DoctorAppointmentAgent
+    import asyncio
+
+    from appointment_agent import get_agent
+    from config.settings import get_settings
+    from infrastructure.evaluation.harness import get_evaluation_harness
     from langchain_core.messages import HumanMessage
 
     settings = get_settings()
-    agent = DoctorAppointmentAgent()
-    graph = agent.workflow()
+    graph = get_agent().app
 
-    def invoke_fn(query: str, patient_id: int) -> dict:
+    async def ainvoke_fn(query: str, patient_id: int) -> dict:
         query_data = {
             "messages": [HumanMessage(content=query)],
             "id_number": patient_id,
             "next": "",
             "query": "",
             "current_reasoning": "",
+            # Score the model's routing, not previously cached routes
+            "route_cache_bypass": True,
         }
-        result = graph.invoke(query_data, config={"recursion_limit": settings.recursion_limit})
+        result = await graph.ainvoke(query_data, config={"recursion_limit": settings.recursion_limit})
         messages = result.get("messages", [])
         return {
             "response": messages[-1].content if messages else "",
             "route": result.get("next", ""),
+            "tools_used": result.get("tools_used", []),
         }
 
     harness = get_evaluation_harness()
 
     logger.info("Running evaluation: %s", benchmark_name)
-    suite_result = harness.run_evaluation(invoke_fn, benchmark_name)
+    # One event loop for the whole suite; cases are gathered concurrently
+    suite_result = asyncio.run(harness.arun_evaluation(ainvoke_fn, benchmark_name))
 
     logger.info(
         "Evaluation complete: %d/%d passed (%.1f%%)",
@@ -66,6 +74,9 @@ def run_evaluation(benchmark_name: str = "default") -> dict:
 
 def run_regression_check(benchmark_name: str = "default") -> dict:
     """Run regression check against previous results."""
+    from infrastructure.evaluation.harness import get_evaluation_harness
+    from infrastructure.evaluation.regression import get_regression_checker
+
     harness = get_evaluation_harness()
     checker = get_regression_checker()
 
@@ -96,23 +107,44 @@ def main():
     parser.add_argument("--benchmark", default="default", help="Benchmark dataset name")
     parser.add_argument("--check-only", action="store_true", help="Only run regression check")
     parser.add_argument("--output", default=None, help="Output JSON file path")
+    parser.add_argument(
+        "--offline-batch", action="store_true",
+        help="Evaluate first-turn routing through the OpenAI Batch API (requires EVAL_BATCH_ENABLED)",
+    )
     args = parser.parse_args()
 
-    if args.check_only:
+    from infrastructure.tracing.langsmith_tracer import configure_tracing
+    configure_tracing()
+
+    if args.offline_batch:
+        # Batch results live under their own name, apart from live runs
+        results_name = f"{args.benchmark}.routing-batch"
+        if args.check_only:
+            result = run_regression_check(results_name)
+        else:
+            from infrastructure.evaluation.batch import run_routing_batch
+            from infrastructure.evaluation.harness import get_evaluation_harness
+            result = run_routing_batch(get_evaluation_harness(), args.benchmark).to_dict()
+            result["regression"] = run_regression_check(results_name)
+    elif args.check_only:
         result = run_regression_check(args.benchmark)
     else:
         result = run_evaluation(args.benchmark)
         regression = run_regression_check(args.benchmark)
         result["regression"] = regression
 
-    output_json = json.dumps(result, indent=2)
+    output_json = orjson.dumps(
+        result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+    )
 
     if args.output:
-        with open(args.output, "w") as f:
+        with open(args.output, "wb") as f:
             f.write(output_json)
         logger.info("Results written to %s", args.output)
     else:
-        print(output_json)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output_json)
+        sys.stdout.flush()
 
     # Exit with non-zero if regressions
     if "regression" in result:
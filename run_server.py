@@ -14,25 +14,57 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from config.settings import get_settings
+from config.settings import Environment, get_settings
+from utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-def main():
-    settings = get_settings()
+# Environments where utils.logger emits JSON lines
+_STRUCTURED_LOG_ENVIRONMENTS = (Environment.PRODUCTION, Environment.STAGING)
 
-    print(f"""
+_BANNER = """
 ╔══════════════════════════════════════════════════════════════╗
 ║       Doctor Appointment Orchestration Platform          ║
 ╠══════════════════════════════════════════════════════════════╣
-║  Environment:  {settings.environment.value:<45}║
-║  Host:         {settings.api_host:<45}║
-║  Port:         {str(settings.api_port):<45}║
-║  Workers:      {str(settings.api_workers):<45}║
-║  Debug:        {str(settings.debug):<45}║
-║  Tracing:      {str(settings.langsmith.tracing_v2):<45}║
-║  Log Level:    {settings.log_level:<45}║
+║  Environment:  {environment:<45}║
+║  Host:         {host:<45}║
+║  Port:         {port:<45}║
+║  Workers:      {workers:<45}║
+║  Event loop:   {loop:<45}║
+║  Debug:        {debug:<45}║
+║  Tracing:      {tracing:<45}║
+║  Log Level:    {log_level:<45}║
 ╚══════════════════════════════════════════════════════════════╝
-    """)
+    """
+
+
+def main():
+    settings = get_settings()
+
+    if settings.environment in _STRUCTURED_LOG_ENVIRONMENTS:
+        # Stdout is a JSON log stream here; a box-drawn banner would break parsers
+        logger.info(
+            "Server starting | env=%s host=%s port=%d workers=%d loop=%s http=%s debug=%s tracing=%s",
+            settings.environment.value,
+            settings.api_host,
+            settings.api_port,
+            settings.api_workers,
+            settings.api_loop,
+            settings.api_http,
+            settings.debug,
+            settings.langsmith.tracing_v2,
+        )
+    else:
+        print(_BANNER.format(
+            environment=settings.environment.value,
+            host=settings.api_host,
+            port=str(settings.api_port),
+            workers=str(settings.api_workers),
+            loop=f"{settings.api_loop} / {settings.api_http}",
+            debug=str(settings.debug),
+            tracing=str(settings.langsmith.tracing_v2),
+            log_level=settings.log_level,
+        ))
 
     uvicorn.run(
         "api:app",
@@ -40,6 +72,8 @@ def main():
         port=settings.api_port,
         workers=settings.api_workers if not settings.debug else 1,
         reload=settings.debug,
+        loop=settings.api_loop,
+        http=settings.api_http,
         log_level=settings.log_level.lower(),
     )
 
@@ -13,7 +13,7 @@ from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
 from infrastructure.memory.manager import get_memory_manager, MemoryCategory
-from infrastructure.memory.context import build_memory_context
+from infrastructure.memory.context import abuild_memory_context
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -47,7 +47,7 @@ class StoreMemoryInput(BaseModel):
 # ── Tools ────────────────────────────────────────────────────────
 
 @tool
-def recall_patient_memories(user_id: str, query: str = "") -> str:
+async def recall_patient_memories(user_id: str, query: str = "") -> str:
     """
     Recall what is known about a patient from previous interactions.
 
@@ -55,7 +55,7 @@ def recall_patient_memories(user_id: str, query: str = "") -> str:
     about a patient's preferences, history, or medical context.
     Returns structured memory organized by category.
     """
-    ctx = build_memory_context(user_id=user_id, query=query)
+    ctx = await abuild_memory_context(user_id=user_id, query=query)
 
     if not ctx.has_memories:
         return f"No previous memories found for patient {user_id}. This appears to be a new patient."
@@ -80,17 +80,13 @@ def store_patient_memory(user_id: str, memory: str, category: str = "general") -
     """
     manager = get_memory_manager()
 
-    # Validate category
-    valid_categories = {
-        "preference": MemoryCategory.PREFERENCE,
-        "medical_context": MemoryCategory.MEDICAL_CONTEXT,
-        "appointment_history": MemoryCategory.APPOINTMENT_HISTORY,
-        "communication": MemoryCategory.COMMUNICATION,
-        "insurance": MemoryCategory.INSURANCE,
-        "general": MemoryCategory.GENERAL,
-    }
-
-    resolved_category = valid_categories.get(category, MemoryCategory.GENERAL)
+    # Unknown categories fall back to general
+    resolved_category = MemoryCategory.from_value(category)
+
+    # Batched in the background when the API's write-behind worker is running
+    if manager.enqueue_add(memory, user_id=user_id, category=resolved_category):
+        return f"Memory stored successfully for patient {user_id}: '{memory}' (category: {category})"
+
     result = manager.add(
         content=memory,
         user_id=user_id,
@@ -129,8 +125,9 @@ def get_patient_appointment_history(user_id: str) -> str:
 
     lines = [f"Appointment history for patient {user_id}:"]
     for mem in memories:
-        text = mem.get("memory", mem.get("text", ""))
+        # Short-circuit: the fallback key is only read when "memory" is missing
+        text = mem.get("memory") or mem.get("text")
         if text:
-            lines.append(f"  - {text}")
+            lines.append("  - " + text)
 
     return "\n".join(lines)
@@ -0,0 +1,58 @@
+"""
+Cheap UTC timestamps for hot logging paths.
+
+``datetime.now(timezone.utc).isoformat()`` builds a datetime and formats
+every field on each call. Audit and decision records are emitted in
+bursts, so the second-resolution prefix is formatted once per second and
+only the microseconds are rendered per call. Output matches the
+``isoformat()`` shape (``YYYY-MM-DDTHH:MM:SS.ffffff+00:00``), so existing
+readers and string ordering are unaffected.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+_second_cache: tuple[int, str] = (-1, "")
+_stamp_lock = threading.Lock()
+_last_stamp_us = 0
+
+
+def _format_utc(seconds: int, micros: int) -> str:
+    global _second_cache
+    cached_second, prefix = _second_cache
+    if cached_second != seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        # Single tuple assignment keeps the cache consistent across threads
+        _second_cache = (seconds, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with microsecond precision."""
+    seconds, micros = divmod(time.time_ns() // 1_000, 1_000_000)
+    return _format_utc(seconds, micros)
+
+
+def utc_iso_from_timestamp(timestamp: float) -> str:
+    """ISO-8601 UTC string for an epoch timestamp (e.g. ``LogRecord.created``)."""
+    seconds, micros = divmod(int(timestamp * 1_000_000), 1_000_000)
+    return _format_utc(seconds, micros)
+
+
+def utc_file_stamp() -> str:
+    """
+    Unique, lexically sortable UTC stamp for result file names.
+
+    Format ``YYYYmmdd_HHMMSS_ffffff``. Stamps are strictly increasing
+    within the process, so two saves in the same second (or microsecond)
+    never overwrite each other, and sorting file names still yields
+    chronological order alongside older ``YYYYmmdd_HHMMSS`` names.
+    """
+    global _last_stamp_us
+    with _stamp_lock:
+        now_us = max(time.time_ns() // 1_000, _last_stamp_us + 1)
+        _last_stamp_us = now_us
+    seconds, micros = divmod(now_us, 1_000_000)
+    return f"{time.strftime('%Y%m%d_%H%M%S', time.gmtime(seconds))}_{micros:06d}"
@@ -0,0 +1,21 @@
+"""
+Filesystem helpers shared by the file-backed platform components.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+
+def ensure_dir(path: Union[str, Path]) -> Path:
+    """
+    Create ``path`` (and parents) if it is missing and return it.
+
+    ``Path.mkdir(exist_ok=True)`` on an existing directory costs a failed
+    mkdir plus a stat; checking first is a single stat in the common case.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    return path
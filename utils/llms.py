@@ -5,6 +5,7 @@ LLM provider with integrated resilience, cost tracking, and tracing.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Any, Optional
 
 from dotenv import load_dotenv
@@ -13,6 +14,7 @@ from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
 
 from config.settings import get_settings
+from infrastructure.metrics.cost_analytics import get_cost_analytics
 from utils.logger import get_logger
 
 load_dotenv()
@@ -31,28 +33,27 @@ class CostTrackingCallback(BaseCallbackHandler):
     def __init__(self, tenant_id: str = "", user_id: str = "", model: str = ""):
         self.tenant_id = tenant_id
         self.user_id = user_id
-        self.model = model
+        settings = get_settings()
+        self.model = model or settings.openai_model
+        # Resolved once per callback rather than on every LLM response
+        self._analytics = get_cost_analytics() if settings.cost_tracking_enabled else None
 
     def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        if self._analytics is None or not response.llm_output:
+            return
         try:
-            from infrastructure.metrics.cost_analytics import get_cost_analytics
-
-            settings = get_settings()
-            if not settings.cost_tracking_enabled:
-                return
-
-            usage = {}
-            if response.llm_output:
-                usage = response.llm_output.get("token_usage", {})
-
+            usage = response.llm_output.get("token_usage")
             if usage:
-                get_cost_analytics().record_usage(
+                # Input tokens served from the provider's prompt prefix cache
+                cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+                self._analytics.record_usage(
                     tenant_id=self.tenant_id,
                     user_id=self.user_id,
-                    model=self.model or settings.openai_model,
+                    model=self.model,
                     input_tokens=usage.get("prompt_tokens", 0),
                     output_tokens=usage.get("completion_tokens", 0),
                     operation="llm_invoke",
+                    metadata={"cached_input_tokens": cached} if cached else None,
                 )
         except Exception as exc:
             logger.debug("Cost tracking callback error: %s", exc)
@@ -75,19 +76,29 @@ class LLMModel:
             max_retries=settings.openai_max_retries,
             request_timeout=settings.openai_request_timeout,
         )
+        self._tracking = settings.cost_tracking_enabled
+        # One bound model per (tenant, user); the callback holds no per-call state
+        self._bound_models = lru_cache(maxsize=1024)(self._bind_cost_tracking)
 
-    def get_model(self, tenant_id: str = "", user_id: str = "") -> ChatOpenAI:
-        """
-        Return the model with cost-tracking callback attached.
-        """
+    def _bind_cost_tracking(self, tenant_id: str, user_id: str):
         callback = CostTrackingCallback(
             tenant_id=tenant_id,
             user_id=user_id,
             model=self.model_name,
         )
-        # Return model with callback configured
         return self.openai_model.with_config(callbacks=[callback])
 
+    def get_model(self, tenant_id: str = "", user_id: str = "") -> ChatOpenAI:
+        """
+        Return the model with cost-tracking callback attached.
+
+        With cost tracking disabled the raw model is returned, so LLM calls
+        carry no callback to dispatch.
+        """
+        if not self._tracking:
+            return self.openai_model
+        return self._bound_models(tenant_id, user_id)
+
     def get_raw_model(self) -> ChatOpenAI:
         """Return the raw model without extra callbacks."""
         return self.openai_model
@@ -7,20 +7,25 @@ Integrates with the platform audit system.
 
 from __future__ import annotations
 
-import json
 import logging
+import logging.config
 import os
 import sys
-from datetime import datetime, timezone
 from typing import Any
 
+import orjson
+
+from utils.clock import utc_iso_from_timestamp
+
 
 class JSONFormatter(logging.Formatter):
     """Structured JSON log formatter for production environments."""
 
+    _CONTEXT_KEYS = ("tenant_id", "user_id", "session_id", "trace_id", "span_id")
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_iso_from_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,10 +35,12 @@ class JSONFormatter(logging.Formatter):
         }
         if record.exc_info and record.exc_info[1]:
             log_entry["exception"] = self.formatException(record.exc_info)
-        for key in ("tenant_id", "user_id", "session_id", "trace_id", "span_id"):
-            if hasattr(record, key):
-                log_entry[key] = getattr(record, key)
-        return json.dumps(log_entry, default=str)
+        # `extra=` fields land in the record's __dict__; one lookup each
+        attrs = record.__dict__
+        for key in self._CONTEXT_KEYS:
+            if key in attrs:
+                log_entry[key] = attrs[key]
+        return orjson.dumps(log_entry, default=str).decode()
 
 
 class PrettyFormatter(logging.Formatter):
@@ -45,35 +52,40 @@ class PrettyFormatter(logging.Formatter):
         super().__init__(fmt=self.FORMAT)
 
 
-_initialized = False
-
-
 def _init_logging() -> None:
-    global _initialized
-    if _initialized:
-        return
-    _initialized = True
-
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    environment = os.getenv("ENVIRONMENT", "development")
-
-    root = logging.getLogger()
-    root.setLevel(log_level)
-    root.handlers.clear()
-
-    handler = logging.StreamHandler(sys.stdout)
-    if environment in ("production", "staging"):
-        handler.setFormatter(JSONFormatter())
-    else:
-        handler.setFormatter(PrettyFormatter())
-
-    root.addHandler(handler)
-
-    for noisy in ("httpx", "httpcore", "urllib3", "openai._base_client"):
-        logging.getLogger(noisy).setLevel(logging.WARNING)
+    """
+    Configure the root logger. Runs once, when this module is first
+    imported; the import lock makes that safe under concurrent startup.
+    """
+    structured = os.getenv("ENVIRONMENT", "development") in ("production", "staging")
+    logging.config.dictConfig({
+        "version": 1,
+        # Loggers created before this runs (e.g. platform.*) must keep working
+        "disable_existing_loggers": False,
+        "formatters": {
+            "platform": {"()": JSONFormatter if structured else PrettyFormatter},
+        },
+        "handlers": {
+            "stdout": {
+                "class": "logging.StreamHandler",
+                "stream": sys.stdout,
+                "formatter": "platform",
+            },
+        },
+        "root": {
+            "level": os.getenv("LOG_LEVEL", "INFO").upper(),
+            "handlers": ["stdout"],
+        },
+        "loggers": {
+            noisy: {"level": "WARNING"}
+            for noisy in ("httpx", "httpcore", "urllib3", "openai._base_client")
+        },
+    })
+
+
+_init_logging()
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a configured logger instance."""
-    _init_logging()
     return logging.getLogger(name)
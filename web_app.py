@@ -5,17 +5,26 @@ Connects to the platform API with session tracking,
 multi-tenant support, and per-user memory management.
 """
 
+import json
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.config import get_api_base_url
 
 API_BASE = get_api_base_url()
-API_URL = f"{API_BASE}/execute"
+API_URL = f"{API_BASE}/execute/stream"
 HEALTH_URL = f"{API_BASE}/health"
 METRICS_URL = f"{API_BASE}/platform/metrics"
 MEMORY_URL = f"{API_BASE}/platform/memory"
 
+_PATIENT_ID_RE = re.compile(r"[0-9]{7,8}")
+
 st.set_page_config(
     page_title="Doctor Appointment Platform",
     page_icon="🩺",
@@ -27,12 +36,50 @@ st.set_page_config(
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
 
+if "http" not in st.session_state:
+    # One keep-alive pool per browser session, reused across reruns.
+    # Retry only covers idempotent requests; /execute POSTs are never replayed.
+    _adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    )
+    _http = requests.Session()
+    _http.mount("http://", _adapter)
+    _http.mount("https://", _adapter)
+    st.session_state.http = _http
+
+http = st.session_state.http
+
+
+def _get_json(session: requests.Session, url: str) -> Optional[dict[str, Any]]:
+    try:
+        return session.get(url, timeout=5).json()
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _fetch_platform_status(_session: requests.Session) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Health and metrics fetched in parallel; None marks an unreachable call.
+    Cached briefly so back-to-back reruns don't hit the API again.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        health = pool.submit(_get_json, _session, HEALTH_URL)
+        metrics = pool.submit(_get_json, _session, METRICS_URL)
+        return health.result(), metrics.result()
+
+
+health, metrics = _fetch_platform_status(http)
+
 # ── Sidebar: platform status ────────────────────────────────────
 
 with st.sidebar:
     st.header("Platform Status")
     try:
-        health = requests.get(HEALTH_URL, timeout=5).json()
+        if health is None:
+            raise ConnectionError(HEALTH_URL)
         env = health.get("environment", "unknown")
         cb_state = health.get("circuit_breaker", {}).get("state", "unknown")
         tracing = health.get("tracing_enabled", False)
@@ -63,14 +110,15 @@ query = st.text_area(
     placeholder="Example: Can you check if a dentist is available tomorrow at 10 AM?",
 )
 
-if st.button("Submit Query", type="primary"):
+submitted = st.button("Submit Query", type="primary")
+if submitted:
     if user_id and query.strip():
-        if not user_id.isdigit() or not (7 <= len(user_id) <= 8):
+        if not _PATIENT_ID_RE.fullmatch(user_id):
             st.error("Patient ID must be a 7-8 digit number.")
             st.stop()
         try:
             with st.spinner("Processing with AI agents..."):
-                response = requests.post(
+                response = http.post(
                     API_URL,
                     json={
                         "messages": query.strip(),
@@ -79,29 +127,52 @@ if st.button("Submit Query", type="primary"):
                         "session_id": st.session_state.session_id,
                     },
                     headers={
+                        "Accept": "text/event-stream",
                         "X-Tenant-ID": tenant_id,
                         "X-User-ID": user_id,
                     },
+                    stream=True,
                     timeout=60,
                 )
 
             if response.status_code == 200:
-                payload = response.json()
-                st.success("Response received")
-                st.markdown(payload.get("response", "No response generated."))
-
-                with st.expander("Execution Details"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.caption(f"Route: {payload.get('route', 'N/A')}")
-                        st.caption(f"Request ID: {payload.get('request_id', 'N/A')}")
-                    with col2:
-                        resp_time = response.headers.get("X-Response-Time-Ms", "N/A")
-                        st.caption(f"Response Time: {resp_time} ms")
-                    if payload.get("reasoning"):
-                        st.text(f"Reasoning: {payload['reasoning']}")
+                # Render tokens as they arrive; the closing "done" event
+                # carries the authoritative reply and execution details
+                placeholder = st.empty()
+                accumulated = ""
+                payload: dict[str, Any] = {}
+                with response:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith("data: "):
+                            continue
+                        event = json.loads(line[6:])
+                        if event["type"] == "token":
+                            accumulated += event["text"]
+                            placeholder.markdown(accumulated)
+                        else:
+                            payload = event
+
+                if payload.get("type") == "done":
+                    st.success("Response received")
+                    placeholder.markdown(payload.get("response") or accumulated or "No response generated.")
+
+                    with st.expander("Execution Details"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.caption(f"Route: {payload.get('route', 'N/A')}")
+                            st.caption(f"Request ID: {payload.get('request_id', 'N/A')}")
+                        with col2:
+                            first_byte = response.headers.get("X-Response-Time-Ms", "N/A")
+                            st.caption(f"Time to first byte: {first_byte} ms")
+                        if payload.get("reasoning"):
+                            st.text(f"Reasoning: {payload['reasoning']}")
+                else:
+                    st.error(payload.get("detail", "The response stream ended unexpectedly."))
             else:
-                detail = response.json().get("detail", "Could not process the request.")
+                # Proxies and crashed workers answer with HTML/plain text bodies
+                is_json = response.headers.get("content-type", "").startswith("application/json")
+                body = response.json() if is_json else {}
+                detail = body.get("detail", "Could not process the request.")
                 st.error(f"Error {response.status_code}: {detail}")
         except requests.Timeout:
             st.error("The request timed out. Please try again.")
@@ -114,9 +185,15 @@ if st.button("Submit Query", type="primary"):
 
 st.divider()
 
+if submitted:
+    # The status snapshot predates this query; show metrics that include it
+    _fetch_platform_status.clear()
+    metrics = _get_json(http, METRICS_URL)
+
 with st.expander("📊 Platform Metrics Dashboard"):
     try:
-        metrics = requests.get(METRICS_URL, timeout=5).json()
+        if metrics is None:
+            raise ConnectionError(METRICS_URL)
         col1, col2 = st.columns(2)
         with col1:
             st.metric("Total Requests", metrics.get("total_requests", 0))